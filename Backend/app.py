@@ -11,6 +11,9 @@ sys.path.append(BASE_DIR)
 from Backend.config import Config
 from Backend.routes.api_routes import api_bp
 from Backend.routes.web_routes import web_bp
+from Backend.routes.debug_routes import debug_bp
+from Backend.monitoring import init_app as init_monitoring
+from Backend.serving import init_app as init_serving
 
 def create_app():
     """Factory function untuk inisialisasi aplikasi Flask."""
@@ -36,6 +39,15 @@ def create_app():
     # API routes (dengan prefix /api agar terstandarisasi)
     app.register_blueprint(api_bp, url_prefix='/api')
 
+    # Debug/diagnostik (request lambat, profiler, memori)
+    app.register_blueprint(debug_bp, url_prefix='/api/debug')
+
+    # Observability: metrik per route (/api/metrics), X-Request-ID & Server-Timing
+    init_monitoring(app)
+
+    # Admission control: batas request scoring bersamaan, lebihnya gagal cepat (503 + Retry-After)
+    init_serving(app)
+
     # 4. ERROR HANDLERS
     @app.errorhandler(404)
     def not_found(e):
@@ -21,17 +21,89 @@ class Config:
     # --- 2. FILE PATHS ---
     RAW_DATA = os.path.join(DATA_DIR, "diabetes.csv")
     BALANCED_DATA = os.path.join(DATA_DIR, "diabetes_balanced.csv")
-    PREDICTION_LOG = os.path.join(LOGS_DIR, "prediction_logs.csv")
+    # Bisa dialihkan lewat env (misal saat load test) agar log produksi tidak tercemar
+    PREDICTION_LOG = os.environ.get("PREDICTION_LOG", os.path.join(LOGS_DIR, "prediction_logs.csv"))
     
     # Resource Model & Metadata
     MODEL_PATH = os.path.join(MODELS_DIR, "decision_tree_bundle.pkl")
     META_PATH = os.path.join(MODELS_DIR, "decision_tree_meta.json")
+    DISTILLED_MODEL_PATH = os.path.join(MODELS_DIR, "distilled_tree_bundle.pkl")
+    # Kurva risiko populasi (partial dependence) per versi model, dihitung sekali
+    RISK_CURVES_PATH = os.path.join(MODELS_DIR, "decision_tree_risk_curves.json")
+    # Indeks BallTree pasien serupa (data training), dimuat dengan memory-map
+    SIMILAR_INDEX_PATH = os.path.join(MODELS_DIR, "similar_patients_index.joblib")
     
     # Laporan Teknis
     DATA_REPORT = os.path.join(DATA_DIR, "dataset_report.txt")
     BALANCE_REPORT = os.path.join(DATA_DIR, "balancing_report.txt")
     TRAINING_REPORT = os.path.join(DATA_DIR, "training_report.txt")
 
+    # Benchmark Inferensi (Scripts/benchmark_inference.py)
+    BENCHMARK_RESULTS = os.path.join(DATA_DIR, "benchmark_results.json")
+    BENCHMARK_BASELINE = os.path.join(DATA_DIR, "benchmark_baseline.json")
+
+    # Metrik Prometheus (/api/metrics)
+    # Isi env METRICS_MULTIPROC_DIR saat memakai gunicorn agar metrik seluruh worker digabung
+    METRICS_MULTIPROC_DIR = os.environ.get("METRICS_MULTIPROC_DIR")
+    METRICS_FLUSH_INTERVAL = 1.0  # Detik antar penulisan snapshot per worker
+
+    # Header Server-Timing (durasi per tahap) di setiap response API
+    SERVER_TIMING_ENABLED = os.environ.get("SERVER_TIMING_ENABLED", "1") == "1"
+
+    # Buffer request paling lambat per worker (/api/debug/slow)
+    SLOW_REQUEST_CAPACITY = 50    # Jumlah request terlambat yang disimpan
+    SLOW_REQUEST_WINDOW = 300     # Jendela waktu (detik)
+
+    # Endpoint admin (/api/debug/profile): nonaktif jika ADMIN_TOKEN tidak di-set
+    ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+
+    # Profiler on-demand (output di LOGS_DIR)
+    PROFILER_SIGNAL = os.environ.get("PROFILER_SIGNAL", "SIGUSR2")  # Kosongkan untuk menonaktifkan
+    PROFILER_SIGNAL_SECONDS = 30  # Durasi sesi sampler yang dipicu sinyal
+    PROFILER_MAX_SECONDS = 600    # Batas durasi sesi dari endpoint
+
+    # Simulasi what-if (/api/what-if): batas ukuran grid per request
+    WHAT_IF_MAX_VARIANTS = 20000  # Jumlah kombinasi (produk kartesius sumbu)
+    WHAT_IF_MAX_STEPS = 101       # Nilai per sumbu
+
+    # Kurva risiko (/api/risk-curves)
+    RISK_CURVE_FEATURES = ['glucose', 'bmi', 'age', 'systolic_bp']
+    RISK_CURVE_POINTS = 25        # Titik grid per fitur (kuantil populasi p2-p98)
+    RISK_CURVE_BACKGROUND = 1000  # Jumlah pasien sampel populasi
+
+    # Pasien serupa (/api/similar, /api/predict?similar=k)
+    SIMILAR_DEFAULT_K = 5
+    SIMILAR_MAX_K = 50
+    SIMILAR_MAX_BATCH = 1000      # Jumlah pasien per request batch
+
+    # Scoring upload CSV (/api/predict/csv): file dibaca, diskor & dikirim balik per chunk
+    CSV_CHUNK_ROWS = 10000
+
+    # Scoring biner (/api/predict/binary): matriks float32 ter-encode, batas baris per request
+    BINARY_MAX_ROWS = 1000000
+
+    # Admission control endpoint scoring (per worker): batas konkurensi + antrean terbatas, lebihnya 503
+    ADMISSION_MAX_CONCURRENT = int(os.environ.get("ADMISSION_MAX_CONCURRENT", "8"))  # 0 = nonaktif
+    ADMISSION_MAX_QUEUE = int(os.environ.get("ADMISSION_MAX_QUEUE", "16"))
+    ADMISSION_QUEUE_TIMEOUT = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", "0.5"))  # Detik tunggu maksimum
+    ADMISSION_RETRY_AFTER = 1     # Header Retry-After (detik) pada 503
+    # Endpoint yang dibatasi -> prioritas tertinggi yang boleh diminta (header X-Priority: interactive)
+    ADMISSION_ENDPOINTS = {
+        'api.predict': 'interactive',
+        'api.what_if_analysis': 'interactive',
+        'api.similar_patients': 'interactive',
+        'api.predict_csv': 'batch',
+        'api.predict_binary': 'batch'
+    }
+
+    # Idempotency-Key (/api/predict): response disimpan per worker untuk retry client
+    IDEMPOTENCY_TTL = 300           # Detik
+    IDEMPOTENCY_MAX_KEYS = 10000
+    IDEMPOTENCY_WAIT_TIMEOUT = 30   # Detik maksimum menunggu request identik yang sedang diproses
+
+    # Response JSON read-only (/api/model-info, /api/logs, /api/risk-curves): gzip mulai ukuran ini
+    GZIP_MIN_BYTES = 1024
+
     # --- 3. DATA DEFINITIONS ---
     # Harus sesuai urutan kolom saat training
     FEATURES = [
@@ -72,6 +144,14 @@ class Config:
         }
     }
 
+    # Distilasi Model (Scripts/distill_model.py)
+    # Model distilasi hanya dipakai serving jika diaktifkan (opt-in: USE_DISTILLED_MODEL=1)
+    # dan lolos SEMUA ambang fidelitas ini
+    USE_DISTILLED_MODEL = os.environ.get("USE_DISTILLED_MODEL", "0") == "1"
+    DISTILL_MAX_PROBA_ERROR = 0.10   # Error probabilitas maksimum pada data training asli
+    DISTILL_MEAN_PROBA_ERROR = 0.01  # Error rata-rata pada sampel sintetis holdout
+    DISTILL_MIN_AGREEMENT = 0.995    # Kesepakatan label (ambang 0.5) minimum
+
     # --- 4. AUTO-CREATE DIRECTORIES ---
     @classmethod
     def init_app(cls):
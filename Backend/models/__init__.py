@@ -5,12 +5,14 @@ Mengatur expose class dan fungsi agar mudah di-import oleh module lain.
 
 from .decision_tree_model import DiabetesModel
 from .preprocess import DiabetesPreprocessor
-from .utils import validate_input_data, log_prediction
+from .utils import validate_input_data, log_prediction, risk_level, risk_level_codes
 
 # Mendefinisikan apa yang akan di-import jika menggunakan 'from Backend.models import *'
 __all__ = [
     'DiabetesModel',
     'DiabetesPreprocessor',
     'validate_input_data',
-    'log_prediction'
+    'log_prediction',
+    'risk_level',
+    'risk_level_codes'
 ]
\ No newline at end of file
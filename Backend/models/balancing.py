@@ -0,0 +1,144 @@
+"""
+Backend/models/balancing.py
+Engine balancing kelas (SMOTE) yang scalable untuk dataset besar.
+
+Metode:
+- 'exact'   : imblearn.SMOTE (perilaku lama, seluruh data di satu proses).
+- 'chunked' : k-NN eksak, tetapi sampel sintetis dibuat per chunk di worker pool
+              (memori jarak dibatasi per chunk).
+- 'approx'  : k-NN aproksimasi dari KDTree atas subset minoritas berukuran tetap
+              (memori dibatasi oleh max_index_size, bukan jumlah baris).
+
+FoldSMOTE membungkus engine yang sama agar bisa dipakai di dalam Pipeline imblearn,
+sehingga sampel sintetis hanya dibuat di dalam fold training (tanpa CSV balanced).
+
+Seluruh metode deterministik terhadap random_state (seed per chunk diturunkan
+dari SeedSequence, tidak bergantung jumlah worker).
+"""
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+from sklearn.base import BaseEstimator
+from sklearn.neighbors import NearestNeighbors, KDTree
+
+BALANCE_METHODS = ('exact', 'chunked', 'approx')
+
+
+def _drop_self(neighbors, base_idx, k):
+    """Membuang indeks baris itu sendiri dari hasil k+1 tetangga, sisakan k tetangga."""
+    is_self = neighbors == base_idx[:, None]
+    order = np.argsort(is_self, axis=1, kind='stable')
+    return np.take_along_axis(neighbors, order, axis=1)[:, :k]
+
+
+def _synthesize_chunk(X_min, n_samples, k_neighbors, seed, method, index_tree=None, index_map=None):
+    """
+    Membuat n_samples sampel sintetis dari kelas minoritas (dijalankan di worker).
+    Setiap chunk punya seed sendiri sehingga hasil tidak bergantung urutan eksekusi.
+    """
+    rng = np.random.default_rng(seed)
+    base_idx = rng.integers(0, len(X_min), size=n_samples)
+    base = X_min[base_idx]
+
+    if method == 'approx':
+        _, pos = index_tree.query(base, k=k_neighbors + 1)
+        neighbors = index_map[pos]
+    else:
+        nn = NearestNeighbors(n_neighbors=k_neighbors + 1, algorithm='brute').fit(X_min)
+        neighbors = nn.kneighbors(base, return_distance=False)
+
+    neighbors = _drop_self(neighbors, base_idx, k_neighbors)
+    chosen = neighbors[np.arange(n_samples), rng.integers(0, k_neighbors, size=n_samples)]
+    gap = rng.random(n_samples)[:, None]
+    return (base + gap * (X_min[chosen] - base)).astype(X_min.dtype, copy=False)
+
+
+def smote_resample(X, y, method='chunked', k_neighbors=5, random_state=42,
+                   n_jobs=-1, chunk_size=10000, max_index_size=50000):
+    """
+    Oversampling setiap kelas minoritas hingga sama dengan kelas mayoritas.
+    Return (X_resampled, y_resampled): data asli diikuti sampel sintetis (seperti imblearn).
+    """
+    if method not in BALANCE_METHODS:
+        raise ValueError(f"Metode balancing tidak dikenal: {method}. Pilihan: {BALANCE_METHODS}")
+
+    columns = X.columns if isinstance(X, pd.DataFrame) else None
+    name = y.name if isinstance(y, pd.Series) else None
+
+    if method == 'exact':
+        from imblearn.over_sampling import SMOTE
+        return SMOTE(k_neighbors=k_neighbors, random_state=random_state).fit_resample(X, y)
+
+    X_arr = np.asarray(X)
+    y_arr = np.asarray(y)
+    classes, counts = np.unique(y_arr, return_counts=True)
+    n_target = counts.max()
+    seed_seq = np.random.SeedSequence(random_state)
+
+    X_parts, y_parts = [X_arr], [y_arr]
+    for cls, count, cls_seed in zip(classes, counts, seed_seq.spawn(len(classes))):
+        n_new = int(n_target - count)
+        if n_new == 0:
+            continue
+
+        X_min = np.ascontiguousarray(X_arr[y_arr == cls])
+        k = min(k_neighbors, len(X_min) - 1)
+        if k < 1:
+            raise ValueError(f"Kelas {cls} hanya memiliki {len(X_min)} sampel, SMOTE butuh minimal 2.")
+
+        index_tree, index_map = None, None
+        if method == 'approx':
+            # Index spasial dibatasi ukurannya: subset acak minoritas
+            index_rng = np.random.default_rng(cls_seed.spawn(1)[0])
+            if len(X_min) > max_index_size:
+                index_map = np.sort(index_rng.choice(len(X_min), size=max_index_size, replace=False))
+            else:
+                index_map = np.arange(len(X_min))
+            index_tree = KDTree(X_min[index_map])
+
+        sizes = [min(chunk_size, n_new - start) for start in range(0, n_new, chunk_size)]
+        chunk_seeds = cls_seed.spawn(len(sizes))
+        synthetic = Parallel(n_jobs=n_jobs, max_nbytes='1M')(
+            delayed(_synthesize_chunk)(X_min, size, k, seed, method, index_tree, index_map)
+            for size, seed in zip(sizes, chunk_seeds)
+        )
+
+        X_parts.extend(synthetic)
+        y_parts.append(np.full(n_new, cls, dtype=y_arr.dtype))
+
+    X_res = np.vstack(X_parts)
+    y_res = np.concatenate(y_parts)
+
+    if columns is not None:
+        X_res = pd.DataFrame(X_res, columns=columns)
+    if name is not None or isinstance(y, pd.Series):
+        y_res = pd.Series(y_res, name=name)
+    return X_res, y_res
+
+
+class FoldSMOTE(BaseEstimator):
+    """
+    Sampler on-the-fly untuk Pipeline imblearn: sampel sintetis dibuat di dalam
+    setiap fold training, data validasi/kalibrasi tetap asli.
+    """
+
+    def __init__(self, method='chunked', k_neighbors=5, random_state=42,
+                 n_jobs=1, chunk_size=10000, max_index_size=50000):
+        self.method = method
+        self.k_neighbors = k_neighbors
+        self.random_state = random_state
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
+        self.max_index_size = max_index_size
+
+    def fit(self, X, y):
+        return self
+
+    def fit_resample(self, X, y):
+        return smote_resample(
+            X, y, method=self.method, k_neighbors=self.k_neighbors,
+            random_state=self.random_state, n_jobs=self.n_jobs,
+            chunk_size=self.chunk_size, max_index_size=self.max_index_size
+        )
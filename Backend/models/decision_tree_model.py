@@ -8,6 +8,7 @@ from typing import Dict, Any
 
 from Backend.config import Config
 from Backend.models.preprocess import DiabetesPreprocessor
+from Backend.models.distill import select_serving_bundle
 
 class DiabetesModel:
     _instance = None
@@ -22,30 +23,33 @@ class DiabetesModel:
                     DiabetesModel._instance = DiabetesModel()
         return DiabetesModel._instance
 
-    def __init__(self):
+    def __init__(self, model_path=None):
+        # model_path selain default dipakai untuk membandingkan bundle kandidat (replay log)
+        self.model_path = model_path or Config.MODEL_PATH
         self.model_bundle = None
         self.preprocessor = DiabetesPreprocessor()
         self.load_bundle()
 
     def load_bundle(self):
         """Load model .pkl dari disk"""
-        if not os.path.exists(Config.MODEL_PATH):
-            print(f"⚠️ Warning: Model file not found at {Config.MODEL_PATH}")
+        if not os.path.exists(self.model_path):
+            print(f"⚠️ Warning: Model file not found at {self.model_path}")
             self.model_bundle = None
             return
 
         try:
             # Gunakan mmap_mode='r' untuk efisiensi jika model sangat besar
-            bundle_data = joblib.load(Config.MODEL_PATH)
+            bundle_data = joblib.load(self.model_path)
             
             # Normalisasi Format Bundle (Support Dict & Object langsung)
             if isinstance(bundle_data, dict) and 'model' in bundle_data:
-                self.model_bundle = bundle_data
+                # Gunakan model distilasi jika tersedia & lolos ambang fidelitas
+                self.model_bundle = select_serving_bundle(bundle_data)
             else:
                 # Jika format lama (langsung objek model), bungkus jadi dict
                 self.model_bundle = {'model': bundle_data}
             
-            print(f"✅ Model loaded successfully from {Config.MODEL_PATH}")
+            print(f"✅ Model loaded successfully from {self.model_path}")
         except Exception as e:
             print(f"❌ Failed to load model: {e}")
             self.model_bundle = None
@@ -115,6 +119,20 @@ class DiabetesModel:
                 "error": f"Internal Prediction Error: {str(e)}"
             }
 
+    def score_features(self, X) -> np.ndarray:
+        """Probabilitas kelas Diabetic untuk matriks fitur yang sudah di-encode (batch)."""
+        model = self.model_bundle['model']
+        if hasattr(model, 'predict_proba'):
+            return np.asarray(model.predict_proba(X)[:, 1], dtype=float)
+        return (np.asarray(model.predict(X)) == 1).astype(float)
+
+    def predict_proba_batch(self, df_raw: pd.DataFrame) -> np.ndarray:
+        """Probabilitas kelas Diabetic untuk banyak baris mentah (format form/log) sekaligus."""
+        if not self.model_bundle:
+            raise RuntimeError(f"Model belum dimuat dari {self.model_path}")
+        df_clean = self.preprocessor.clean_and_encode(df_raw, is_training=False)
+        return self.score_features(self.preprocessor.get_features(df_clean))
+
     def _get_clinical_interpretation(self, probability: float):
         """Logika klasifikasi risiko berdasarkan ambang batas probabilitas """
         if probability >= 0.8:
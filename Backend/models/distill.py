@@ -0,0 +1,219 @@
+"""
+Backend/models/distill.py
+Distilasi ensemble CalibratedClassifierCV (5 pipeline scaler+tree+sigmoid)
+menjadi SATU regression tree (tabel daun -> probabilitas) untuk serving.
+
+Alur:
+1. Sampel sintetis padat di sekitar distribusi training (jitter Gaussian, fitur biner dipertahankan).
+2. Label = probabilitas terkalibrasi dari model guru (ensemble).
+3. Fit DecisionTreeRegressor, lalu beberapa ronde refinement: area dengan error tinggi
+   disampel ulang lebih rapat dan pohon dilatih ulang.
+4. Laporan fidelitas (error maks/rata-rata, agreement label) dibandingkan dengan ambang di Config.
+"""
+
+import os
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+from sklearn.tree import DecisionTreeRegressor
+
+from Backend.config import Config
+
+
+class DistilledTreeClassifier:
+    """
+    Classifier hasil distilasi dengan antarmuka scikit-learn
+    (predict, predict_proba, classes_, feature_importances_).
+    """
+
+    def __init__(self, regressor, feature_names):
+        self.regressor_ = regressor
+        self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        self.n_features_in_ = len(feature_names)
+        self.classes_ = np.array([0, 1])
+        # Tabel daun -> probabilitas (nilai regresi per node)
+        self.leaf_proba_ = np.clip(regressor.tree_.value[:, 0, 0], 0.0, 1.0)
+
+    @property
+    def feature_importances_(self):
+        return self.regressor_.feature_importances_
+
+    def _as_array(self, X):
+        if isinstance(X, pd.DataFrame):
+            X = X[list(self.feature_names_in_)]
+        return np.asarray(X, dtype=np.float32)
+
+    def predict_proba(self, X):
+        p = self.leaf_proba_[self.regressor_.tree_.apply(self._as_array(X))]
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, X):
+        return (self.predict_proba(X)[:, 1] >= 0.5).astype(int)
+
+
+def _teacher_proba(teacher, X, feature_names, batch_size=100000):
+    """Probabilitas kelas 1 dari model guru, diproses per batch."""
+    out = np.empty(len(X))
+    for start in range(0, len(X), batch_size):
+        batch = pd.DataFrame(X[start:start + batch_size], columns=feature_names)
+        out[start:start + batch_size] = teacher.predict_proba(batch)[:, 1]
+    return out
+
+
+class _FeatureSpaceSampler:
+    """Membangkitkan sampel sintetis di sekitar distribusi training."""
+
+    def __init__(self, X_train, feature_names, random_state=42):
+        self.X = np.asarray(X_train, dtype=np.float32)
+        self.feature_names = list(feature_names)
+        self.rng = np.random.default_rng(random_state)
+        self.std = self.X.std(axis=0)
+        self.low = self.X.min(axis=0)
+        self.high = self.X.max(axis=0)
+        self.discrete = np.array([len(np.unique(col)) <= 2 for col in self.X.T])
+
+    def around(self, base, n, scale):
+        idx = self.rng.integers(0, len(base), size=n)
+        S = base[idx] + self.rng.normal(size=(n, base.shape[1])).astype(np.float32) * self.std * scale
+        # Fitur biner (gender, riwayat, dll) tidak diinterpolasi
+        S[:, self.discrete] = base[idx][:, self.discrete]
+        S = np.clip(S, self.low, self.high)
+
+        # BMI dihitung ulang agar konsisten dengan tinggi/berat (seperti preprocess)
+        names = self.feature_names
+        if {'bmi', 'height', 'weight'} <= set(names):
+            h, w, b = names.index('height'), names.index('weight'), names.index('bmi')
+            valid = S[:, h] > 0
+            S[valid, b] = np.round(S[valid, w] / (S[valid, h] ** 2), 2)
+            S[:, b] = np.clip(S[:, b], self.low[b], self.high[b])
+        return S.astype(np.float32)
+
+
+def fidelity_report(teacher, student, X_eval, feature_names):
+    """Membandingkan probabilitas guru vs murid pada X_eval."""
+    p_teacher = _teacher_proba(teacher, X_eval, feature_names)
+    p_student = student.predict_proba(X_eval)[:, 1]
+    err = np.abs(p_teacher - p_student)
+    return {
+        'n_samples': int(len(X_eval)),
+        'max_abs_error': round(float(err.max()), 6),
+        'mean_abs_error': round(float(err.mean()), 6),
+        'p99_abs_error': round(float(np.quantile(err, 0.99)), 6),
+        'agreement_rate': round(float(np.mean((p_teacher >= 0.5) == (p_student >= 0.5))), 6)
+    }
+
+
+def measure_latency_us(model, row_df, repeats=200):
+    """Median latensi predict_proba untuk satu baris (mikrodetik)."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        model.predict_proba(row_df)
+        timings.append(time.perf_counter_ns() - start)
+    return float(np.median(timings)) / 1000.0
+
+
+def distill_model(teacher, X_train, feature_names, n_samples=200000, refine_rounds=3,
+                  error_tolerance=0.02, min_samples_leaf=3, max_depth=None, random_state=42):
+    """
+    Melatih DistilledTreeClassifier dari model guru.
+    Returns: (student, report)
+    """
+    X_train = np.asarray(X_train, dtype=np.float32)
+    sampler = _FeatureSpaceSampler(X_train, feature_names, random_state=random_state)
+
+    X_fit = np.vstack([X_train, sampler.around(X_train, n_samples, scale=0.15)])
+    y_fit = _teacher_proba(teacher, X_fit, feature_names)
+
+    regressor = None
+    for _ in range(refine_rounds + 1):
+        regressor = DecisionTreeRegressor(
+            min_samples_leaf=min_samples_leaf, max_depth=max_depth, random_state=random_state
+        ).fit(X_fit, y_fit)
+
+        # Refinement: cari area dengan error tinggi pada sampel baru, sampel ulang lebih rapat
+        X_check = sampler.around(X_train, n_samples // 2, scale=0.15)
+        p_check = _teacher_proba(teacher, X_check, feature_names)
+        err = np.abs(p_check - np.clip(regressor.predict(X_check), 0, 1))
+        hard = X_check[err > error_tolerance]
+
+        X_fit = np.vstack([X_fit, X_check])
+        y_fit = np.concatenate([y_fit, p_check])
+        if len(hard) == 0:
+            break
+        X_dense = sampler.around(hard, min(n_samples // 2, len(hard) * 50), scale=0.02)
+        X_fit = np.vstack([X_fit, X_dense])
+        y_fit = np.concatenate([y_fit, _teacher_proba(teacher, X_dense, feature_names)])
+
+    student = DistilledTreeClassifier(regressor, feature_names)
+
+    # Evaluasi pada data training asli dan sampel sintetis yang BELUM pernah dilihat
+    holdout = _FeatureSpaceSampler(X_train, feature_names, random_state=random_state + 1)
+    row_df = pd.DataFrame(X_train[:1], columns=feature_names)
+    report = {
+        'training_rows': fidelity_report(teacher, student, X_train, feature_names),
+        'synthetic_holdout': fidelity_report(
+            teacher, student, holdout.around(X_train, n_samples // 2, scale=0.15), feature_names
+        ),
+        'n_fit_samples': int(len(X_fit)),
+        'n_leaves': int(regressor.get_n_leaves()),
+        'depth': int(regressor.get_depth()),
+        'latency_us': {
+            'teacher': round(measure_latency_us(teacher, row_df), 1),
+            'distilled': round(measure_latency_us(student, row_df), 1)
+        }
+    }
+    return student, report
+
+
+def passes_thresholds(report):
+    """Cek laporan fidelitas terhadap ambang batas di Config."""
+    if not report or 'training_rows' not in report or 'synthetic_holdout' not in report:
+        return False
+    real = report['training_rows']
+    synth = report['synthetic_holdout']
+    return (
+        real['max_abs_error'] <= Config.DISTILL_MAX_PROBA_ERROR
+        and synth['mean_abs_error'] <= Config.DISTILL_MEAN_PROBA_ERROR
+        and min(real['agreement_rate'], synth['agreement_rate']) >= Config.DISTILL_MIN_AGREEMENT
+    )
+
+
+def select_serving_bundle(bundle):
+    """
+    Memilih bundle untuk serving: model distilasi dipakai HANYA jika diaktifkan,
+    dibuat dari bundle guru yang sama (timestamp cocok), dan lolos ambang fidelitas.
+    """
+    if not Config.USE_DISTILLED_MODEL or not os.path.exists(Config.DISTILLED_MODEL_PATH):
+        return bundle
+
+    try:
+        distilled = joblib.load(Config.DISTILLED_MODEL_PATH)
+    except Exception as e:
+        print(f"⚠️ Warning: Gagal memuat model distilasi: {e}")
+        return bundle
+
+    if distilled.get('teacher_timestamp') != bundle.get('timestamp'):
+        print("⚠️ Warning: Model distilasi kedaluwarsa (bundle guru berubah). Memakai ensemble.")
+        return bundle
+    if not passes_thresholds(distilled.get('fidelity', {})):
+        print("⚠️ Warning: Model distilasi tidak lolos ambang fidelitas. Memakai ensemble.")
+        return bundle
+
+    print(f"✅ Serving memakai model distilasi: {Config.DISTILLED_MODEL_PATH}")
+    return distilled
+
+
+def build_distilled_bundle(student, report, teacher_bundle):
+    return {
+        'model': student,
+        'features': list(student.feature_names_in_),
+        'target': ['Non-Diabetic', 'Diabetic'],
+        'timestamp': datetime.now().isoformat(),
+        'teacher_timestamp': teacher_bundle.get('timestamp'),
+        'algorithm': 'Distilled Regression Tree',
+        'fidelity': report
+    }
@@ -0,0 +1,186 @@
+"""
+Backend/models/explain.py
+Penjelasan per pasien berbasis jalur keputusan (decision path) pohon.
+
+Saat model dimuat, setiap node pohon diberi nilai probabilitas kelas Diabetic. Selisih nilai
+anak - induk diatribusikan ke fitur split induknya, lalu dijumlahkan dari root ke setiap node
+menjadi tabel datar (n_node x n_fitur). Untuk member CalibratedClassifierCV, tabel diskalakan
+per daun agar mengikuti kalibrator (sigmoid/isotonic) member tersebut.
+
+Saat request: transform (scaler) -> apply (id daun) -> ambil baris tabel, dirata-rata seluruh
+member (sama seperti predict_proba ensemble). Hasilnya aditif:
+    base_value + sum(kontribusi fitur) == probabilitas yang diprediksi model.
+
+Model yang didukung: DecisionTreeClassifier, Pipeline(scaler, tree), CalibratedClassifierCV
+berisi keduanya, DistilledTreeClassifier, dan HistogramTreeClassifier.
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+
+# --- 1. STRUKTUR POHON ---
+
+def _tree_arrays(estimator):
+    """(children_left, children_right, feature, nilai P(Diabetic) per node) atau None jika bukan pohon."""
+    if hasattr(estimator, 'leaf_proba_') and hasattr(estimator, 'regressor_'):
+        # DistilledTreeClassifier: nilai regresi per node = probabilitas
+        tree = estimator.regressor_.tree_
+        return tree.children_left, tree.children_right, tree.feature, estimator.leaf_proba_
+
+    if hasattr(estimator, 'node_proba_'):
+        # HistogramTreeClassifier
+        positive = list(estimator.classes_).index(1)
+        return (estimator.children_left_, estimator.children_right_, estimator.feature_,
+                estimator.node_proba_[:, positive])
+
+    tree = getattr(estimator, 'tree_', None)
+    if tree is None or not hasattr(estimator, 'classes_'):
+        return None
+    positive = list(estimator.classes_).index(1)
+    counts = tree.value[:, 0, :]
+    totals = counts.sum(axis=1)
+    node_value = np.divide(counts[:, positive], totals, out=np.full(len(totals), 0.5), where=totals > 0)
+    return tree.children_left, tree.children_right, tree.feature, node_value
+
+
+def _path_table(children_left, children_right, feature, node_value, n_features):
+    """Kontribusi kumulatif root -> node per fitur (n_node x n_fitur)."""
+    table = np.zeros((len(node_value), n_features))
+    # Node induk selalu dibuat sebelum anaknya, jadi urutan id aman untuk propagasi
+    stack = [0]
+    while stack:
+        node = stack.pop()
+        for child in (children_left[node], children_right[node]):
+            if child < 0:
+                continue
+            table[child] = table[node]
+            table[child, feature[node]] += node_value[child] - node_value[node]
+            stack.append(child)
+    return table
+
+
+def _calibrate_table(table, node_value, calibrator):
+    """
+    Skala kontribusi per node ke ruang probabilitas terkalibrasi:
+    kontribusi * (p_kal(node) - p_kal(root)) / (p(node) - p(root)). Karena kalibrator monoton,
+    arah kontribusi tidak berubah; bila p(node) == p(root) dipakai turunan lokal.
+    """
+    calibrated = np.asarray(calibrator.predict(node_value), dtype=float)
+    delta_raw = node_value - node_value[0]
+    delta_cal = calibrated - calibrated[0]
+    eps = 1e-6
+    slope_local = (np.asarray(calibrator.predict(node_value + eps), dtype=float)
+                   - np.asarray(calibrator.predict(node_value - eps), dtype=float)) / (2 * eps)
+    scale = np.divide(delta_cal, delta_raw, out=slope_local, where=np.abs(delta_raw) > 1e-12)
+    return table * scale[:, None], calibrated[0]
+
+
+# --- 2. TRANSFORMASI & ROUTING ---
+
+def _split_pipeline(estimator):
+    """(langkah sebelum pohon, pohon) untuk Pipeline; selain itu ([], estimator)."""
+    steps = getattr(estimator, 'steps', None)
+    if steps:
+        return [step for _, step in steps[:-1] if step is not None and step != 'passthrough'], steps[-1][1]
+    return [], estimator
+
+
+def _make_transform(steps):
+    """Fungsi transform fitur sebelum pohon. StandardScaler dihitung langsung (operasi sama persis)."""
+    if not steps:
+        return lambda X: X
+    if all(isinstance(step, StandardScaler) for step in steps):
+        def transform(X):
+            X = np.array(X, dtype=np.float32)
+            for step in steps:
+                if step.with_mean:
+                    X -= step.mean_
+                if step.with_std:
+                    X /= step.scale_
+            return X
+        return transform
+
+    def transform(X):
+        for step in steps:
+            if hasattr(step, 'transform'):
+                X = step.transform(X)
+        return X
+    return transform
+
+
+def _make_apply(estimator):
+    tree = getattr(estimator, 'tree_', None) or getattr(getattr(estimator, 'regressor_', None), 'tree_', None)
+    if tree is not None:
+        # Tree.apply langsung (tanpa validasi input estimator) pada float32 C-contiguous
+        return lambda X: tree.apply(np.ascontiguousarray(X, dtype=np.float32))
+    return estimator.apply
+
+
+# --- 3. EXPLAINER ---
+
+class PathExplainer:
+    """
+    Kontribusi fitur per baris dari jalur keputusan seluruh member model.
+    Dibangun sekali saat model dimuat (PathExplainer.from_model), dipakai ulang setiap request.
+    """
+
+    def __init__(self, members, feature_names):
+        # members: list (transform, apply, tabel kontribusi per node, base value)
+        self.members = members
+        self.feature_names = list(feature_names)
+        self.base_value = float(np.mean([base for _, _, _, base in members]))
+
+    @classmethod
+    def from_model(cls, model, feature_names):
+        """Explainer untuk model yang didukung; None jika struktur model tidak dikenali."""
+        n_features = len(feature_names)
+        if hasattr(model, 'calibrated_classifiers_'):
+            pairs = []
+            for clf in model.calibrated_classifiers_:
+                estimator = getattr(clf, 'estimator', None) or getattr(clf, 'base_estimator', None)
+                calibrators = getattr(clf, 'calibrators', None) or getattr(clf, 'calibrators_', None)
+                if estimator is None or not calibrators or len(calibrators) != 1:
+                    return None
+                pairs.append((estimator, calibrators[0]))
+        else:
+            pairs = [(model, None)]
+
+        members = []
+        for estimator, calibrator in pairs:
+            steps, final = _split_pipeline(estimator)
+            arrays = _tree_arrays(final)
+            if arrays is None:
+                return None
+            children_left, children_right, feature, node_value = arrays
+            table = _path_table(children_left, children_right, feature, np.asarray(node_value, dtype=float),
+                                n_features)
+            if calibrator is not None:
+                table, base = _calibrate_table(table, np.asarray(node_value, dtype=float), calibrator)
+            else:
+                base = float(node_value[0])
+            members.append((_make_transform(steps), _make_apply(final), table, base))
+        return cls(members, feature_names)
+
+    def explain(self, X):
+        """
+        (base_value, kontribusi n_baris x n_fitur) untuk batch X (urutan fitur = feature_names).
+        base_value + kontribusi.sum(axis=1) == probabilitas kelas Diabetic.
+        """
+        if isinstance(X, pd.DataFrame):
+            if list(X.columns) != self.feature_names:
+                X = X[self.feature_names]
+            X = X.to_numpy(dtype=np.float32)
+        X = np.asarray(X, dtype=np.float32)
+
+        contributions = np.zeros((len(X), len(self.feature_names)))
+        for transform, apply, table, _ in self.members:
+            contributions += table[apply(transform(X))]
+        contributions /= len(self.members)
+        return self.base_value, contributions
+
+    def top_features(self, contributions_row, top_n=5):
+        """Top-N (nama fitur, kontribusi bertanda) berdasarkan besar kontribusi absolut."""
+        order = np.argsort(-np.abs(contributions_row), kind='stable')[:top_n]
+        return [(self.feature_names[i], float(contributions_row[i])) for i in order if contributions_row[i] != 0]
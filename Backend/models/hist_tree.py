@@ -0,0 +1,424 @@
+"""
+Backend/models/hist_tree.py
+Decision Tree berbasis histogram untuk dataset yang tidak muat di memori (out-of-core).
+
+Alur training:
+1. Pass 1 (CSV mentah, per chunk): encoding + reservoir sample -> batas bin per fitur.
+2. Pass 2 (CSV mentah, per chunk): fitur di-bin menjadi kode uint8 dan ditulis ke file memmap.
+3. Per level kedalaman: stream kode uint8 per chunk, akumulasi histogram kelas per node,
+   lalu pilih split terbaik untuk seluruh node di frontier sekaligus.
+
+Memori puncak ~ (node frontier x fitur x bin x 2) + satu chunk, TIDAK bergantung jumlah baris.
+"""
+
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+from Backend.models.preprocess import DiabetesPreprocessor
+
+
+class FeatureBinner:
+    """Memetakan nilai float ke kode bin uint8 berbasis kuantil."""
+
+    def __init__(self, max_bins=255):
+        if not 2 <= max_bins <= 256:
+            raise ValueError("max_bins harus di antara 2 dan 256 (kode uint8)")
+        self.max_bins = max_bins
+        self.bin_edges_ = None
+
+    def fit(self, X_sample):
+        X_sample = np.asarray(X_sample, dtype=np.float32)
+        self.bin_edges_ = []
+        for col in X_sample.T:
+            uniques = np.unique(col)
+            if len(uniques) <= self.max_bins:
+                # Fitur diskrit (biner/kategori): setiap nilai unik jadi bin sendiri
+                edges = uniques[:-1]
+            else:
+                quantiles = np.linspace(0, 1, self.max_bins + 1)[1:-1]
+                edges = np.unique(np.quantile(col, quantiles).astype(np.float32))
+            self.bin_edges_.append(edges.astype(np.float32))
+        return self
+
+    @property
+    def n_bins_(self):
+        return max(len(edges) for edges in self.bin_edges_) + 1
+
+    def transform(self, X):
+        """Kode = jumlah batas bin yang < x, sehingga (kode <= b) <=> (x <= edges[b])."""
+        X = np.asarray(X, dtype=np.float32)
+        codes = np.empty(X.shape, dtype=np.uint8)
+        for j, edges in enumerate(self.bin_edges_):
+            codes[:, j] = np.searchsorted(edges, X[:, j], side='left')
+        return codes
+
+
+class HistogramTreeClassifier:
+    """
+    Classifier pohon biner dengan antarmuka kompatibel scikit-learn
+    (predict, predict_proba, classes_, feature_importances_) agar bisa
+    dibungkus dalam bundle yang sama dan dimuat oleh DiabetesModel / api_routes.
+    """
+
+    def __init__(self, criterion='entropy', max_depth=6, min_samples_leaf=10,
+                 min_samples_split=20, max_bins=255, class_weight='balanced'):
+        self.criterion = criterion
+        self.max_depth = max_depth
+        self.min_samples_leaf = min_samples_leaf
+        self.min_samples_split = min_samples_split
+        self.max_bins = max_bins
+        self.class_weight = class_weight
+
+    # --- STRUKTUR POHON ---
+
+    def _init_tree(self):
+        self.children_left_ = []
+        self.children_right_ = []
+        self.feature_ = []
+        self.threshold_ = []
+        self.threshold_bin_ = []
+        self.value_ = []
+        self.n_node_samples_ = []
+
+    def _add_node(self):
+        self.children_left_.append(-1)
+        self.children_right_.append(-1)
+        self.feature_.append(-1)
+        self.threshold_.append(np.nan)
+        self.threshold_bin_.append(-1)
+        self.value_.append(np.zeros(2))
+        self.n_node_samples_.append(0)
+        return len(self.feature_) - 1
+
+    def _finalize_tree(self):
+        self.children_left_ = np.asarray(self.children_left_, dtype=np.int32)
+        self.children_right_ = np.asarray(self.children_right_, dtype=np.int32)
+        self.feature_ = np.asarray(self.feature_, dtype=np.int32)
+        self.threshold_ = np.asarray(self.threshold_, dtype=np.float32)
+        self.threshold_bin_ = np.asarray(self.threshold_bin_, dtype=np.int32)
+        self.value_ = np.vstack(self.value_)
+        self.n_node_samples_ = np.asarray(self.n_node_samples_, dtype=np.int64)
+
+        totals = self.value_.sum(axis=1, keepdims=True)
+        self.node_proba_ = np.divide(self.value_, totals, out=np.full_like(self.value_, 0.5), where=totals > 0)
+
+    def _impurity(self, counts):
+        """Impurity per baris untuk array (..., 2) berisi bobot kelas."""
+        total = counts.sum(axis=-1, keepdims=True)
+        p = np.divide(counts, total, out=np.zeros_like(counts), where=total > 0)
+        if self.criterion == 'entropy':
+            logp = np.log2(p, out=np.zeros_like(p), where=p > 0)
+            return -(p * logp).sum(axis=-1)
+        return 1.0 - (p ** 2).sum(axis=-1)
+
+    # --- TRAINING OUT-OF-CORE ---
+
+    def _route_codes(self, codes, depth):
+        """Menelusuri pohon sampai `depth` level menggunakan kode bin. Return node id per baris."""
+        node = np.zeros(len(codes), dtype=np.int64)
+        left = np.asarray(self.children_left_)
+        right = np.asarray(self.children_right_)
+        feature = np.asarray(self.feature_)
+        threshold_bin = np.asarray(self.threshold_bin_)
+        rows = np.arange(len(codes))
+
+        for _ in range(depth):
+            f = feature[node]
+            internal = f >= 0
+            if not internal.any():
+                break
+            go_left = np.zeros(len(codes), dtype=bool)
+            go_left[internal] = codes[rows[internal], f[internal]] <= threshold_bin[node[internal]]
+            node = np.where(internal, np.where(go_left, left[node], right[node]), node)
+        return node
+
+    def fit_codes(self, codes, y, binner, feature_names=None, holdout_every=0, chunk_rows=262144):
+        """
+        Menumbuhkan pohon level demi level dari matriks kode uint8 (boleh np.memmap).
+        Data dibaca per chunk; hanya histogram frontier yang disimpan di memori.
+        holdout_every=k -> baris dengan indeks global kelipatan k tidak dipakai training
+        (mask dihitung per chunk dari offset global, sama seperti streaming_metrics).
+        """
+        n_rows, n_features = codes.shape
+        n_bins = binner.n_bins_
+        self.binner_ = binner
+        self.n_features_in_ = n_features
+        if feature_names is not None:
+            self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        self.classes_ = np.array([0, 1])
+
+        def _iter_chunks():
+            for start in range(0, n_rows, chunk_rows):
+                stop = min(start + chunk_rows, n_rows)
+                mask = (np.arange(start, stop) % holdout_every) != 0 if holdout_every else None
+                yield np.asarray(codes[start:stop]), np.asarray(y[start:stop]).astype(np.int64), mask
+
+        # Bobot kelas 'balanced' dari jumlah kelas data training
+        class_counts = np.zeros(2)
+        for _, y_chunk, mask in _iter_chunks():
+            class_counts += np.bincount(y_chunk if mask is None else y_chunk[mask], minlength=2)[:2]
+        if self.class_weight == 'balanced':
+            self.class_weight_ = class_counts.sum() / (2.0 * np.maximum(class_counts, 1))
+        else:
+            self.class_weight_ = np.ones(2)
+
+        self._init_tree()
+        root = self._add_node()
+        self.value_[root] = class_counts * self.class_weight_
+        self.n_node_samples_[root] = int(class_counts.sum())
+        frontier = [root]
+        importances = np.zeros(n_features)
+
+        for depth in range(self.max_depth if self.max_depth is not None else 64):
+            frontier = [n for n in frontier if self.n_node_samples_[n] >= self.min_samples_split]
+            if not frontier:
+                break
+
+            slot_of_node = np.full(len(self.feature_), -1, dtype=np.int64)
+            slot_of_node[frontier] = np.arange(len(frontier))
+            n_slots = len(frontier)
+
+            # Histogram jumlah sampel (tanpa bobot): slot x fitur x bin x kelas
+            hist = np.zeros((n_slots, n_features, n_bins, 2), dtype=np.int64)
+            for code_chunk, y_chunk, mask in _iter_chunks():
+                slots = slot_of_node[self._route_codes(code_chunk, depth)]
+                active = slots >= 0
+                if mask is not None:
+                    active &= mask
+                if not active.any():
+                    continue
+                slots, y_act, code_act = slots[active], y_chunk[active], code_chunk[active]
+                for j in range(n_features):
+                    flat = (slots * n_bins + code_act[:, j]) * 2 + y_act
+                    hist[:, j] += np.bincount(flat, minlength=n_slots * n_bins * 2).reshape(n_slots, n_bins, 2)
+
+            next_frontier = []
+            for slot, node in enumerate(frontier):
+                split = self._best_split(hist[slot])
+                if split is None:
+                    continue
+                feat, b, gain, left_counts, right_counts = split
+                importances[feat] += gain
+
+                left_id, right_id = self._add_node(), self._add_node()
+                self.children_left_[node] = left_id
+                self.children_right_[node] = right_id
+                self.feature_[node] = feat
+                self.threshold_bin_[node] = b
+                self.threshold_[node] = binner.bin_edges_[feat][b]
+                for child, counts in ((left_id, left_counts), (right_id, right_counts)):
+                    self.value_[child] = counts * self.class_weight_
+                    self.n_node_samples_[child] = int(counts.sum())
+                next_frontier.extend([left_id, right_id])
+
+            frontier = next_frontier
+
+        self._finalize_tree()
+        total_gain = importances.sum()
+        self.feature_importances_ = importances / total_gain if total_gain > 0 else importances
+        return self
+
+    def _best_split(self, node_hist):
+        """Split terbaik satu node dari histogram (fitur x bin x 2). None jika tidak ada gain."""
+        left = np.cumsum(node_hist, axis=1)
+        total = left[:, -1:, :]
+        right = total - left
+
+        n_left = left.sum(axis=-1)
+        n_right = right.sum(axis=-1)
+        valid = (n_left >= self.min_samples_leaf) & (n_right >= self.min_samples_leaf)
+        if not valid.any():
+            return None
+
+        w_left = left * self.class_weight_
+        w_right = right * self.class_weight_
+        w_total = total[:, 0, :] * self.class_weight_
+
+        parent_weight = w_total.sum(axis=-1)[:, None]
+        parent_impurity = self._impurity(w_total)[:, None]
+        gain = (parent_weight * parent_impurity
+                - w_left.sum(axis=-1) * self._impurity(w_left)
+                - w_right.sum(axis=-1) * self._impurity(w_right))
+        gain = np.where(valid, gain, -np.inf)
+
+        feat, b = np.unravel_index(np.argmax(gain), gain.shape)
+        if gain[feat, b] <= 1e-12:
+            return None
+        return int(feat), int(b), float(gain[feat, b]), left[feat, b].astype(float), right[feat, b].astype(float)
+
+    # --- INFERENSI ---
+
+    def apply(self, X):
+        """Mengembalikan id daun untuk setiap baris (input nilai float asli)."""
+        if isinstance(X, pd.DataFrame) and hasattr(self, 'feature_names_in_'):
+            X = X[list(self.feature_names_in_)]
+        X = np.asarray(X, dtype=np.float32)
+        node = np.zeros(len(X), dtype=np.int64)
+        rows = np.arange(len(X))
+
+        while True:
+            f = self.feature_[node]
+            internal = f >= 0
+            if not internal.any():
+                return node
+            idx = rows[internal]
+            go_left = X[idx, f[internal]] <= self.threshold_[node[internal]]
+            node[idx] = np.where(go_left, self.children_left_[node[idx]], self.children_right_[node[idx]])
+
+    def predict_proba(self, X):
+        return self.node_proba_[self.apply(X)]
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+# --- STREAMING DARI CSV ---
+
+def encode_chunk(preprocessor, chunk):
+    """Encoding satu chunk CSV (mentah atau sudah numerik seperti dataset balanced)."""
+    if np.issubdtype(chunk['gender'].dtype, np.number) and np.issubdtype(chunk['diabetic'].dtype, np.number):
+        chunk = chunk.dropna(subset=preprocessor.feature_order + ['diabetic'])
+    else:
+        chunk = preprocessor.clean_and_encode(chunk, is_training=True)
+    X = preprocessor.get_features(chunk).to_numpy(dtype=np.float32)
+    y = chunk['diabetic'].to_numpy(dtype=np.uint8)
+    return X, y
+
+
+def train_out_of_core(csv_path, chunksize=100000, holdout_every=5, sample_size=200000,
+                      cache_dir=None, random_state=42, **tree_params):
+    """
+    Melatih HistogramTreeClassifier langsung dari CSV yang di-stream per chunk.
+
+    holdout_every=k -> setiap baris ke-k (berdasarkan indeks global) dijadikan data validasi
+    untuk 'accuracy_cv'; 0 untuk melatih dengan seluruh baris.
+
+    Returns: (model, stats) di mana stats berisi metrik dengan format decision_tree_meta.json.
+    """
+    preprocessor = DiabetesPreprocessor()
+    rng = np.random.default_rng(random_state)
+    max_bins = tree_params.get('max_bins', 255)
+
+    # PASS 1: Hitung jumlah baris + reservoir sample untuk batas bin
+    reservoir = None
+    n_rows = 0
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+        X_chunk, _ = encode_chunk(preprocessor, chunk)
+        if reservoir is None:
+            reservoir = np.empty((sample_size, X_chunk.shape[1]), dtype=np.float32)
+
+        # Algorithm R (vectorized per chunk): isi reservoir dulu, lalu ganti acak
+        m = len(X_chunk)
+        fill = min(max(sample_size - n_rows, 0), m)
+        reservoir[n_rows:n_rows + fill] = X_chunk[:fill]
+        if fill < m:
+            positions = np.arange(n_rows + fill, n_rows + m)
+            j = rng.integers(0, positions + 1)
+            keep = j < sample_size
+            reservoir[j[keep]] = X_chunk[fill:][keep]
+        n_rows += m
+
+    if n_rows == 0:
+        raise ValueError(f"Dataset kosong setelah preprocessing: {csv_path}")
+
+    binner = FeatureBinner(max_bins=max_bins).fit(reservoir[:min(n_rows, sample_size)])
+    del reservoir
+
+    # PASS 2: Tulis kode uint8 + label ke file memmap di disk
+    work_dir = tempfile.mkdtemp(prefix='hist_tree_', dir=cache_dir)
+    try:
+        codes = np.lib.format.open_memmap(
+            os.path.join(work_dir, 'codes.npy'), mode='w+', dtype=np.uint8,
+            shape=(n_rows, len(preprocessor.feature_order)))
+        labels = np.lib.format.open_memmap(
+            os.path.join(work_dir, 'labels.npy'), mode='w+', dtype=np.uint8, shape=(n_rows,))
+
+        offset = 0
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+            X_chunk, y_chunk = encode_chunk(preprocessor, chunk)
+            codes[offset:offset + len(X_chunk)] = binner.transform(X_chunk)
+            labels[offset:offset + len(y_chunk)] = y_chunk
+            offset += len(X_chunk)
+        codes.flush()
+        labels.flush()
+
+        model = HistogramTreeClassifier(max_bins=max_bins, **{
+            k: v for k, v in tree_params.items() if k != 'max_bins'
+        })
+        model.fit_codes(codes, labels, binner, feature_names=preprocessor.feature_order,
+                        holdout_every=holdout_every, chunk_rows=chunksize)
+
+        stats = streaming_metrics(model, codes, labels, holdout_every, chunk_rows=chunksize)
+        stats['n_rows'] = int(n_rows)
+        stats['n_bins'] = int(binner.n_bins_)
+        stats['n_nodes'] = int(len(model.feature_))
+        return model, stats
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def streaming_metrics(model, codes, labels, holdout_every=5, chunk_rows=262144):
+    """
+    Metrik evaluasi tanpa memuat seluruh prediksi ke memori.
+    ROC-AUC dihitung eksak dari jumlah kelas per daun (skor pohon bersifat diskrit per daun).
+    """
+    n_rows = len(labels)
+    n_nodes = len(model.feature_)
+    leaf_counts = np.zeros((n_nodes, 2), dtype=np.int64)
+    holdout_correct = holdout_total = 0
+    depth = int(model.max_depth) if model.max_depth is not None else 64
+
+    for start in range(0, n_rows, chunk_rows):
+        stop = min(start + chunk_rows, n_rows)
+        code_chunk = np.asarray(codes[start:stop])
+        y_chunk = np.asarray(labels[start:stop]).astype(np.int64)
+        leaves = model._route_codes(code_chunk, depth)
+        leaf_counts += np.bincount(leaves * 2 + y_chunk, minlength=n_nodes * 2).reshape(n_nodes, 2)
+
+        if holdout_every:
+            held = (np.arange(start, stop) % holdout_every) == 0
+            pred = np.argmax(model.node_proba_[leaves[held]], axis=1)
+            holdout_correct += int((pred == y_chunk[held]).sum())
+            holdout_total += int(held.sum())
+
+    leaf_pred = np.argmax(model.node_proba_, axis=1)
+    tp = int(leaf_counts[leaf_pred == 1, 1].sum())
+    fp = int(leaf_counts[leaf_pred == 1, 0].sum())
+    tn = int(leaf_counts[leaf_pred == 0, 0].sum())
+    fn = int(leaf_counts[leaf_pred == 0, 1].sum())
+
+    # ROC-AUC: urutkan daun berdasarkan skor, hitung pasangan (pos > neg) + 0.5 * seri
+    scores = model.node_proba_[:, 1]
+    used = leaf_counts.sum(axis=1) > 0
+    uniq_scores, inverse = np.unique(scores[used], return_inverse=True)
+    neg = np.bincount(inverse, weights=leaf_counts[used, 0], minlength=len(uniq_scores))
+    pos = np.bincount(inverse, weights=leaf_counts[used, 1], minlength=len(uniq_scores))
+    neg_below = np.cumsum(neg) - neg
+    n_pos, n_neg = pos.sum(), neg.sum()
+    roc_auc = float((pos * (neg_below + 0.5 * neg)).sum() / (n_pos * n_neg)) if n_pos and n_neg else 0.0
+
+    total = tp + tn + fp + fn
+    accuracy = (tp + tn) / total if total else 0.0
+
+    # Precision/Recall/F1 weighted (setara average='weighted' sklearn)
+    support = np.array([tn + fp, tp + fn], dtype=float)
+    prec_cls = np.array([tn / (tn + fn) if tn + fn else 0.0, tp / (tp + fp) if tp + fp else 0.0])
+    rec_cls = np.array([tn / (tn + fp) if tn + fp else 0.0, tp / (tp + fn) if tp + fn else 0.0])
+    f1_cls = np.divide(2 * prec_cls * rec_cls, prec_cls + rec_cls,
+                       out=np.zeros(2), where=(prec_cls + rec_cls) > 0)
+    weights = support / support.sum() if support.sum() else support
+
+    return {
+        'accuracy_cv': holdout_correct / holdout_total if holdout_total else accuracy,
+        'metrics': {
+            'accuracy': accuracy,
+            'roc_auc': roc_auc,
+            'precision': float((prec_cls * weights).sum()),
+            'recall': float((rec_cls * weights).sum()),
+            'f1_score': float((f1_cls * weights).sum())
+        },
+        'confusion_matrix': {'tn': tn, 'fp': fp, 'fn': fn, 'tp': tp}
+    }
@@ -65,53 +65,41 @@ class DiabetesPreprocessor:
                 df[col] = pd.to_numeric(df[col], errors='coerce')
 
         # --- C. SMART UNIT CONVERSION ---
-        # 1. Glukosa: mg/dL (Satuan umum alat tes) -> mmol/L (Satuan Dataset DiaBD)
-        if 'glucose' in df.columns:
-            # Logika: Glukosa > 30 biasanya mg/dL (Normal puasa ~70-100). mmol/L biasanya 4-7.
-            df['glucose'] = df['glucose'].apply(lambda x: round(x/18, 2) if (pd.notnull(x) and x > 30) else x)
-
-        # 2. Tinggi: cm -> meter
-        if 'height' in df.columns:
-            # Logika: Tinggi > 3 biasanya cm (misal 170). Meter biasanya 1.7.
-            df['height'] = df['height'].apply(lambda x: round(x/100, 2) if (pd.notnull(x) and x > 3) else x)
+        # Operasi kolom (vektor), bukan apply per baris: replay log & scoring file memproses jutaan baris
+        for col in ('glucose', 'height'):
+            if col in df.columns:
+                df[col] = self.convert_units(col, df[col])
 
         # --- D. AUTO-CALCULATE BMI ---
         # Rumus BMI: Berat (kg) / Tinggi^2 (m)
-        def _calc_bmi(row):
-            h = row['height']
-            w = row['weight']
-            # Hitung hanya jika BMI kosong/0 dan komponen tersedia valid
-            if (pd.isnull(row['bmi']) or row['bmi'] == 0) and (pd.notnull(h) and pd.notnull(w) and h > 0):
-                return round(w / (h ** 2), 2)
-            return row['bmi']
-
-        # Terapkan perhitungan BMI baris per baris
+        # Hitung hanya jika BMI kosong/0 dan komponen tersedia valid
         if 'bmi' in df.columns:
-            df['bmi'] = df.apply(_calc_bmi, axis=1)
+            h, w = df['height'], df['weight']
+            missing_bmi = df['bmi'].isnull() | (df['bmi'] == 0)
+            computable = missing_bmi & h.notnull() & w.notnull() & (h > 0)
+            df['bmi'] = df['bmi'].where(~computable, (w / h ** 2).round(2))
 
         # --- E. MAPPING KATEGORIKAL ---
         # Normalisasi string (lowercase, strip space) sebelum mapping
         
         # Gender
         if 'gender' in df.columns:
-            df['gender'] = df['gender'].astype(str).str.lower().str.strip().map(self.gender_map)
+            df['gender'] = self._map_normalized(df['gender'], self.gender_map)
         
         # Stroke
         if 'stroke' in df.columns:
-            df['stroke'] = df['stroke'].astype(str).str.lower().str.strip().map(self.stroke_map)
+            df['stroke'] = self._map_normalized(df['stroke'], self.stroke_map)
 
         # Kolom Biner Lainnya (Yes/No)
         bool_cols = ['family_diabetes', 'hypertensive', 'family_hypertension', 'cardiovascular_disease']
         for col in bool_cols:
             if col in df.columns:
                 # Konversi manual dictionary replace lebih aman daripada map untuk parsial match
-                df[col] = df[col].astype(str).str.lower().str.strip()
-                df[col] = df[col].replace(self.bool_replace)
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+                df[col] = self._map_normalized(df[col], self.bool_replace, keep_unmapped=True)
 
         # --- F. HANDLING TARGET (KHUSUS TRAINING) ---
         if is_training and 'diabetic' in df.columns:
-            df['diabetic'] = df['diabetic'].astype(str).str.lower().str.strip().map(self.target_map)
+            df['diabetic'] = self._map_normalized(df['diabetic'], self.target_map)
             df = df.dropna(subset=['diabetic'])
             df['diabetic'] = df['diabetic'].astype(int)
 
@@ -126,6 +114,75 @@ class DiabetesPreprocessor:
 
         return df
 
+    def convert_units(self, feature, values):
+        """
+        Konversi satuan otomatis ke satuan dataset DiaBD (Series atau array).
+        1. Glukosa: mg/dL (Satuan umum alat tes) -> mmol/L. Logika: Glukosa > 30 biasanya mg/dL
+           (Normal puasa ~70-100). mmol/L biasanya 4-7.
+        2. Tinggi: cm -> meter. Logika: Tinggi > 3 biasanya cm (misal 170). Meter biasanya 1.7.
+        Fitur lain dikembalikan tanpa perubahan (sebagai Series).
+        """
+        rules = {'glucose': (30, 18), 'height': (3, 100)}
+        values = values if isinstance(values, pd.Series) else pd.Series(values, dtype=float)
+        if feature not in rules:
+            return values
+        limit, divisor = rules[feature]
+        return values.where(~(values > limit), (values / divisor).round(2))
+
+    def _map_normalized(self, series, mapping, keep_unmapped=False):
+        """
+        Lowercase + strip lalu mapping, dihitung sekali per nilai unik (kolom kategorikal
+        hanya punya segelintir variasi walau jumlah barisnya jutaan).
+        keep_unmapped=True: nilai di luar mapping dipertahankan lalu dikonversi ke numerik.
+        """
+        codes, uniques = pd.factorize(series.astype(str))
+        normalized = pd.Series(uniques, dtype=object).str.lower().str.strip()
+        mapped = normalized.map(mapping)
+        if keep_unmapped:
+            mapped = pd.to_numeric(mapped.where(mapped.notnull(), normalized), errors='coerce')
+        return pd.Series(mapped.to_numpy()[codes], index=series.index)
+
+    def row_errors(self, df):
+        """
+        Validasi per baris untuk input massal (upload CSV) sebelum clean_and_encode.
+        Mengembalikan Series pesan error ('' jika baris valid), dihitung per kolom (vektor).
+        """
+        missing = pd.Series(np.nan, index=df.index)
+        checks = []  # (mask baris bermasalah, pesan)
+
+        def blank(series):
+            # Kosong/NaN, dicek sekali per nilai unik (seperti _map_normalized)
+            codes, uniques = pd.factorize(series)
+            empty = (pd.Series(uniques, dtype=object).astype(str).str.strip() == '').to_numpy()
+            # Kode -1 (NaN) mengambil elemen terakhir = True
+            return np.append(empty, True)[codes]
+
+        # Numerik wajib (BMI opsional: dihitung dari tinggi & berat)
+        for col in ['age', 'pulse_rate', 'systolic_bp', 'diastolic_bp', 'glucose', 'height', 'weight', 'bmi']:
+            column = df[col] if col in df.columns else missing
+            empty = blank(column)
+            values = pd.to_numeric(column, errors='coerce').to_numpy()
+            if col != 'bmi':
+                checks.append((empty, f"{col} kosong"))
+            checks.append((~empty & np.isnan(values), f"{col} bukan angka"))
+            checks.append((~empty & (values <= 0), f"{col} harus > 0"))
+
+        # Kategorikal: gender wajib, kolom Yes/No boleh kosong (dianggap 0) tetapi harus dikenali
+        gender = df['gender'] if 'gender' in df.columns else missing
+        checks.append((self._map_normalized(gender, self.gender_map).isnull().to_numpy(), "gender tidak dikenali"))
+        bool_cols = ['family_diabetes', 'hypertensive', 'family_hypertension', 'cardiovascular_disease']
+        for col, mapping, keep in [(c, self.bool_replace, True) for c in bool_cols] + [('stroke', self.stroke_map, False)]:
+            if col in df.columns:
+                mapped = self._map_normalized(df[col], mapping, keep_unmapped=keep)
+                checks.append((~blank(df[col]) & ~mapped.isin([0, 1]).to_numpy(), f"{col} tidak dikenali"))
+
+        # Pesan hanya disusun untuk baris bermasalah (umumnya sedikit)
+        masks = np.column_stack([mask for mask, _ in checks])
+        errors = pd.Series('', index=df.index, dtype=object)
+        for row in np.flatnonzero(masks.any(axis=1)):
+            errors.iat[row] = '; '.join(message for (_, message), hit in zip(checks, masks[row]) if hit)
+        return errors
+
     def get_features(self, df):
         """Mengambil hanya kolom fitur (X) sesuai urutan training."""
         return df[self.feature_order]
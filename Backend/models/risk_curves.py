@@ -0,0 +1,120 @@
+"""
+Backend/models/risk_curves.py
+Kurva risiko populasi (partial dependence) per versi model.
+
+Untuk setiap fitur kurva (glukosa, BMI, usia, sistolik), seluruh sampel populasi (diabetes.csv,
+bukan data balanced agar mencerminkan pasien nyata) diberi nilai grid yang sama lalu diskor
+dalam satu matriks: rata-rata probabilitas = partial dependence, p10/p90 = sebaran antar pasien.
+BMI dijaga konsisten dengan berat (berat = BMI x tinggi^2) seperti simulasi what-if.
+
+Dihitung sekali per versi model (saat training atau saat model dimuat jika file belum ada / versi
+berbeda) dan disimpan di samping decision_tree_meta.json (Config.RISK_CURVES_PATH).
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+from Backend.config import Config
+from Backend.models.preprocess import DiabetesPreprocessor
+from Backend.models.what_if import UNITS
+
+
+def background_sample(n_rows=None, random_state=42):
+    """Sampel populasi ter-encode (float32, urutan feature_order) dari dataset mentah."""
+    n_rows = n_rows or Config.RISK_CURVE_BACKGROUND
+    pp = DiabetesPreprocessor()
+    df = pp.clean_and_encode(pd.read_csv(Config.RAW_DATA), is_training=True)
+    X = pp.get_features(df).to_numpy(dtype=np.float32)
+    if len(X) > n_rows:
+        X = X[np.random.default_rng(random_state).choice(len(X), n_rows, replace=False)]
+    return X
+
+
+def _predict(model, M, feature_order, batch_rows):
+    out = np.empty(len(M))
+    for start in range(0, len(M), batch_rows):
+        batch = pd.DataFrame(M[start:start + batch_rows], columns=feature_order)
+        out[start:start + batch_rows] = model.predict_proba(batch)[:, 1]
+    return out
+
+
+def compute_risk_curves(model, X_background, feature_order, features=None, n_points=None, batch_rows=250000):
+    """Partial dependence + pita p10/p90 (persen) untuk setiap fitur, grid dari kuantil populasi."""
+    features = features or Config.RISK_CURVE_FEATURES
+    n_points = n_points or Config.RISK_CURVE_POINTS
+    index = {name: i for i, name in enumerate(feature_order)}
+    X_background = np.asarray(X_background, dtype=np.float32)
+    n = len(X_background)
+
+    curves = {}
+    for name in features:
+        j = index[name]
+        column = X_background[:, j]
+        grid = np.unique(np.round(np.quantile(column, np.linspace(0.02, 0.98, n_points)), 2))
+
+        # Satu matriks (n_grid x n_populasi) baris: setiap pasien dengan setiap nilai grid
+        M = np.tile(X_background, (len(grid), 1))
+        M[:, j] = np.repeat(grid, n)
+        if name == 'bmi':
+            M[:, index['weight']] = np.round(M[:, j] * M[:, index['height']] ** 2, 2)
+        proba = _predict(model, M, feature_order, batch_rows).reshape(len(grid), n)
+
+        curves[name] = {
+            'label': Config.FEATURE_DESCRIPTIONS.get(name, name),
+            'unit': UNITS.get(name, ''),
+            'values': grid.round(2).tolist(),
+            'mean_percent': (proba.mean(axis=1) * 100).round(2).tolist(),
+            'p10_percent': (np.percentile(proba, 10, axis=1) * 100).round(2).tolist(),
+            'p90_percent': (np.percentile(proba, 90, axis=1) * 100).round(2).tolist(),
+            # Posisi pasien nyata pada sumbu (untuk penanda di grafik)
+            'population_quantiles': {
+                f'p{q}': round(float(np.percentile(column, q)), 2) for q in (10, 50, 90)
+            }
+        }
+    return curves
+
+
+def build_risk_curves(model, model_version, X_background=None):
+    X_background = background_sample() if X_background is None else X_background
+    return {
+        'model_version': model_version,
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'background_rows': int(len(X_background)),
+        'curves': compute_risk_curves(model, X_background, DiabetesPreprocessor().feature_order)
+    }
+
+
+def save_risk_curves(payload, path=None):
+    """Tulis atomik (file sementara + rename) agar worker lain tidak membaca file setengah jadi."""
+    path = path or Config.RISK_CURVES_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_risk_curves(model_version, path=None):
+    """
+    Kurva untuk versi model ini dari file (dibuat Scripts/train_model.py saat menyimpan bundle).
+    None jika file belum ada, rusak, atau dibuat untuk versi model lain.
+    Serving tidak pernah menghitung/menulis kurva (beberapa worker akan berebut file yang sama).
+    """
+    path = path or Config.RISK_CURVES_PATH
+    if not os.path.exists(path):
+        print(f"⚠️ Warning: File kurva risiko tidak ditemukan: {path}. Jalankan Scripts/train_model.py")
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Warning: File kurva risiko tidak bisa dibaca: {e}")
+        return None
+    if payload.get('model_version') != model_version:
+        print(f"⚠️ Warning: Kurva risiko untuk model versi {payload.get('model_version')}, "
+              f"bukan {model_version}. Jalankan ulang Scripts/train_model.py")
+        return None
+    return payload
@@ -0,0 +1,67 @@
+"""
+Backend/models/screening.py
+Seleksi kohort top-K risiko tertinggi dari jutaan hasil skrining tanpa menyimpan seluruh skor.
+
+- Per chunk: kandidat top-K dipilih secara vektor (np.partition), hanya baris dengan
+  probabilitas >= ambang heap saat ini yang dipertimbangkan.
+- Global: min-heap berukuran tetap K berisi (probabilitas, -urutan input). Seri probabilitas
+  dimenangkan baris input yang lebih awal, sehingga hasil deterministik walau chunk
+  selesai tidak berurutan (process pool).
+- Ringkasan jumlah pasien per tingkat risiko dihitung dari seluruh baris.
+
+Memori konstan terhadap ukuran input: O(K + ukuran chunk).
+"""
+
+import heapq
+import numpy as np
+
+from Backend.models.utils import RISK_LEVELS, risk_level_codes
+
+
+def chunk_top_k(proba, k, threshold=-np.inf):
+    """
+    Indeks top-k satu chunk, urut probabilitas turun lalu posisi naik.
+    Hanya baris dengan probabilitas >= threshold; NaN (baris tidak valid) selalu gugur.
+    """
+    idx = np.flatnonzero(proba >= threshold)
+    if len(idx) > k:
+        # Nilai ke-k terbesar; seluruh seri pada nilai itu ikut agar urutan input menentukan
+        kth = np.partition(proba[idx], len(idx) - k)[len(idx) - k]
+        idx = idx[proba[idx] >= kth]
+    return idx[np.lexsort((idx, -proba[idx]))[:k]]
+
+
+def risk_level_counts(proba):
+    """Jumlah baris per tingkat risiko (baris NaN tidak dihitung)."""
+    valid = proba[~np.isnan(proba)]
+    return np.bincount(risk_level_codes(valid), minlength=len(RISK_LEVELS))
+
+
+class TopKSelector:
+    def __init__(self, k):
+        if k < 1:
+            raise ValueError("K harus >= 1")
+        self.k = k
+        self._heap = []  # (probabilitas, -urutan, record): elemen terkecil = paling cepat tergeser
+        self.risk_counts = np.zeros(len(RISK_LEVELS), dtype=np.int64)
+
+    @property
+    def threshold(self):
+        """Probabilitas minimum agar kandidat baru masih mungkin masuk (-inf jika heap belum penuh)."""
+        return self._heap[0][0] if len(self._heap) >= self.k else -np.inf
+
+    def push(self, probability, order, record):
+        entry = (float(probability), -int(order), record)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def extend(self, candidates):
+        """candidates: iterable (probabilitas, urutan input, record)."""
+        for probability, order, record in candidates:
+            self.push(probability, order, record)
+
+    def ranked(self):
+        """[(probabilitas, urutan, record)] dari risiko tertinggi; seri: urutan input lebih awal dulu."""
+        return [(p, -neg_order, record) for p, neg_order, record in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
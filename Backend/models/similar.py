@@ -0,0 +1,120 @@
+"""
+Backend/models/similar.py
+Pencarian pasien serupa (k-nearest neighbors) dari data training untuk review klinis.
+
+Matriks fitur ter-encode dari diabetes.csv (data asli, bukan hasil balancing/sintetis)
+distandarisasi (z-score per fitur) lalu diindeks dengan BallTree saat training. Artefak disimpan
+dengan joblib sehingga saat dimuat dengan mmap_mode='r' seluruh array (termasuk array internal
+BallTree) di-memory-map: worker gunicorn berbagi halaman yang sama dan tidak menyalin indeks.
+
+BallTree dipilih karena lebih stabil dari KDTree pada 14 dimensi (banyak fitur biner).
+Query tunggal maupun batch memakai satu panggilan tree.query (sub-milidetik per pasien).
+"""
+
+import os
+import joblib
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from sklearn.neighbors import BallTree
+
+from Backend.config import Config
+from Backend.models.preprocess import DiabetesPreprocessor
+
+
+class SimilarPatientIndex:
+    def __init__(self, tree, mean, scale, records, outcomes, feature_order, source=None, built_at=None):
+        self.tree = tree
+        self.mean = mean
+        self.scale = scale
+        self.records = records      # Fitur ter-encode (satuan dataset) untuk ditampilkan
+        self.outcomes = outcomes    # Label diabetic (0/1) per baris
+        self.feature_order = feature_order
+        self.source = source
+        self.built_at = built_at
+
+    # --- 1. BUILD / SIMPAN / MUAT ---
+
+    @classmethod
+    def from_dataset(cls, data_path=None, leaf_size=40):
+        """Membangun indeks dari CSV mentah (default Config.RAW_DATA)."""
+        data_path = data_path or Config.RAW_DATA
+        pp = DiabetesPreprocessor()
+        df = pp.clean_and_encode(pd.read_csv(data_path), is_training=True)
+        records = pp.get_features(df).to_numpy(dtype=np.float32)
+
+        mean = records.mean(axis=0, dtype=np.float64)
+        scale = records.std(axis=0, dtype=np.float64)
+        scale[scale == 0] = 1.0
+        tree = BallTree((records - mean) / scale, leaf_size=leaf_size)
+        return cls(tree, mean, scale, records, pp.get_target(df).to_numpy(dtype=np.int8),
+                   pp.feature_order, source=os.path.basename(data_path),
+                   built_at=datetime.now().isoformat(timespec='seconds'))
+
+    def save(self, path=None):
+        """Tulis atomik (file sementara + rename) agar worker lain tidak memuat file setengah jadi."""
+        path = path or Config.SIMILAR_INDEX_PATH
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        joblib.dump(self.__dict__, tmp_path)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=None, mmap_mode='r'):
+        return cls(**joblib.load(path or Config.SIMILAR_INDEX_PATH, mmap_mode=mmap_mode))
+
+    @classmethod
+    def load_if_fresh(cls, path=None):
+        """
+        Indeks dari file (dibangun Scripts/train_model.py); None jika belum ada, rusak,
+        atau lebih lama dari dataset. Serving tidak pernah membangun/menulis indeks.
+        """
+        path = path or Config.SIMILAR_INDEX_PATH
+        if not os.path.exists(path):
+            print(f"⚠️ Warning: Indeks pasien serupa tidak ditemukan: {path}. Jalankan Scripts/train_model.py")
+            return None
+        if os.path.exists(Config.RAW_DATA) and os.path.getmtime(path) < os.path.getmtime(Config.RAW_DATA):
+            print("⚠️ Warning: Indeks pasien serupa lebih lama dari dataset. Jalankan ulang Scripts/train_model.py")
+            return None
+        try:
+            return cls.load(path)
+        except Exception as e:
+            print(f"⚠️ Warning: Indeks pasien serupa rusak: {e}")
+            return None
+
+    # --- 2. QUERY ---
+
+    def query(self, X, k=None):
+        """(jarak, indeks baris) k tetangga terdekat untuk setiap baris X (fitur ter-encode)."""
+        k = min(k or Config.SIMILAR_DEFAULT_K, len(self.records))
+        Z = (np.asarray(X, dtype=np.float64) - self.mean) / self.scale
+        return self.tree.query(Z, k=k)
+
+    def neighbors(self, X, k=None):
+        """Daftar pasien serupa per baris X: jarak (ruang terstandarisasi), fitur, dan outcome."""
+        distances, indices = self.query(X, k)
+        gender_idx = self.feature_order.index('gender')
+        results = []
+        for dist_row, idx_row in zip(distances, indices):
+            records = self.records[idx_row]
+            entries = []
+            for rank, (distance, row, values) in enumerate(zip(dist_row, idx_row, records), start=1):
+                patient = {name: round(float(v), 2) for name, v in zip(self.feature_order, values)}
+                patient['gender'] = 'Male' if values[gender_idx] == 1 else 'Female'
+                diabetic = int(self.outcomes[row])
+                entries.append({
+                    'rank': rank,
+                    'row': int(row),
+                    'distance': round(float(distance), 4),
+                    'diabetic': diabetic,
+                    'label': 'Diabetic' if diabetic == 1 else 'Non-Diabetic',
+                    'patient': patient
+                })
+            results.append(entries)
+        return results
+
+    def summary(self, neighbors):
+        """Ringkasan outcome tetangga (proporsi diabetic) untuk satu pasien."""
+        n = len(neighbors)
+        diabetic = sum(entry['diabetic'] for entry in neighbors)
+        return {'k': n, 'diabetic': diabetic, 'diabetic_percent': round(diabetic / n * 100, 2) if n else 0.0}
@@ -0,0 +1,170 @@
+"""
+Backend/models/synthetic.py
+Generator data pasien sintetis untuk uji skala (training, balancing, preprocessing, log).
+
+Model generatif (per kelas diabetic 0/1):
+- Marginal setiap fitur: kuantil empiris dari data asli (fitur diskrit memakai invers CDF bertingkat).
+- Korelasi antar fitur: Gaussian copula (matriks korelasi skor normal dari ranking data asli).
+- BMI dihitung ulang dari tinggi/berat agar konsisten seperti preprocess.
+
+Sampel dibuat per blok berukuran tetap dengan seed per blok (SeedSequence), sehingga
+output deterministik terhadap random_state dan bisa di-stream tanpa menampung semua baris.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr
+from scipy.stats import norm, rankdata
+
+from Backend.models.preprocess import DiabetesPreprocessor
+
+BLOCK_ROWS = 65536
+
+# Kolom biner yang di format mentah ditulis sebagai 'Yes'/'No'
+RAW_BOOL_COLUMNS = ['family_diabetes', 'hypertensive', 'family_hypertension', 'cardiovascular_disease', 'stroke']
+
+
+def _infer_decimals(col, max_decimals=3):
+    """Jumlah desimal terkecil yang merepresentasikan seluruh nilai kolom."""
+    for d in range(max_decimals + 1):
+        if np.allclose(np.round(col, d), col, atol=1e-4):
+            return d
+    return max_decimals
+
+
+def _nearest_correlation(corr, eps=1e-6):
+    """Memastikan matriks korelasi positive definite (eigenvalue di-clip) agar Cholesky aman."""
+    vals, vecs = np.linalg.eigh(corr)
+    fixed = (vecs * np.clip(vals, eps, None)) @ vecs.T
+    d = np.sqrt(np.diag(fixed))
+    return fixed / np.outer(d, d)
+
+
+class SyntheticPatientGenerator:
+    """Mempelajari distribusi 14 fitur DiaBD + label dari data ter-encode, lalu membangkitkan sampel."""
+
+    def __init__(self, n_quantiles=1001, feature_order=None):
+        self.n_quantiles = n_quantiles
+        self.feature_order = list(feature_order or DiabetesPreprocessor().feature_order)
+
+    def fit(self, df_encoded, target='diabetic'):
+        """df_encoded: output clean_and_encode(is_training=True) (fitur float + target 0/1)."""
+        X = df_encoded[self.feature_order].to_numpy(dtype=np.float64)
+        y = df_encoded[target].to_numpy().astype(int)
+
+        self.target_ = target
+        self.classes_ = np.unique(y)
+        self.class_prior_ = np.array([np.mean(y == c) for c in self.classes_])
+        self.decimals_ = np.array([_infer_decimals(col) for col in X.T])
+        self.discrete_ = np.array([len(np.unique(col)) <= 10 for col in X.T])
+        self.low_ = X.min(axis=0)
+        self.high_ = X.max(axis=0)
+        self.probs_ = np.linspace(0, 1, self.n_quantiles)
+
+        self.quantiles_, self.cholesky_ = [], []
+        for c in self.classes_:
+            Xc = X[y == c]
+
+            # Kuantil marginal: linear untuk kontinu, invers CDF bertingkat untuk diskrit
+            q = np.empty((self.n_quantiles, Xc.shape[1]))
+            for j, col in enumerate(Xc.T):
+                method = 'inverted_cdf' if self.discrete_[j] else 'linear'
+                q[:, j] = np.quantile(col, self.probs_, method=method)
+            self.quantiles_.append(q)
+
+            # Skor normal dari ranking -> korelasi copula
+            U = (rankdata(Xc, axis=0) - 0.5) / len(Xc)
+            Z = norm.ppf(U)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                corr = np.corrcoef(Z, rowvar=False)
+            # Kolom konstan (std = 0) tidak berkorelasi dengan apapun
+            corr = np.nan_to_num(corr, nan=0.0)
+            np.fill_diagonal(corr, 1.0)
+            self.cholesky_.append(np.linalg.cholesky(_nearest_correlation(corr)))
+        return self
+
+    def _sample_class(self, k, n, rng):
+        z = rng.standard_normal((n, len(self.feature_order))) @ self.cholesky_[k].T
+        # Grid kuantil seragam -> posisi knot dihitung langsung (tanpa binary search)
+        pos = ndtr(z) * (self.n_quantiles - 1)
+        lower = np.minimum(pos.astype(np.intp), self.n_quantiles - 2)
+        frac = pos - lower
+        q = self.quantiles_[k]
+        cols = np.arange(q.shape[1])
+        X = q[lower, cols] + frac * (q[lower + 1, cols] - q[lower, cols])
+        # Fitur diskrit: invers CDF bertingkat (nilai knot di atasnya, tanpa interpolasi)
+        step = q[np.ceil(pos[:, self.discrete_]).astype(np.intp), cols[self.discrete_]]
+        X[:, self.discrete_] = step
+        return X
+
+    def sample_block(self, n, seed, positive_rate=None):
+        """Satu blok sampel ter-encode (DataFrame float32 + target int)."""
+        rng = np.random.default_rng(seed)
+        prior = self.class_prior_
+        if positive_rate is not None:
+            prior = np.array([1.0 - positive_rate, positive_rate])
+        labels = rng.choice(self.classes_, size=n, p=prior)
+
+        X = np.empty((n, len(self.feature_order)))
+        for k, c in enumerate(self.classes_):
+            mask = labels == c
+            if mask.any():
+                X[mask] = self._sample_class(k, int(mask.sum()), rng)
+
+        X = np.clip(X, self.low_, self.high_)
+        for j, d in enumerate(self.decimals_):
+            X[:, j] = np.round(X[:, j], d)
+
+        # BMI konsisten dengan tinggi/berat yang sudah dibulatkan (rumus sama seperti preprocess)
+        names = self.feature_order
+        if {'bmi', 'height', 'weight'} <= set(names):
+            h, w, b = names.index('height'), names.index('weight'), names.index('bmi')
+            valid = X[:, h] > 0
+            X[valid, b] = np.round(X[valid, w] / (X[valid, h] ** 2), 2)
+
+        df = pd.DataFrame(X.astype(np.float32), columns=self.feature_order)
+        # Kolom tanpa desimal disimpan sebagai integer (output CSV lebih ringkas & cepat)
+        for j in np.flatnonzero(self.decimals_ == 0):
+            df[self.feature_order[j]] = X[:, j].astype(np.int32)
+        df[self.target_] = labels.astype(int)
+        return df
+
+    def iter_blocks(self, n_rows, random_state=42, positive_rate=None, block_rows=BLOCK_ROWS):
+        """Generator blok sampel; hasil identik untuk random_state yang sama."""
+        n_blocks = -(-n_rows // block_rows)
+        seeds = np.random.SeedSequence(random_state).spawn(n_blocks)
+        for i, seed in enumerate(seeds):
+            size = min(block_rows, n_rows - i * block_rows)
+            yield self.sample_block(size, seed, positive_rate=positive_rate)
+
+
+def to_raw_form(df, seed, unit_mix=0.5, missing_bmi=0.1, target='diabetic'):
+    """
+    Mengubah blok ter-encode ke format mentah (seperti input form/dataset) untuk menguji
+    cabang konversi clean_and_encode: glukosa mg/dL, tinggi cm, BMI kosong, string Yes/No.
+    unit_mix: proporsi baris yang memakai satuan mg/dL & cm (sisanya mmol/L & meter).
+    """
+    rng = np.random.default_rng(seed)
+    n = len(df)
+    raw = df.copy()
+
+    if 'glucose' in raw.columns:
+        glucose = df['glucose'].to_numpy(dtype=np.float64)
+        # Ambang preprocess 30: mmol/L > 30 selalu ditulis mg/dL, mg/dL <= 30 tetap mmol/L
+        mgdl = ((rng.random(n) < unit_mix) & (glucose * 18 > 30.5)) | (glucose > 30)
+        raw['glucose'] = np.where(mgdl, np.round(glucose * 18), np.round(glucose, 2))
+    if 'height' in raw.columns:
+        height = df['height'].to_numpy(dtype=np.float64)
+        cm = rng.random(n) < unit_mix
+        raw['height'] = np.where(cm, np.round(height * 100, 1), np.round(height, 2))
+    if 'bmi' in raw.columns:
+        raw['bmi'] = raw['bmi'].astype(np.float64).round(2).mask(rng.random(n) < missing_bmi)
+
+    if 'gender' in raw.columns:
+        raw['gender'] = np.where(df['gender'].to_numpy() >= 0.5, 'Male', 'Female')
+    for col in RAW_BOOL_COLUMNS:
+        if col in raw.columns:
+            raw[col] = np.where(df[col].to_numpy() >= 0.5, 'Yes', 'No')
+    if target in raw.columns:
+        raw[target] = np.where(df[target].to_numpy() == 1, 'Yes', 'No')
+    return raw
@@ -0,0 +1,304 @@
+"""
+Backend/models/training.py
+Utilitas training bersama untuk Scripts/train_model.py.
+Fokus: Cross Validation satu kali jalan (fold di-cache & dipakai ulang)
+dan pencarian hyperparameter (Successive Halving).
+"""
+
+import math
+import time
+import numpy as np
+from joblib import Parallel, delayed
+
+from sklearn.base import clone
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.model_selection import StratifiedKFold, ParameterGrid, ParameterSampler
+from sklearn.linear_model import LogisticRegression
+from sklearn.calibration import CalibratedClassifierCV
+
+try:
+    # scikit-learn >= 1.6: pengganti cv='prefit' (yang sudah deprecated)
+    from sklearn.frozen import FrozenEstimator
+except ImportError:
+    FrozenEstimator = None
+
+# Hyperparameter default (sama dengan yang dipakai model produksi)
+DEFAULT_TREE_PARAMS = {
+    'criterion': 'entropy',
+    'max_depth': 6,
+    'min_samples_leaf': 10,
+    'min_samples_split': 20,
+}
+
+# Ruang pencarian default untuk mode 'search'
+DEFAULT_SEARCH_SPACE = {
+    'criterion': ['gini', 'entropy'],
+    'max_depth': [4, 6, 8, 10, None],
+    'min_samples_leaf': [5, 10, 20],
+    'min_samples_split': [10, 20, 40],
+}
+
+
+def build_pipeline(params=None, random_state=42, sampler=None):
+    """
+    Membangun Pipeline scaler + Decision Tree dengan hyperparameter tertentu.
+    Jika sampler diberikan (misal FoldSMOTE), dipakai Pipeline imblearn agar
+    oversampling hanya terjadi saat fit di dalam fold training.
+    """
+    tree_params = dict(DEFAULT_TREE_PARAMS)
+    tree_params.update(params or {})
+
+    dt_classifier = DecisionTreeClassifier(
+        class_weight="balanced",
+        random_state=random_state,
+        **tree_params
+    )
+
+    if sampler is not None:
+        from imblearn.pipeline import Pipeline as SamplerPipeline
+        return SamplerPipeline([
+            ('smote', sampler),
+            ('scaler', StandardScaler()),
+            ('dt', dt_classifier)
+        ])
+
+    return Pipeline([
+        ('scaler', StandardScaler()),
+        ('dt', dt_classifier)
+    ])
+
+
+def make_folds(y, n_splits=5, shuffle=False, random_state=None):
+    """
+    Menghitung indeks fold (train, test) SEKALI agar bisa dipakai ulang.
+    Default (tanpa shuffle) = split yang dipakai CalibratedClassifierCV(cv=5) di mode standard.
+    """
+    cv = StratifiedKFold(n_splits=n_splits, shuffle=shuffle,
+                         random_state=random_state if shuffle else None)
+    y_arr = np.asarray(y)
+    return list(cv.split(np.zeros(len(y_arr)), y_arr))
+
+
+def _fit_fold(pipeline, X, y, train_idx, test_idx):
+    """Melatih satu member fold dan mengembalikan skor out-of-fold (belum dikalibrasi)."""
+    member = clone(pipeline)
+    member.fit(X.iloc[train_idx], y.iloc[train_idx])
+    oof_scores = member.predict_proba(X.iloc[test_idx])[:, 1]
+    return member, oof_scores
+
+
+def fit_cv_members(pipeline, X, y, folds, n_jobs=-1):
+    """
+    Melatih satu pipeline per fold secara paralel.
+    Mengembalikan list (member, skor_oof) dengan urutan yang sama seperti folds.
+    """
+    return Parallel(n_jobs=n_jobs)(
+        delayed(_fit_fold)(pipeline, X, y, train_idx, test_idx)
+        for train_idx, test_idx in folds
+    )
+
+
+def _calibrate_prefit(member, X, y):
+    """
+    Kalibrasi sigmoid untuk member yang sudah dilatih, pada data (X, y) yang tidak dipakai
+    saat training member. Mengembalikan satu _CalibratedClassifier dengan .estimator = member.
+    """
+    if FrozenEstimator is not None:
+        calibrated = CalibratedClassifierCV(FrozenEstimator(member), method='sigmoid').fit(X, y)
+        calibrated_classifier = calibrated.calibrated_classifiers_[0]
+        calibrated_classifier.estimator = member  # Bundle sama persis dengan versi scikit-learn lama
+        return calibrated_classifier
+    return CalibratedClassifierCV(member, method='sigmoid', cv='prefit').fit(X, y).calibrated_classifiers_[0]
+
+
+def cross_fitted_accuracy(members, y, folds):
+    """
+    Akurasi CV dari skor out-of-fold yang sudah di-cache.
+    Kalibrator sigmoid untuk fold k dilatih dari skor OOF fold LAIN,
+    sehingga fold k tetap menjadi data uji murni (tanpa training ulang).
+
+    Catatan: ini BUKAN estimator yang sama dengan mode standard (cross_val_score atas
+    CalibratedClassifierCV, 25 fit bersarang), sehingga nilainya bisa berbeda sedikit.
+    Karena itu metadata menyimpannya sebagai 'accuracy_cross_fitted', bukan 'accuracy_cv'.
+    """
+    y_arr = np.asarray(y)
+    scores = []
+
+    for k, (_, test_idx) in enumerate(folds):
+        other_scores = np.concatenate([m[1] for i, m in enumerate(members) if i != k])
+        other_y = np.concatenate([y_arr[folds[i][1]] for i in range(len(folds)) if i != k])
+
+        # Sigmoid (Platt) langsung di atas skor OOF: LogisticRegression 1 fitur tanpa regularisasi
+        calibrator = LogisticRegression(penalty=None).fit(other_scores.reshape(-1, 1), other_y)
+        y_pred = calibrator.predict(members[k][1].reshape(-1, 1))
+        scores.append(float(np.mean(y_pred == y_arr[test_idx])))
+
+    return np.array(scores)
+
+
+def assemble_calibrated_model(pipeline, members, X, y, folds):
+    """
+    Menyusun CalibratedClassifierCV final dari member fold yang sudah dilatih.
+    Hasilnya setara dengan CalibratedClassifierCV(method='sigmoid', cv=folds).fit(X, y):
+    tiap member dikalibrasi pada fold uji miliknya sendiri.
+    """
+    calibrated_model = CalibratedClassifierCV(estimator=pipeline, method='sigmoid', cv=folds)
+    calibrated_model.classes_ = np.unique(np.asarray(y))
+    calibrated_model.calibrated_classifiers_ = [
+        _calibrate_prefit(member, X.iloc[test_idx], y.iloc[test_idx])
+        for (member, _), (_, test_idx) in zip(members, folds)
+    ]
+
+    first_clf = calibrated_model.calibrated_classifiers_[0].estimator
+    if hasattr(first_clf, "n_features_in_"):
+        calibrated_model.n_features_in_ = first_clf.n_features_in_
+    if hasattr(first_clf, "feature_names_in_"):
+        calibrated_model.feature_names_in_ = first_clf.feature_names_in_
+
+    return calibrated_model
+
+
+def train_single_pass(X, y, params=None, n_splits=5, random_state=42, n_jobs=-1, sampler=None):
+    """
+    Training mode 'fast': satu putaran CV menghasilkan metrik CV DAN model final.
+    Total fit = n_splits pipeline (vs 30 pada mode standard).
+
+    Fold = StratifiedKFold tanpa shuffle (sama dengan cv=5 di mode standard), sehingga
+    model final identik dengan model standard. Skor CV memakai definisi cross-fitted
+    (lihat cross_fitted_accuracy), bukan cross_val_score bersarang.
+    """
+    pipeline = build_pipeline(params, random_state=random_state, sampler=sampler)
+    folds = make_folds(y, n_splits=n_splits)
+    members = fit_cv_members(pipeline, X, y, folds, n_jobs=n_jobs)
+
+    cv_scores = cross_fitted_accuracy(members, y, folds)
+    calibrated_model = assemble_calibrated_model(pipeline, members, X, y, folds)
+    return calibrated_model, cv_scores
+
+
+# --- HYPERPARAMETER SEARCH (SUCCESSIVE HALVING) ---
+
+def _evaluate_candidate_fold(params, X, y, train_idx, test_idx, random_state, latency_repeats, sampler=None):
+    """
+    Melatih satu kandidat pada satu fold (dijalankan di worker process).
+    Mengembalikan akurasi fold dan latensi inferensi satu baris (mikrodetik).
+    """
+    pipeline = build_pipeline(params, random_state=random_state, sampler=sampler)
+    pipeline.fit(X[train_idx], y[train_idx])
+
+    y_pred = (pipeline.predict_proba(X[test_idx])[:, 1] >= 0.5).astype(int)
+    accuracy = float(np.mean(y_pred == y[test_idx]))
+
+    # Latensi serving: median predict_proba untuk satu baris input
+    row = X[test_idx[:1]]
+    timings = []
+    for _ in range(latency_repeats):
+        start = time.perf_counter_ns()
+        pipeline.predict_proba(row)
+        timings.append(time.perf_counter_ns() - start)
+    latency_us = float(np.median(timings)) / 1000.0
+
+    return accuracy, latency_us
+
+
+def _candidate_key(params):
+    return tuple(sorted(params.items(), key=lambda kv: kv[0]))
+
+
+def search_hyperparameters(X, y, search_space=None, n_candidates=None, eta=3,
+                           n_splits=5, latency_weight=0.01, latency_repeats=20,
+                           random_state=42, n_jobs=-1, sampler=None):
+    """
+    Successive Halving di atas process pool.
+
+    - Resource per rung = jumlah fold CV yang dievaluasi (1 -> eta -> ... -> n_splits).
+    - Dataset ter-encode (float32) dan indeks fold dihitung sekali lalu dibagikan
+      ke worker (joblib melakukan memmap untuk array besar).
+    - Hasil (kandidat, fold) di-cache sehingga kandidat yang naik rung tidak dilatih ulang.
+    - Skor = akurasi rata-rata - latency_weight * estimasi latensi serving (ms),
+      di mana latensi serving = latensi satu pipeline x jumlah member kalibrasi.
+    - Kandidat dinilai dari pipeline TANPA kalibrasi (threshold 0.5), sedangkan model yang
+      dikirim dikalibrasi sigmoid; hal ini dicatat di hasil sebagai 'candidate_scoring'.
+
+    Returns: (best_params, search_result_dict)
+    """
+    # eta < 2 tidak pernah mengeliminasi kandidat / menambah budget -> loop tidak berhenti
+    if eta < 2:
+        raise ValueError(f"eta harus >= 2 (diberikan: {eta})")
+
+    space = search_space or DEFAULT_SEARCH_SPACE
+    if n_candidates:
+        candidates = list(ParameterSampler(space, n_iter=n_candidates, random_state=random_state))
+    else:
+        candidates = list(ParameterGrid(space))
+
+    X_arr = np.ascontiguousarray(np.asarray(X, dtype=np.float32))
+    y_arr = np.asarray(y).astype(int)
+    folds = make_folds(y_arr, n_splits=n_splits, shuffle=True, random_state=random_state)
+
+    fold_cache = {}
+    trace = []
+    survivors = candidates
+    budget = 1
+    rung = 0
+
+    while True:
+        budget = min(budget, n_splits)
+
+        # Hanya evaluasi pasangan (kandidat, fold) yang belum ada di cache
+        jobs = [
+            (params, k) for params in survivors for k in range(budget)
+            if (_candidate_key(params), k) not in fold_cache
+        ]
+        results = Parallel(n_jobs=n_jobs, max_nbytes='1M')(
+            delayed(_evaluate_candidate_fold)(
+                params, X_arr, y_arr, folds[k][0], folds[k][1], random_state, latency_repeats, sampler
+            )
+            for params, k in jobs
+        )
+        for (params, k), result in zip(jobs, results):
+            fold_cache[(_candidate_key(params), k)] = result
+
+        scored = []
+        for params in survivors:
+            fold_results = [fold_cache[(_candidate_key(params), k)] for k in range(budget)]
+            accuracy = float(np.mean([r[0] for r in fold_results]))
+            latency_us = float(np.median([r[1] for r in fold_results])) * n_splits
+            score = accuracy - latency_weight * (latency_us / 1000.0)
+            scored.append((score, accuracy, latency_us, params))
+            trace.append({
+                'rung': rung,
+                'n_folds': budget,
+                'params': params,
+                'accuracy': round(accuracy, 4),
+                'latency_us': round(latency_us, 1),
+                'score': round(score, 4)
+            })
+
+        # Urutan stabil: skor tertinggi dulu, seri -> urutan kandidat awal
+        scored.sort(key=lambda item: -item[0])
+
+        if budget >= n_splits or len(scored) == 1:
+            break
+
+        keep = max(1, math.ceil(len(scored) / eta))
+        survivors = [item[3] for item in scored[:keep]]
+        budget *= eta
+        rung += 1
+
+    best_score, best_accuracy, best_latency, best_params = scored[0]
+    return best_params, {
+        'best_params': best_params,
+        'best_score': round(best_score, 4),
+        'best_accuracy': round(best_accuracy, 4),
+        'best_latency_us': round(best_latency, 1),
+        'n_candidates': len(candidates),
+        'n_fits': len(fold_cache),
+        'eta': eta,
+        'candidate_scoring': 'uncalibrated_pipeline_threshold_0.5',
+        'latency_weight': latency_weight,
+        'search_space': space,
+        'trace': trace
+    }
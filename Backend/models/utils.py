@@ -1,5 +1,8 @@
 import csv
 import os
+import bisect
+import numpy as np
+import pandas as pd
 from datetime import datetime
 from typing import Dict, Any
 
@@ -11,6 +14,46 @@ from Backend.models.preprocess import DiabetesPreprocessor
 _preprocessor = DiabetesPreprocessor()
 REQUIRED_FEATURES = _preprocessor.feature_order
 
+# Tingkat risiko respons API (/api/predict) berdasarkan probabilitas kelas Diabetic
+RISK_LEVELS = ['Rendah', 'Sedang', 'Tinggi']
+RISK_THRESHOLDS = [0.4, 0.7]
+
+def risk_level(probability: float) -> str:
+    """Tingkat risiko untuk satu probabilitas (>= 0.7 Tinggi, >= 0.4 Sedang, selain itu Rendah)."""
+    return RISK_LEVELS[bisect.bisect_right(RISK_THRESHOLDS, probability)]
+
+def risk_level_codes(probabilities) -> np.ndarray:
+    """Versi vektor risk_level: indeks RISK_LEVELS untuk setiap probabilitas."""
+    return np.searchsorted(RISK_THRESHOLDS, probabilities, side='right')
+
+# Scoring massal baris mentah (upload CSV /api/predict/csv, Scripts/score_file.py)
+# Kolom kategorikal dibaca sebagai teks agar nilai asli dikembalikan apa adanya
+RAW_TEXT_COLUMNS = ['gender', 'family_diabetes', 'hypertensive', 'family_hypertension',
+                    'cardiovascular_disease', 'stroke', 'diabetic']
+SCORE_COLUMNS = ['result', 'probability_percent', 'risk_level', 'error']
+
+def score_raw_rows(model, df_raw: pd.DataFrame, preprocessor: DiabetesPreprocessor = None):
+    """
+    Validasi per baris, encode & skor banyak baris mentah dalam satu predict_proba.
+    Mengembalikan (DataFrame SCORE_COLUMNS, mask baris valid, probabilitas mentah; NaN = tidak valid).
+    """
+    preprocessor = preprocessor or _preprocessor
+    errors = preprocessor.row_errors(df_raw)
+    valid = (errors == '').to_numpy()
+    proba = np.full(len(df_raw), np.nan)
+    if valid.any():
+        X = preprocessor.get_features(preprocessor.clean_and_encode(df_raw[valid]))
+        proba[valid] = model.predict_proba(X)[:, 1]
+
+    levels = np.array(RISK_LEVELS, dtype=object)[risk_level_codes(np.nan_to_num(proba))]
+    scored = pd.DataFrame({
+        'result': np.where(valid, np.where(proba >= 0.5, 'Diabetic', 'Non-Diabetic'), ''),
+        'probability_percent': np.round(proba * 100, 2),
+        'risk_level': np.where(valid, levels, ''),
+        'error': errors.to_numpy()
+    }, index=df_raw.index)
+    return scored, valid, proba
+
 def validate_input_data(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Validasi kelengkapan data input API.
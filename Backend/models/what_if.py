@@ -0,0 +1,135 @@
+"""
+Backend/models/what_if.py
+Simulasi what-if / counterfactual untuk satu pasien.
+
+- Seluruh kombinasi nilai sumbu (produk kartesius) dibangun sebagai SATU matriks NumPy
+  dari baris pasien yang sudah di-encode, lalu diskor dengan satu panggilan predict_proba.
+- Fitur turunan dijaga konsisten per varian: BMI dihitung ulang dari berat/tinggi; bila BMI
+  yang divariasikan, berat diturunkan dari BMI x tinggi^2.
+- Counterfactual: varian di bawah ambang probabilitas dengan perubahan terkecil, diukur sebagai
+  jumlah |perubahan| / rentang sumbu (L1 ternormalisasi) pada fitur yang divariasikan.
+
+Semua nilai memakai satuan dataset DiaBD (glukosa mmol/L, tinggi m); input sumbu dalam mg/dL
+atau cm dikonversi dengan aturan yang sama seperti DiabetesPreprocessor.
+"""
+
+import numpy as np
+
+# Fitur numerik yang boleh divariasikan
+WHAT_IF_FEATURES = ['age', 'pulse_rate', 'systolic_bp', 'diastolic_bp', 'glucose', 'height', 'weight', 'bmi']
+
+UNITS = {
+    'age': 'tahun', 'pulse_rate': 'bpm', 'systolic_bp': 'mmHg', 'diastolic_bp': 'mmHg',
+    'glucose': 'mmol/L', 'height': 'm', 'weight': 'kg', 'bmi': 'kg/m²'
+}
+
+
+def parse_axis(feature, spec, max_steps):
+    """Nilai sumbu dari {"min", "max", "steps"}, {"values": [...]}, atau list langsung."""
+    if feature not in WHAT_IF_FEATURES:
+        raise ValueError(f"Fitur '{feature}' tidak bisa divariasikan. Pilihan: {WHAT_IF_FEATURES}")
+
+    if isinstance(spec, dict) and 'values' in spec:
+        spec = spec['values']
+    if isinstance(spec, (list, tuple)):
+        values = np.asarray(spec, dtype=float)
+    elif isinstance(spec, dict) and 'min' in spec and 'max' in spec:
+        steps = int(spec.get('steps', 11))
+        if not 2 <= steps <= max_steps:
+            raise ValueError(f"steps untuk '{feature}' harus 2-{max_steps}")
+        values = np.linspace(float(spec['min']), float(spec['max']), steps)
+    else:
+        raise ValueError(f"Sumbu '{feature}' harus berupa {{min, max, steps}}, {{values}}, atau list nilai")
+
+    if values.ndim != 1 or not 0 < len(values) <= max_steps or not np.isfinite(values).all():
+        raise ValueError(f"Nilai sumbu '{feature}' harus 1-{max_steps} angka valid")
+    return values
+
+
+def build_variants(base_row, feature_order, axes):
+    """
+    Matriks varian (n_varian x n_fitur) float32 untuk produk kartesius sumbu (urutan dict axes,
+    indeks 'ij': sumbu terakhir berubah paling cepat).
+    """
+    if 'bmi' in axes and 'weight' in axes:
+        raise ValueError("BMI dan berat tidak bisa divariasikan bersamaan (berat diturunkan dari BMI)")
+
+    index = {name: i for i, name in enumerate(feature_order)}
+    mesh = np.meshgrid(*axes.values(), indexing='ij')
+    X = np.tile(np.asarray(base_row, dtype=np.float64), (mesh[0].size, 1))
+    for name, grid in zip(axes, mesh):
+        X[:, index[name]] = grid.ravel()
+
+    # Varian yang tidak mengubah sumber turunan mempertahankan nilai asli pasien
+    # (mis. BMI form 25.79 tidak dibulatkan ulang menjadi berat 70.21)
+    base = np.asarray(base_row, dtype=np.float64)
+    h, w, b = index['height'], index['weight'], index['bmi']
+    height = X[:, h]
+    if 'bmi' in axes:
+        changed = ~(np.isclose(X[:, b], base[b]) & np.isclose(height, base[h]))
+        X[changed, w] = np.round(X[changed, b] * height[changed] ** 2, 2)
+    elif 'weight' in axes or 'height' in axes:
+        changed = ~(np.isclose(X[:, w], base[w]) & np.isclose(height, base[h])) & (height > 0)
+        X[changed, b] = np.round(X[changed, w] / height[changed] ** 2, 2)
+    return X.astype(np.float32)
+
+
+def _spans(axes):
+    spans = {}
+    for name, values in axes.items():
+        span = float(values.max() - values.min())
+        spans[name] = span if span > 0 else max(abs(float(values[0])), 1.0)
+    return spans
+
+
+def find_counterfactual(X, proba, base_row, feature_order, axes, threshold):
+    """Varian di bawah ambang dengan perubahan ternormalisasi terkecil (seri: probabilitas terendah)."""
+    below = np.flatnonzero(proba < threshold)
+    if below.size == 0:
+        return None
+
+    index = {name: i for i, name in enumerate(feature_order)}
+    spans = _spans(axes)
+    distance = np.zeros(below.size)
+    for name in axes:
+        distance += np.abs(X[below, index[name]] - base_row[index[name]]) / spans[name]
+    best = below[np.lexsort((proba[below], distance))[0]]
+
+    # Fitur turunan (BMI/berat) ikut dilaporkan bila berubah
+    changes = {
+        name: {'from': round(float(base_row[i]), 2), 'to': round(float(X[best, i]), 2)}
+        for name, i in index.items() if name in WHAT_IF_FEATURES and not np.isclose(X[best, i], base_row[i])
+    }
+    return {
+        'changes': changes,
+        'distance': round(float(distance[np.searchsorted(below, best)]), 4),
+        'probability': float(proba[best])
+    }
+
+
+def single_feature_changes(proba_grid, axes, base_row, feature_order, threshold):
+    """
+    Per fitur: nilai terdekat dari kondisi pasien yang membuat probabilitas di bawah ambang
+    jika HANYA fitur itu yang berubah (fitur lain tetap). None jika tidak ada di rentang sumbu.
+    """
+    index = {name: i for i, name in enumerate(feature_order)}
+    base_idx = []
+    for name, values in axes.items():
+        match = np.flatnonzero(np.isclose(values, base_row[index[name]]))
+        base_idx.append(int(match[0]) if match.size else None)
+
+    result = {}
+    for k, (name, values) in enumerate(axes.items()):
+        others = [i for j, i in enumerate(base_idx) if j != k]
+        if any(i is None for i in others):
+            result[name] = None
+            continue
+        selector = tuple(slice(None) if j == k else base_idx[j] for j in range(len(axes)))
+        line = proba_grid[selector]
+        candidates = np.flatnonzero(line < threshold)
+        if candidates.size == 0:
+            result[name] = None
+            continue
+        nearest = candidates[np.argmin(np.abs(values[candidates] - base_row[index[name]]))]
+        result[name] = {'to': round(float(values[nearest]), 2), 'probability': float(line[nearest])}
+    return result
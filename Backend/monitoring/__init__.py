@@ -0,0 +1,32 @@
+"""
+Backend/monitoring/__init__.py
+Observability aplikasi: registry metrik (Prometheus), request ID & Server-Timing,
+buffer request lambat dan profiler on-demand.
+"""
+
+from . import memory, metrics, profiler, slow_requests, timing
+from .metrics import REGISTRY, StageTimer, generate_latest
+from .slow_requests import SLOW_REQUESTS
+from .timing import current_timer, get_request_id
+
+
+def init_app(app):
+    """Memasang seluruh hook observability (metrik HTTP, request lambat, profiler, request ID, Server-Timing)."""
+    # after_request berjalan terbalik dari urutan registrasi: timing (mark serialize)
+    # dieksekusi lebih dulu, baru pencatat request lambat dan metrik HTTP
+    metrics.init_app(app)
+    slow_requests.init_app(app)
+    profiler.init_app(app)
+    timing.init_app(app)
+    return app
+
+
+__all__ = [
+    'REGISTRY',
+    'SLOW_REQUESTS',
+    'StageTimer',
+    'generate_latest',
+    'current_timer',
+    'get_request_id',
+    'init_app'
+]
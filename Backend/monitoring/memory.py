@@ -0,0 +1,225 @@
+"""
+Backend/monitoring/memory.py
+Akuntansi memori proses serving: ukuran object graph, RSS/PSS per worker, dan alokasi per request.
+
+- deep_sizeof       : walk object graph (sys.getsizeof + buffer numpy) tanpa menghitung objek dua kali.
+- process_memory    : RSS/PSS/shared/private dari /proc/self/smaps_rollup (Linux). PSS & shared
+                      menunjukkan efek copy-on-write saat model dimuat sebelum fork (gunicorn --preload).
+- RSS_MARKS         : RSS yang dicatat sebelum & sesudah model dimuat (per PID pemuat).
+- measure_traced    : tracemalloc pada satu operasi (mis. joblib.load bundle).
+- measure_request_allocations : peak & sisa alokasi per request /api/predict (tracemalloc).
+  Hanya dijalankan dari CLI (Scripts/memory_report.py) dengan log prediksi di folder sementara,
+  karena tracemalloc di worker live ikut menghitung alokasi request lain.
+"""
+
+import os
+import sys
+import types
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+RSS_MARKS = {}
+
+
+# --- 1. UKURAN OBJECT GRAPH ---
+
+_SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+               types.MethodType, types.CodeType, types.FrameType)
+
+
+def deep_sizeof(obj, seen=None):
+    """Total byte object beserta seluruh objek yang dijangkaunya (dict, list, __dict__, __slots__, numpy)."""
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SKIP_TYPES):
+            continue
+        seen.add(id(current))
+
+        total += sys.getsizeof(current)
+        if isinstance(current, np.ndarray):
+            # View: buffer milik array lain (ikut di-walk) atau milik objek non-numpy
+            # (mis. node array sklearn Tree) yang dihitung langsung dari nbytes
+            if isinstance(current.base, np.ndarray):
+                stack.append(current.base)
+            elif current.base is not None:
+                total += current.nbytes
+            if current.dtype == object:
+                stack.extend(current.ravel().tolist())
+            continue
+
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+
+        if hasattr(current, '__dict__'):
+            stack.append(vars(current))
+        elif type(current).__module__ not in ('builtins', 'numpy'):
+            # Tipe ekstensi (Cython) tanpa __dict__: isi datanya hanya terlihat lewat __getstate__
+            try:
+                stack.append(current.__getstate__())
+            except Exception:
+                pass
+        for slot in getattr(type(current), '__slots__', ()):
+            if hasattr(current, slot):
+                stack.append(getattr(current, slot))
+    return total
+
+
+def attribute_sizes(obj):
+    """Ukuran per atribut instance (untuk rincian tabel mapping preprocessor)."""
+    return {name: deep_sizeof(value) for name, value in vars(obj).items()}
+
+
+# --- 2. MEMORI PROSES ---
+
+def process_memory():
+    """Memori proses (byte). smaps_rollup jika tersedia, selain itu hanya peak RSS dari getrusage."""
+    try:
+        fields = {}
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == 'kB':
+                    fields[parts[0].rstrip(':')] = int(parts[1]) * 1024
+        return {
+            'rss': fields.get('Rss'),
+            'pss': fields.get('Pss'),
+            'shared': fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0),
+            'private': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+            'source': 'smaps_rollup'
+        }
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux melaporkan KB, macOS byte
+        return {'rss_peak': peak if sys.platform == 'darwin' else peak * 1024, 'source': 'getrusage'}
+
+
+def mark_rss(name):
+    """Mencatat memori proses saat ini dengan nama (mis. 'before_model_load')."""
+    RSS_MARKS[name] = {'pid': os.getpid(), **process_memory()}
+
+
+# --- 3. TRACEMALLOC ---
+
+def measure_traced(fn):
+    """Menjalankan fn dengan tracemalloc: (hasil fn, {'retained': byte sisa, 'peak': byte puncak})."""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = fn()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return result, {'retained_bytes': after - before, 'peak_bytes': peak - before}
+
+
+def measure_request_allocations(client, path, payload, repeats=20):
+    """
+    Alokasi per request lewat Flask test client (1x warmup):
+    peak = alokasi sementara terbesar, retained = sisa alokasi (indikasi cache/kebocoran).
+    """
+    client.post(path, json=payload)
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        peaks = []
+        snapshot_before = tracemalloc.take_snapshot()
+        start, _ = tracemalloc.get_traced_memory()
+        for _ in range(repeats):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            client.post(path, json=payload)
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        end, _ = tracemalloc.get_traced_memory()
+        snapshot_after = tracemalloc.take_snapshot()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    diff = snapshot_after.compare_to(snapshot_before, 'lineno')
+    top = [
+        {'location': str(stat.traceback), 'size_diff_bytes': stat.size_diff, 'count_diff': stat.count_diff}
+        for stat in diff[:10] if stat.size_diff > 0
+    ]
+    return {
+        'path': path,
+        'repeats': repeats,
+        'peak_bytes_per_request': int(np.median(peaks)),
+        'retained_bytes_per_request': round((end - start) / repeats, 1),
+        'retained_blocks_per_request': round(sum(s.count_diff for s in diff) / repeats, 2),
+        'top_retained': top
+    }
+
+
+# --- 4. LAPORAN ---
+
+def build_report(api_module, detailed=False):
+    """
+    Laporan memori worker ini (dipakai endpoint & CLI).
+    detailed=True menambahkan tracemalloc saat memuat ulang bundle model dari disk.
+    """
+    import joblib
+    from Backend.config import Config
+    from Backend.models.preprocess import DiabetesPreprocessor
+    from Backend.models.decision_tree_model import DiabetesModel
+    from Backend.monitoring.metrics import REGISTRY
+    from Backend.monitoring.slow_requests import SLOW_REQUESTS
+    from Backend.monitoring import profiler
+    from Backend.serving.idempotency import IDEMPOTENCY_RESULTS, INFLIGHT_PREDICTIONS
+
+    preprocessor = DiabetesPreprocessor()
+    singleton = DiabetesModel._instance
+    session = profiler.active_session()
+
+    # Objek yang sudah dihitung di serving_model tidak dihitung ulang di cache turunannya (explainer)
+    model_seen = set()
+    serving_model = deep_sizeof(api_module.model, model_seen) if api_module.model is not None else None
+
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'pid': os.getpid(),
+        'process': process_memory(),
+        'rss_marks': RSS_MARKS,
+        'objects': {
+            'serving_model': serving_model,
+            'model_meta': deep_sizeof(api_module.model_meta),
+            # Singleton DiabetesModel hanya ada jika jalur tersebut pernah dipakai
+            'diabetes_model_singleton': deep_sizeof(singleton.model_bundle) if singleton else None,
+            'preprocessor_total': deep_sizeof(preprocessor),
+            'preprocessor_tables': attribute_sizes(preprocessor)
+        },
+        'caches': {
+            'slow_request_buffer': deep_sizeof(SLOW_REQUESTS._heap),
+            'metrics_registry': deep_sizeof(REGISTRY.snapshot()),
+            'profiler_session': deep_sizeof(session.stacks) if session else 0,
+            'idempotency_results': deep_sizeof(IDEMPOTENCY_RESULTS._entries),
+            'inflight_predictions': deep_sizeof(INFLIGHT_PREDICTIONS._entries),
+            'model_info_json': deep_sizeof(api_module.model_info_json),
+            'logs_json': deep_sizeof(api_module._logs_json),
+            'risk_curves_json': deep_sizeof(api_module.risk_curves_json),
+            'explainer_tables': deep_sizeof(api_module.explainer, set(model_seen)),
+            # Array memory-mapped dihitung penuh (page cache dibagi antar worker, tidak per proses)
+            'similar_index': deep_sizeof(api_module.similar_index)
+        },
+        'tracemalloc_active': tracemalloc.is_tracing()
+    }
+
+    if detailed and os.path.exists(Config.MODEL_PATH):
+        _, traced = measure_traced(lambda: joblib.load(Config.MODEL_PATH))
+        report['bundle_load_traced'] = {'path': Config.MODEL_PATH,
+                                        'file_bytes': os.path.getsize(Config.MODEL_PATH), **traced}
+    return report
@@ -0,0 +1,442 @@
+"""
+Backend/monitoring/metrics.py
+Registry metrik ringan (counter, gauge, histogram bucket tetap) dengan output format teks Prometheus.
+
+Desain:
+- Setiap kombinasi label punya objek "child" sendiri (dibuat sekali, bisa di-cache di level modul),
+  sehingga observasi di hot path hanya bisect + increment di bawah lock (< 1 µs).
+- Mode multi-proses (gunicorn): jika Config.METRICS_MULTIPROC_DIR di-set, setiap worker menulis
+  snapshot metrik ke <dir>/metrics_<pid>.json (thread flusher + saat scrape + saat exit).
+  Endpoint /api/metrics menggabungkan seluruh snapshot: counter & histogram dijumlahkan
+  (termasuk worker yang sudah mati), gauge hanya dari worker yang masih hidup.
+"""
+
+import os
+import json
+import time
+import atexit
+import threading
+from bisect import bisect_left
+
+from flask import g, request
+
+from Backend.config import Config
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class _CounterChild:
+    __slots__ = ('_value', '_lock')
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    # acquire/release eksplisit: lebih murah daripada 'with' di hot path
+    def inc(self, amount=1.0):
+        self._lock.acquire()
+        self._value += amount
+        self._lock.release()
+
+    def snapshot(self):
+        return self._value
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount=1.0):
+        self._lock.acquire()
+        self._value -= amount
+        self._lock.release()
+
+    def set(self, value):
+        self._value = float(value)
+
+
+class _HistogramChild:
+    __slots__ = ('_upper', '_counts', '_sum', '_lock')
+
+    def __init__(self, buckets):
+        self._upper = buckets
+        self._counts = [0] * (len(buckets) + 1)  # Bucket terakhir = +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect_left(self._upper, value)
+        self._lock.acquire()
+        self._counts[i] += 1
+        self._sum += value
+        self._lock.release()
+
+    def snapshot(self):
+        with self._lock:
+            return {'counts': list(self._counts), 'sum': self._sum}
+
+
+class _Metric:
+    """Kumpulan child per kombinasi nilai label."""
+
+    type_name = None
+
+    def __init__(self, name, documentation, labelnames=(), **options):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.options = options
+        self._children = {}  # Nilai label (string) -> child, untuk export
+        self._lookup = {}    # Nilai label apa adanya -> child, jalur cepat labels()
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values, **kwargs):
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        child = self._lookup.get(values)
+        if child is not None:
+            return child
+
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"Metrik {self.name} membutuhkan label {self.labelnames}")
+        key = tuple(str(v) for v in values)
+        with self._lock:
+            child = self._children.setdefault(key, self._new_child())
+            self._lookup[values] = child
+        return child
+
+    def snapshot(self):
+        with self._lock:
+            items = list(self._children.items())
+        return {
+            'type': self.type_name,
+            'help': self.documentation,
+            'labelnames': list(self.labelnames),
+            **self.options,
+            'samples': [[list(values), child.snapshot()] for values, child in items]
+        }
+
+
+class Counter(_Metric):
+    type_name = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1.0):
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    """
+    multiprocess_mode menentukan penggabungan antar worker:
+    'sum' (misal antrean), 'max' (misal info model), 'all' (satu seri per pid).
+    """
+    type_name = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), multiprocess_mode='sum'):
+        super().__init__(name, documentation, labelnames, multiprocess_mode=multiprocess_mode)
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self.labels().set(value)
+
+    def inc(self, amount=1.0):
+        self.labels().inc(amount)
+
+    def dec(self, amount=1.0):
+        self.labels().dec(amount)
+
+
+class Histogram(_Metric):
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames, buckets=sorted(float(b) for b in buckets))
+        self._buckets = tuple(self.options['buckets'])
+
+    def _new_child(self):
+        return _HistogramChild(self._buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = cls(name, *args, **kwargs)
+            return self._metrics[name]
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=(), multiprocess_mode='sum'):
+        return self._register(Gauge, name, documentation, labelnames, multiprocess_mode=multiprocess_mode)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def snapshot(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {'pid': os.getpid(), 'metrics': {m.name: m.snapshot() for m in metrics}}
+
+
+# --- 1. PENGGABUNGAN SNAPSHOT ANTAR PROSES ---
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge_snapshots(snapshots):
+    """Menggabungkan snapshot beberapa proses menjadi satu set metrik."""
+    merged = {}
+    for snap in snapshots:
+        pid = snap['pid']
+        alive = pid == os.getpid() or _pid_alive(pid)
+        for name, metric in snap['metrics'].items():
+            if metric['type'] == 'gauge' and not alive:
+                continue  # Gauge milik worker yang sudah mati tidak relevan lagi
+
+            target = merged.setdefault(name, {**metric, 'samples': {}})
+            mode = metric.get('multiprocess_mode')
+            if mode == 'all' and 'pid' not in target['labelnames']:
+                target['labelnames'] = target['labelnames'] + ['pid']
+
+            for values, value in metric['samples']:
+                key = tuple(values) + ((str(pid),) if mode == 'all' else ())
+                current = target['samples'].get(key)
+                if current is None:
+                    target['samples'][key] = value
+                elif metric['type'] == 'histogram':
+                    target['samples'][key] = {
+                        'counts': [a + b for a, b in zip(current['counts'], value['counts'])],
+                        'sum': current['sum'] + value['sum']
+                    }
+                elif mode == 'max':
+                    target['samples'][key] = max(current, value)
+                else:
+                    target['samples'][key] = current + value
+    return merged
+
+
+# --- 2. FORMAT TEKS PROMETHEUS ---
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + list(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def render_text(merged):
+    lines = []
+    for name in sorted(merged):
+        metric = merged[name]
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        names = metric['labelnames']
+        for values, value in sorted(metric['samples'].items()):
+            if metric['type'] == 'histogram':
+                cumulative = 0
+                for upper, count in zip(metric['buckets'] + [float('inf')], value['counts']):
+                    cumulative += count
+                    le = f'le="{_format_value(upper)}"'
+                    lines.append(f"{name}_bucket{_format_labels(names, values, [le])} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(names, values)} {_format_value(value['sum'])}")
+                lines.append(f"{name}_count{_format_labels(names, values)} {cumulative}")
+            else:
+                lines.append(f"{name}{_format_labels(names, values)} {_format_value(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+# --- 3. SNAPSHOT FILE (MULTI-PROSES) ---
+
+class SnapshotWriter:
+    """Menulis snapshot registry proses ini ke file secara periodik (atomic replace)."""
+
+    def __init__(self, registry, directory, interval=1.0):
+        self.registry = registry
+        self.directory = directory
+        self.interval = interval
+        self._started_pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        return os.path.join(self.directory, f'metrics_{os.getpid()}.json')
+
+    def flush(self):
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(self.registry.snapshot(), f)
+            os.replace(tmp_path, self.path)
+
+    def ensure_started(self):
+        """Thread flusher dibuat per proses (aman setelah fork worker gunicorn)."""
+        pid = os.getpid()
+        if self._started_pid == pid:
+            return
+        with self._lock:
+            if self._started_pid == pid:
+                return
+            self._started_pid = pid
+        threading.Thread(target=self._loop, name='metrics-flusher', daemon=True).start()
+        atexit.register(self.flush)
+
+    def _loop(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            except OSError:
+                pass
+
+    def read_all(self):
+        snapshots = []
+        for filename in sorted(os.listdir(self.directory)):
+            if not (filename.startswith('metrics_') and filename.endswith('.json')):
+                continue
+            try:
+                with open(os.path.join(self.directory, filename)) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # File sedang diganti / rusak: lewati pada scrape ini
+        return snapshots
+
+
+def clear_snapshot_dir(directory=None):
+    """Menghapus snapshot lama (panggil sekali saat master gunicorn start)."""
+    directory = directory or Config.METRICS_MULTIPROC_DIR
+    if not directory or not os.path.isdir(directory):
+        return
+    for filename in os.listdir(directory):
+        if filename.startswith('metrics_'):
+            os.remove(os.path.join(directory, filename))
+
+
+REGISTRY = MetricsRegistry()
+_writer = SnapshotWriter(REGISTRY, Config.METRICS_MULTIPROC_DIR, Config.METRICS_FLUSH_INTERVAL) \
+    if Config.METRICS_MULTIPROC_DIR else None
+
+
+def generate_latest():
+    """Teks Prometheus untuk seluruh worker (atau proses ini saja jika bukan multi-proses)."""
+    if _writer is None:
+        return render_text(merge_snapshots([REGISTRY.snapshot()]))
+    _writer.flush()
+    return render_text(merge_snapshots(_writer.read_all()))
+
+
+# --- 4. METRIK APLIKASI ---
+
+HTTP_REQUESTS = REGISTRY.counter(
+    'diabetes_http_requests_total', 'Jumlah request HTTP per route, method dan status.',
+    ('method', 'route', 'status'))
+HTTP_LATENCY = REGISTRY.histogram(
+    'diabetes_http_request_duration_seconds', 'Latensi request HTTP per route.', ('route',))
+PREDICT_STAGE_SECONDS = REGISTRY.histogram(
+    'diabetes_predict_stage_duration_seconds',
+    'Durasi tiap tahap /api/predict (queue, parse, encode, validate, features, score, explain, similar, coalesce, log, serialize).', ('stage',),
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0))
+MODEL_LOAD_SECONDS = REGISTRY.gauge(
+    'diabetes_model_load_duration_seconds', 'Durasi memuat bundle model terakhir.',
+    multiprocess_mode='max')
+MODEL_INFO = REGISTRY.gauge(
+    'diabetes_model_info', 'Versi (timestamp bundle) dan tipe model yang sedang di-serve.',
+    ('version', 'model_type'), multiprocess_mode='max')
+CACHE_REQUESTS = REGISTRY.counter(
+    'diabetes_cache_requests_total', 'Lookup cache per nama cache dan hasil (hit/miss).',
+    ('cache', 'result'))
+LOG_WAITERS = REGISTRY.gauge(
+    'diabetes_prediction_log_waiters', 'Jumlah penulis log prediksi yang menunggu/memegang lock.')
+CSV_ROWS = REGISTRY.counter(
+    'diabetes_csv_rows_total', 'Baris upload CSV (/api/predict/csv) per status (scored/invalid).', ('status',))
+BINARY_ROWS = REGISTRY.counter(
+    'diabetes_binary_rows_total', 'Baris matriks float32 yang diskor lewat /api/predict/binary.')
+ADMISSION_IN_FLIGHT = REGISTRY.gauge(
+    'diabetes_admission_in_flight', 'Request scoring yang sedang memegang slot admission control.')
+ADMISSION_QUEUE_DEPTH = REGISTRY.gauge(
+    'diabetes_admission_queue_depth', 'Request yang menunggu slot admission control per prioritas.', ('priority',))
+ADMISSION_SHED = REGISTRY.counter(
+    'diabetes_admission_shed_total', 'Request yang ditolak (503) per prioritas dan alasan.', ('priority', 'reason'))
+ADMISSION_WAIT = REGISTRY.histogram(
+    'diabetes_admission_wait_seconds', 'Lama menunggu slot sebelum request diproses.', ('priority',),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+
+
+class StageTimer:
+    """
+    Mencatat durasi antar mark() (perf_counter_ns) ke histogram tahap.
+    Durasi per tahap (ns) juga disimpan di .stages untuk header Server-Timing.
+    histogram=None -> hanya .stages (endpoint selain /api/predict tidak mengisi histogram tahap predict).
+    """
+
+    __slots__ = ('_histogram', 'start_ns', '_last', 'stages')
+
+    def __init__(self, histogram=PREDICT_STAGE_SECONDS):
+        self._histogram = histogram
+        self.start_ns = self._last = time.perf_counter_ns()
+        self.stages = {}
+
+    def mark(self, stage):
+        now = time.perf_counter_ns()
+        elapsed = now - self._last
+        self._last = now
+        self.stages[stage] = self.stages.get(stage, 0) + elapsed
+        if self._histogram is not None:
+            self._histogram.labels(stage).observe(elapsed / 1e9)
+        return elapsed
+
+    def total_ns(self):
+        return time.perf_counter_ns() - self.start_ns
+
+
+def init_app(app):
+    """Memasang hook pengukuran request HTTP ke aplikasi Flask."""
+
+    @app.before_request
+    def _start_request_timer():
+        g._metrics_start = time.perf_counter()
+        if _writer is not None:
+            _writer.ensure_started()
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop('_metrics_start', None)
+        if start is not None:
+            # Pakai pola route (bukan path asli) agar kardinalitas label tetap kecil
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            HTTP_LATENCY.labels(route).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(request.method, route, response.status_code).inc()
+        return response
+
+    return app
@@ -0,0 +1,260 @@
+"""
+Backend/monitoring/profiler.py
+Profiler on-demand untuk worker yang sedang berjalan (nonaktif secara default).
+
+Sesi profiling mencakup N request berikutnya dan/atau T detik, lalu hasilnya ditulis ke
+Config.LOGS_DIR (profile_<pid>_<waktu>.*):
+- mode 'sample'   : stack sampler berbasis thread stdlib (sys._current_frames) pada thread yang
+                    sedang melayani request -> .collapsed (format flamegraph) + .txt (ringkasan).
+- mode 'cprofile' : cProfile per request (aman untuk server multi-thread), digabung dengan
+                    pstats -> .prof (snakeviz/pstats) + .txt (urut cumulative time).
+
+Pemicu:
+- POST /api/debug/profile dengan header X-Admin-Token (Config.ADMIN_TOKEN wajib di-set).
+- Sinyal Config.PROFILER_SIGNAL (default SIGUSR2) ke PID worker: sesi sampler selama
+  Config.PROFILER_SIGNAL_SECONDS. Catatan: dengan gunicorn --preload handler sinyal
+  di-reset oleh worker, gunakan endpoint.
+
+Saat tidak ada sesi aktif, hook request hanya memeriksa satu variabel global.
+"""
+
+import os
+import io
+import sys
+import time
+import signal
+import pstats
+import cProfile
+import threading
+from collections import Counter
+from datetime import datetime
+
+from flask import g
+
+from Backend.config import Config
+
+PROFILE_MODES = ('sample', 'cprofile')
+
+_session = None              # Sesi aktif (None = profiler mati)
+_session_lock = threading.Lock()
+last_result = None           # Ringkasan sesi terakhir (untuk GET /api/debug/profile)
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class ProfileSession:
+    def __init__(self, mode='sample', max_requests=None, max_seconds=None, interval_ms=5.0, trigger='api'):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Mode profiler tidak dikenal: {mode}. Pilihan: {PROFILE_MODES}")
+        if not max_requests and not max_seconds:
+            raise ValueError("Tentukan jumlah request dan/atau durasi (detik)")
+
+        self.mode = mode
+        self.max_requests = max_requests
+        self.max_seconds = max_seconds
+        self.interval = interval_ms / 1000.0
+        self.trigger = trigger
+        self.started_at = datetime.now()
+        self.deadline = time.monotonic() + max_seconds if max_seconds else None
+
+        self.requests_done = 0
+        self.active_threads = set()     # Thread ident yang sedang melayani request
+        self.stacks = Counter()         # Mode sample: stack (tuple label) -> jumlah sampel
+        self.n_samples = 0
+        self.stats = None               # Mode cprofile: pstats.Stats gabungan
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._sampler = None
+
+    # --- Siklus hidup request ---
+    def request_started(self):
+        if self.mode == 'cprofile':
+            g._profiler = cProfile.Profile()
+            g._profiler.enable()
+        else:
+            with self._lock:
+                self.active_threads.add(threading.get_ident())
+
+    def request_finished(self):
+        if self.mode == 'cprofile':
+            profiler = g.pop('_profiler', None)
+            if profiler is None:
+                return
+            profiler.disable()
+            with self._lock:
+                if self.stats is None:
+                    self.stats = pstats.Stats(profiler)
+                else:
+                    self.stats.add(profiler)
+        else:
+            with self._lock:
+                self.active_threads.discard(threading.get_ident())
+
+        with self._lock:
+            self.requests_done += 1
+            done = self.max_requests and self.requests_done >= self.max_requests
+        if done or self.expired():
+            stop_session(self)
+
+    def expired(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    # --- Sampler ---
+    def start(self):
+        if self.mode == 'sample':
+            self._sampler = threading.Thread(target=self._sample_loop, name='profiler-sampler', daemon=True)
+            self._sampler.start()
+        elif self.deadline is not None:
+            # cProfile: batas waktu ditegakkan timer (sesi selesai walau tidak ada request lagi)
+            timer = threading.Timer(self.max_seconds, stop_session, args=(self,))
+            timer.daemon = True
+            timer.start()
+
+    def _sample_loop(self):
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                targets = set(self.active_threads)
+            if targets:
+                frames = sys._current_frames()
+                for ident in targets:
+                    frame = frames.get(ident)
+                    stack = []
+                    while frame is not None:
+                        stack.append(_frame_label(frame.f_code))
+                        frame = frame.f_back
+                    if stack:
+                        self.stacks[tuple(reversed(stack))] += 1
+                        self.n_samples += 1
+            if self.expired():
+                stop_session(self)
+
+    # --- Output ---
+    def write_output(self):
+        self._stopped.set()
+        # Tunggu sampler berhenti agar self.stacks tidak berubah saat ditulis
+        if self._sampler is not None and self._sampler is not threading.current_thread():
+            self._sampler.join()
+        os.makedirs(Config.LOGS_DIR, exist_ok=True)
+        base = os.path.join(
+            Config.LOGS_DIR, f"profile_{os.getpid()}_{self.started_at.strftime('%Y%m%d_%H%M%S_%f')}")
+        files = []
+
+        if self.mode == 'sample':
+            with open(base + '.collapsed', 'w', encoding='utf-8') as f:
+                for stack, count in self.stacks.most_common():
+                    f.write(f"{';'.join(stack)} {count}\n")
+            files.append(base + '.collapsed')
+
+            self_counts, total_counts = Counter(), Counter()
+            for stack, count in self.stacks.items():
+                self_counts[stack[-1]] += count
+                for label in set(stack):
+                    total_counts[label] += count
+            lines = [f"Mode: sample | interval: {self.interval * 1000:.1f} ms | sampel: {self.n_samples} "
+                     f"| request: {self.requests_done}", "", "TOP SELF (fungsi yang sedang berjalan)"]
+            lines += [f"{c:>8} {c / max(self.n_samples, 1):>7.1%}  {label}" for label, c in self_counts.most_common(30)]
+            lines += ["", "TOP INKLUSIF (fungsi di dalam stack)"]
+            lines += [f"{c:>8} {c / max(self.n_samples, 1):>7.1%}  {label}" for label, c in total_counts.most_common(30)]
+            summary = '\n'.join(lines) + '\n'
+        else:
+            # Lock: request yang selesai bersamaan tidak boleh menambah stats saat ditulis
+            with self._lock:
+                if self.stats is not None:
+                    self.stats.dump_stats(base + '.prof')
+                    files.append(base + '.prof')
+                    buffer = io.StringIO()
+                    self.stats.stream = buffer
+                    self.stats.sort_stats('cumulative').print_stats(40)
+                    summary = f"Mode: cprofile | request: {self.requests_done}\n\n" + buffer.getvalue()
+                else:
+                    summary = "Mode: cprofile | tidak ada request yang diprofil\n"
+
+        with open(base + '.txt', 'w', encoding='utf-8') as f:
+            f.write(summary)
+        files.append(base + '.txt')
+
+        return {
+            'mode': self.mode,
+            'trigger': self.trigger,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            'requests_profiled': self.requests_done,
+            'samples': self.n_samples if self.mode == 'sample' else None,
+            'files': files
+        }
+
+    def status(self):
+        return {
+            'mode': self.mode,
+            'trigger': self.trigger,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'max_requests': self.max_requests,
+            'max_seconds': self.max_seconds,
+            'requests_profiled': self.requests_done
+        }
+
+
+def start_session(**kwargs):
+    """Memulai sesi baru; RuntimeError jika masih ada sesi aktif di worker ini."""
+    global _session
+    session = ProfileSession(**kwargs)
+    with _session_lock:
+        if _session is not None:
+            raise RuntimeError("Sesi profiling lain masih berjalan di worker ini")
+        _session = session
+    session.start()
+    return session
+
+
+def stop_session(session=None):
+    """Menghentikan sesi (sekali saja walau dipanggil dari beberapa thread) dan menulis output."""
+    global _session, last_result
+    with _session_lock:
+        if _session is None or (session is not None and _session is not session):
+            return None
+        session, _session = _session, None
+    last_result = session.write_output()
+    print(f"📈 Profil disimpan: {', '.join(last_result['files'])}")
+    return last_result
+
+
+def active_session():
+    return _session
+
+
+def _start_from_signal():
+    try:
+        start_session(mode='sample', max_seconds=Config.PROFILER_SIGNAL_SECONDS, trigger='signal')
+    except RuntimeError:
+        pass
+
+
+def _handle_signal(signum, frame):
+    # Dijalankan di thread terpisah: handler sinyal tidak boleh menunggu lock yang mungkin
+    # sedang dipegang thread utama
+    threading.Thread(target=_start_from_signal, name='profiler-signal', daemon=True).start()
+
+
+def init_app(app):
+    """Memasang hook profiler (tanpa biaya saat tidak aktif) dan handler sinyal."""
+
+    @app.before_request
+    def _profile_request_start():
+        session = _session
+        if session is not None:
+            g._profile_session = session
+            session.request_started()
+
+    @app.teardown_request
+    def _profile_request_end(exc):
+        session = g.pop('_profile_session', None)
+        if session is not None:
+            session.request_finished()
+
+    signame = Config.PROFILER_SIGNAL
+    if signame and hasattr(signal, signame) and threading.current_thread() is threading.main_thread():
+        signal.signal(getattr(signal, signame), _handle_signal)
+
+    return app
@@ -0,0 +1,117 @@
+"""
+Backend/monitoring/slow_requests.py
+Buffer N request paling lambat dalam jendela waktu terakhir (per worker), untuk /api/debug/slow.
+
+- Struktur: min-heap berukuran tetap (durasi terkecil di akar). Request yang lebih cepat dari
+  entri tercepat di buffer penuh ditolak O(1) tanpa membangun entri sama sekali.
+- Entri yang lebih tua dari jendela waktu dibuang saat purge (maks. sekali per detik).
+- Input TIDAK disimpan: hanya fingerprint HMAC (kunci acak per proses) + nama & tipe field.
+"""
+
+import os
+import json
+import hmac
+import heapq
+import hashlib
+import itertools
+import threading
+import time
+from datetime import datetime
+
+from flask import g, request
+
+from Backend.config import Config
+
+
+def fingerprint_payload(payload, secret):
+    """Fingerprint ter-redaksi: HMAC payload kanonik + nama/tipe field (tanpa nilai)."""
+    if not isinstance(payload, dict):
+        return None
+    canonical = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return {
+        'hash': hmac.new(secret, canonical, hashlib.sha256).hexdigest()[:16],
+        'fields': {key: type(value).__name__ for key, value in sorted(payload.items())}
+    }
+
+
+class SlowRequestBuffer:
+    def __init__(self, capacity=50, window_seconds=300, clock=time.monotonic):
+        self.capacity = capacity
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._heap = []  # (durasi_ms, seq, waktu_monotonic, entri)
+        self._seq = itertools.count()
+        self._last_purge = clock()
+        self._lock = threading.Lock()
+
+    def _purge(self, now):
+        cutoff = now - self.window_seconds
+        self._heap = [item for item in self._heap if item[2] >= cutoff]
+        heapq.heapify(self._heap)
+        self._last_purge = now
+
+    def would_accept(self, duration_ms):
+        """Cek murah sebelum membangun entri (tanpa lock; hasil final diputuskan di offer)."""
+        heap = self._heap
+        return len(heap) < self.capacity or duration_ms > heap[0][0] \
+            or self._clock() - self._last_purge >= 1.0
+
+    def offer(self, duration_ms, entry):
+        with self._lock:
+            now = self._clock()
+            if now - self._last_purge >= 1.0:
+                self._purge(now)
+            item = (duration_ms, next(self._seq), now, entry)
+            if len(self._heap) < self.capacity:
+                heapq.heappush(self._heap, item)
+                return True
+            if duration_ms > self._heap[0][0]:
+                heapq.heapreplace(self._heap, item)
+                return True
+            return False
+
+    def snapshot(self, limit=None):
+        """Entri di dalam jendela waktu, urut dari yang paling lambat."""
+        with self._lock:
+            self._purge(self._clock())
+            items = sorted(self._heap, key=lambda item: item[0], reverse=True)
+        return [entry for _, _, _, entry in items[:limit]]
+
+    def clear(self):
+        with self._lock:
+            self._heap = []
+
+
+SLOW_REQUESTS = SlowRequestBuffer(Config.SLOW_REQUEST_CAPACITY, Config.SLOW_REQUEST_WINDOW)
+_FINGERPRINT_SECRET = os.urandom(32)
+
+
+def init_app(app):
+    """Memasang hook pencatat request lambat (harus terpasang SEBELUM hook Server-Timing)."""
+
+    @app.after_request
+    def _capture_slow_request(response):
+        timer = g.get('stage_timer')
+        if timer is None or request.path.startswith('/api/debug/'):
+            return response
+
+        duration_ms = timer.total_ns() / 1e6
+        if not SLOW_REQUESTS.would_accept(duration_ms):
+            return response
+
+        payload = request.get_json(silent=True) if request.is_json else None
+        SLOW_REQUESTS.offer(duration_ms, {
+            'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+            'request_id': g.get('request_id'),
+            'method': request.method,
+            'route': request.url_rule.rule if request.url_rule is not None else 'unmatched',
+            'status': response.status_code,
+            'duration_ms': round(duration_ms, 3),
+            'stages_ms': {name: round(ns / 1e6, 3) for name, ns in timer.stages.items()},
+            'model_version': g.get('model_version'),
+            'payload_bytes': request.content_length or 0,
+            'input_fingerprint': fingerprint_payload(payload, _FINGERPRINT_SECRET)
+        })
+        return response
+
+    return app
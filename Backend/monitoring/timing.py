@@ -0,0 +1,74 @@
+"""
+Backend/monitoring/timing.py
+Request ID & header Server-Timing per request.
+
+- X-Request-ID: diterima dari client/proxy jika formatnya aman, jika tidak dibuat baru (uuid4).
+  ID yang sama dikembalikan di response dan dicatat di log prediksi (kolom request_id).
+- Server-Timing: durasi tiap tahap yang di-mark lewat StageTimer (ms), ditambah 'total',
+  sehingga DevTools browser bisa memisahkan waktu server dari waktu jaringan.
+  Bisa dimatikan lewat Config.SERVER_TIMING_ENABLED.
+- Histogram diabetes_predict_stage_duration_seconds hanya diisi oleh request /api/predict;
+  endpoint lain (csv, binary, ...) tetap mendapat Server-Timing tanpa mencemari histogram itu.
+"""
+
+import re
+import uuid
+
+from flask import g, request
+
+from Backend.config import Config
+from Backend.monitoring.metrics import StageTimer, PREDICT_STAGE_SECONDS
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+_REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+
+def get_request_id():
+    """Request ID aktif (atau None di luar request yang melewati hook)."""
+    return g.get('request_id')
+
+
+PREDICT_ENDPOINT = 'api.predict'
+
+
+def _new_timer():
+    return StageTimer(PREDICT_STAGE_SECONDS if request.endpoint == PREDICT_ENDPOINT else None)
+
+
+def current_timer():
+    """StageTimer request aktif; timer baru jika hook tidak terpasang."""
+    timer = g.get('stage_timer')
+    if timer is None:
+        timer = g.stage_timer = _new_timer()
+    return timer
+
+
+def format_server_timing(stages_ns, total_ns):
+    """Format header: 'parse;dur=0.120, score;dur=1.503, total;dur=4.870' (milidetik)."""
+    parts = [f"{name};dur={ns / 1e6:.3f}" for name, ns in stages_ns.items()]
+    parts.append(f"total;dur={total_ns / 1e6:.3f}")
+    return ', '.join(parts)
+
+
+def init_app(app):
+    """Memasang hook request ID & Server-Timing ke aplikasi Flask."""
+
+    @app.before_request
+    def _start_request_context():
+        incoming = request.headers.get(REQUEST_ID_HEADER, '')
+        g.request_id = incoming if _REQUEST_ID_PATTERN.match(incoming) else uuid.uuid4().hex
+        g.stage_timer = _new_timer()
+
+    @app.after_request
+    def _attach_timing_headers(response):
+        timer = g.get('stage_timer')
+        if timer is not None and Config.SERVER_TIMING_ENABLED:
+            # Waktu sejak tahap terakhir = jsonify + pembentukan response
+            if timer.stages:
+                timer.mark('serialize')
+            response.headers['Server-Timing'] = format_server_timing(timer.stages, timer.total_ns())
+        if 'request_id' in g:
+            response.headers[REQUEST_ID_HEADER] = g.request_id
+        return response
+
+    return app
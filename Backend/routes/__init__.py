@@ -6,6 +6,9 @@ Mengatur registrasi semua Blueprint (API & Web)
 from flask import Flask
 from .api_routes import api_bp
 from .web_routes import web_bp
+from .debug_routes import debug_bp
+from Backend.monitoring import init_app as init_monitoring
+from Backend.serving import init_app as init_serving
 
 def register_routes(app: Flask):
     """
@@ -20,8 +23,17 @@ def register_routes(app: Flask):
     # PENTING: Tambahkan url_prefix='/api' agar alamat menjadi localhost:8000/api/...
     # Ini wajib agar sinkron dengan formHandler.js yang memanggil '/api/predict'
     app.register_blueprint(api_bp, url_prefix='/api')
+
+    # Debug/diagnostik (request lambat, profiler, memori) -> /api/debug/...
+    app.register_blueprint(debug_bp, url_prefix='/api/debug')
+
+    # 3. Observability: metrik per route (/api/metrics), X-Request-ID & Server-Timing
+    init_monitoring(app)
+
+    # 4. Admission control (setelah monitoring, sama seperti Backend/app.py & run_app.py)
+    init_serving(app)
     
     return app
 
 # Expose blueprints agar bisa diimport manual jika perlu
-__all__ = ['register_routes', 'api_bp', 'web_bp']
\ No newline at end of file
+__all__ = ['register_routes', 'api_bp', 'web_bp', 'debug_bp']
\ No newline at end of file
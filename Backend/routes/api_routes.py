@@ -1,22 +1,51 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, Response, g, stream_with_context
 import pandas as pd
 import numpy as np
 import joblib
 import os
+import csv
 import json
+import threading
+import time
+import hashlib
+import io
+import itertools
 from datetime import datetime
 from Backend.config import Config
 from Backend.models.preprocess import DiabetesPreprocessor
+from Backend.models.distill import select_serving_bundle
+from Backend.models.utils import risk_level, score_raw_rows, RAW_TEXT_COLUMNS, RISK_THRESHOLDS
+from Backend.models import what_if
+from Backend.models.explain import PathExplainer
+from Backend.models.risk_curves import load_risk_curves
+from Backend.models.similar import SimilarPatientIndex
+from Backend.monitoring import metrics
+from Backend.monitoring.memory import mark_rss
+from Backend.monitoring.timing import current_timer, get_request_id
+from Backend.serving.http_cache import PrecomputedJSON, not_modified
+from Backend.serving.idempotency import INFLIGHT_PREDICTIONS, coalesce, idempotent
+
+try:
+    import fcntl  # Lock file antar proses (gunicorn worker); tidak tersedia di Windows
+except ImportError:
+    fcntl = None
 
 api_bp = Blueprint('api', __name__)
 
 # --- 1. GLOBAL MODEL LOADING ---
 model = None
 model_meta = {}
+model_version = None
+explainer = None                # PathExplainer (kontribusi fitur per pasien)
+global_feature_importance = []  # Fallback jika struktur model tidak didukung explainer
+model_info_json = None          # PrecomputedJSON metadata model (diserialisasi sekali per load)
+risk_curves_json = None         # PrecomputedJSON kurva risiko untuk versi model aktif
+similar_index = None            # BallTree pasien serupa (memory-mapped, dibagi antar worker)
 
 def load_model_resources():
     """Memuat model pkl dan metadata json ke dalam memori global secara absolut."""
-    global model, model_meta
+    global model, model_meta, model_version, explainer, global_feature_importance
+    global model_info_json, risk_curves_json, similar_index
     
     # Gunakan path absolut dari Config agar aman dijalankan dari folder manapun
     model_path = os.path.normpath(os.path.join(Config.MODELS_DIR, 'decision_tree_bundle.pkl'))
@@ -25,177 +54,665 @@ def load_model_resources():
     try:
         # Load Model
         if os.path.exists(model_path):
+            mark_rss('before_model_load')
+            start = time.perf_counter()
             loaded_data = joblib.load(model_path)
+            version = 'unknown'
             # Handle jika model disimpan dalam dictionary (format baru) atau langsung model (format lama)
             if isinstance(loaded_data, dict) and 'model' in loaded_data:
-                model = loaded_data['model']
+                # Gunakan model distilasi jika tersedia & lolos ambang fidelitas
+                serving = select_serving_bundle(loaded_data)
+                model = serving['model']
+                version = serving.get('timestamp', version)
             else:
                 model = loaded_data
+            model_version = version
+
+            # Tabel kontribusi jalur keputusan & importance global dihitung sekali per load
+            feature_order = DiabetesPreprocessor().feature_order
+            explainer = PathExplainer.from_model(model, feature_order)
+            global_feature_importance = extract_feature_importance(model, feature_order)
+            metrics.MODEL_LOAD_SECONDS.set(time.perf_counter() - start)
+            mark_rss('after_model_load')
+
+            # Kurva risiko: hanya dibaca dari file (dibuat saat training) untuk bundle guru yang sama.
+            # Model distilasi memakai kurva gurunya (lolos ambang fidelitas terhadap guru tersebut).
+            teacher_version = loaded_data.get('timestamp') if isinstance(loaded_data, dict) else None
+            payload = load_risk_curves(teacher_version) if teacher_version else None
+            risk_curves_json = (PrecomputedJSON(body=json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+                                if payload is not None else None)
+            if risk_curves_json is None:
+                print("⚠️ Warning: Kurva risiko dinonaktifkan (/api/risk-curves -> 503).")
+            metrics.MODEL_INFO.labels(version, type(model).__name__).set(1)
             print(f"✅ Model loaded successfully from {model_path}")
         else:
             print(f"❌ Model file not found at: {model_path}")
 
+        # Indeks pasien serupa tidak bergantung versi model (dibangun dari data training saat training)
+        similar_index = SimilarPatientIndex.load_if_fresh()
+        if similar_index is None:
+            print("⚠️ Warning: Pasien serupa dinonaktifkan (/api/similar -> 503).")
+
         # Load Metadata (Akurasi, F1 Score, dll)
         if os.path.exists(meta_path):
             with open(meta_path, 'r', encoding='utf-8') as f:
                 model_meta = json.load(f)
             print(f"✅ Metadata loaded successfully.")
+        # Body /api/model-info diserialisasi sekali; ETag dari versi model + isi metadata
+        model_info_json = PrecomputedJSON(model_meta, version=model_version)
             
     except Exception as e:
         print(f"❌ Error loading model resources: {e}")
 
+# Mapping nama variabel teknis ke bahasa medis yang user-friendly
+FEATURE_LABELS = {
+    'hypertensive': 'Status Hipertensi (Faktor Utama)',
+    'glucose': 'Kadar Glukosa Darah',
+    'height': 'Tinggi Badan Pasien',
+    'weight': 'Berat Badan Pasien',
+    'systolic_bp': 'Tekanan Darah Sistolik',
+    'pulse_rate': 'Detak Jantung (Pulse)',
+    'age': 'Faktor Usia',
+    'bmi': 'Indeks Massa Tubuh (BMI)',
+    'diastolic_bp': 'Tekanan Darah Diastolik',
+    'gender': 'Faktor Jenis Kelamin',
+    'family_diabetes': 'Riwayat Diabetes Keluarga',
+    'cvd': 'Riwayat Kardiovaskular',
+    'cardiovascular_disease': 'Riwayat Kardiovaskular',
+    'stroke': 'Riwayat Stroke',
+    'family_hypertension': 'Riwayat Hipertensi Keluarga'
+}
+
+def _final_estimator(estimator):
+    """Estimator terakhir dari Pipeline (scaler + tree), atau estimator itu sendiri."""
+    steps = getattr(estimator, 'steps', None)
+    return steps[-1][1] if steps else estimator
+
+def extract_feature_importance(model, feature_names, top_n=5):
+    """Mengambil Top-N feature importance global dari model (mendukung CalibratedClassifierCV)."""
+    targets = [model]
+
+    # --- PERBAIKAN UTAMA: Penanganan Versi Scikit-Learn ---
+    # Jika menggunakan CalibratedClassifierCV, kita harus mengambil estimator aslinya (semua member)
+    if hasattr(model, 'calibrated_classifiers_'):
+        targets = []
+        for calibrated_clf in model.calibrated_classifiers_:
+            # Cek atribut yang tersedia (estimator untuk sklearn baru, base_estimator untuk lama)
+            if hasattr(calibrated_clf, 'estimator'):
+                targets.append(calibrated_clf.estimator)
+            elif hasattr(calibrated_clf, 'base_estimator'):
+                targets.append(calibrated_clf.base_estimator)
+
+    # Pipeline (scaler + tree) tidak memiliki feature_importances_: ambil dari langkah terakhir
+    targets = [_final_estimator(t) for t in targets]
+    targets = [t for t in targets if hasattr(t, 'feature_importances_')]
+    if not targets:
+        return []
+
+    # Rata-rata importance seluruh member ensemble
+    importances = np.mean([t.feature_importances_ for t in targets], axis=0)
+
+    # Urutkan dari yang paling berpengaruh (Descending)
+    feat_imp = sorted(zip(feature_names, importances), key=lambda x: x[1], reverse=True)
+
+    # Format output dengan presisi 3 desimal untuk transparansi analisis
+    return [
+        {
+            'name': FEATURE_LABELS.get(name, name.replace('_', ' ').title()),
+            'value': round(float(val) * 100, 3)
+        }
+        for name, val in feat_imp if val > 0
+    ][:top_n]
+
+def explain_prediction(X, top_n=5):
+    """
+    Faktor dominan untuk pasien ini dari jalur keputusan model (explainer dibangun saat model dimuat).
+    Mengembalikan (feature_importance Top-N, detail penjelasan); tanpa explainer dipakai importance global.
+    """
+    if explainer is None:
+        return global_feature_importance, None
+
+    base_value, contributions = explainer.explain(X)
+    row = contributions[0]
+    top = [
+        {
+            'name': FEATURE_LABELS.get(name, name.replace('_', ' ').title()),
+            # value: besar pengaruh (poin persen probabilitas), contribution: bertanda (+ menaikkan risiko)
+            'value': round(abs(value) * 100, 3),
+            'contribution': round(value * 100, 3)
+        }
+        for name, value in explainer.top_features(row, top_n)
+    ]
+    explanation = {
+        'method': 'decision_path',
+        'base_percent': round(base_value * 100, 2),
+        'contributions': {name: round(float(v) * 100, 3) for name, v in zip(explainer.feature_names, row)}
+    }
+    return top, explanation
+
 # Inisialisasi model saat aplikasi pertama kali dijalankan
+# (setelah helper importance/penjelasan terdefinisi)
 load_model_resources()
 
+def parse_similar_k(value):
+    """Jumlah tetangga dari query/body; None jika tidak diminta."""
+    if value is None or value is False or str(value).lower() in ('', '0', 'false', 'no'):
+        return None
+    k = Config.SIMILAR_DEFAULT_K if value is True or str(value).lower() in ('true', 'yes') else int(value)
+    if not 1 <= k <= Config.SIMILAR_MAX_K:
+        raise ValueError(f"Jumlah pasien serupa (k) harus 1-{Config.SIMILAR_MAX_K}")
+    return k
+
+def build_log_entry(data, prediction, probability, request_id=None):
+    """Menyusun satu baris log riwayat prediksi."""
+    return {
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'result': 'Diabetic' if prediction == 1 else 'Non-Diabetic',
+        'confidence': f"{round(probability * 100, 2)}%",
+        **data,
+        'request_id': request_id or ''
+    }
+
+# Kolom baru yang boleh ditambahkan ke header log lama (migrasi sekali jalan).
+# Key payload lain yang tidak ada di header tetap dibuang agar kolom tidak bertambah liar.
+LOG_MIGRATABLE_COLUMNS = ['request_id']
+
+def _migrate_log_header(f, header, new_columns):
+    """Menambah kolom di akhir header log lama (file di-rewrite in-place, inode tetap)."""
+    f.seek(0)
+    rows = list(csv.reader(f))
+    f.seek(0)
+    f.truncate()
+    writer = csv.writer(f, lineterminator='\n')
+    writer.writerow(header + new_columns)
+    for row in rows[1:]:
+        writer.writerow(row + [''] * len(new_columns))
+    return header + new_columns
+
+# Lock log CSV: thread dalam satu proses + flock antar proses (jika tersedia)
+_log_lock = threading.Lock()
+
+def append_prediction_log(entries):
+    """
+    Menambahkan satu atau lebih baris log (list dict atau DataFrame) ke CSV dalam satu kali write.
+    Kolom diselaraskan dengan header file yang sudah ada agar urutan key payload
+    yang berbeda tidak menggeser kolom, dan header hanya ditulis sekali walau
+    banyak request menulis bersamaan.
+    """
+    log_path = Config.PREDICTION_LOG
+    log_df = pd.DataFrame(entries)
+
+    # Kedalaman antrean penulis log (menunggu + memegang lock)
+    metrics.LOG_WAITERS.inc()
+    try:
+        with _log_lock:
+            with open(log_path, mode='a+', newline='', encoding='utf-8') as f:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+
+                # Buat header jika file baru dibuat
+                f.seek(0, os.SEEK_END)
+                write_header = f.tell() == 0
+                if not write_header:
+                    f.seek(0)
+                    header = next(csv.reader([f.readline()]))
+                    new_columns = [c for c in LOG_MIGRATABLE_COLUMNS if c in log_df.columns and c not in header]
+                    if new_columns:
+                        header = _migrate_log_header(f, header, new_columns)
+                    log_df = log_df.reindex(columns=header)
+
+                f.write(log_df.to_csv(header=write_header, index=False))
+    finally:
+        metrics.LOG_WAITERS.dec()
+
+CSV_REQUIRED_COLUMNS = [c for c in DiabetesPreprocessor().feature_order if c != 'bmi']
+
+def score_csv_chunk(chunk, preprocessor, request_id=None):
+    """Skor satu chunk upload CSV lalu satu append log untuk seluruh baris valid di chunk tersebut."""
+    scored, valid, _ = score_raw_rows(model, chunk, preprocessor)
+    metrics.CSV_ROWS.labels('scored').inc(int(valid.sum()))
+    metrics.CSV_ROWS.labels('invalid').inc(int((~valid).sum()))
+
+    if valid.any():
+        fields = [c for c in chunk.columns if c in preprocessor.feature_order]
+        log_df = pd.DataFrame({
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'result': scored['result'].to_numpy()[valid],
+            'confidence': [f"{p}%" for p in scored['probability_percent'].to_numpy()[valid]],
+        })
+        log_df[fields] = chunk.loc[valid, fields].to_numpy()
+        log_df['request_id'] = request_id or ''
+        append_prediction_log(log_df)
+
+    return chunk.assign(**scored)
+
+NPY_MEDIA_TYPE = 'application/x-npy'
+BINARY_DTYPE = np.dtype('<f4')
+
+def read_feature_matrix(body, shape_header=None):
+    """
+    Matriks fitur float32 little-endian (n x 14, urutan feature_order) dari body .npy atau bytes mentah.
+    Dibungkus np.frombuffer tanpa menyalin data. Mengembalikan (X, is_npy); ValueError jika format salah.
+    """
+    n_features = len(DiabetesPreprocessor().feature_order)
+    is_npy = body[:6] == b'\x93NUMPY'
+    offset, shape = 0, None
+    if is_npy:
+        f = io.BytesIO(body)
+        readers = {(1, 0): np.lib.format.read_array_header_1_0, (2, 0): np.lib.format.read_array_header_2_0}
+        reader = readers.get(np.lib.format.read_magic(f))
+        if reader is None:
+            raise ValueError("Versi format .npy tidak didukung (gunakan 1.0/2.0)")
+        shape, fortran_order, dtype = reader(f)
+        if dtype != BINARY_DTYPE or fortran_order:
+            raise ValueError(f"Array .npy harus float32 little-endian ('<f4') C-order, diterima {dtype.str}")
+        offset = f.tell()
+    elif shape_header:
+        try:
+            shape = tuple(int(v) for v in shape_header.split(','))
+        except ValueError:
+            raise ValueError("Header X-Shape harus berbentuk 'n_baris,14'")
+
+    if (len(body) - offset) % (n_features * BINARY_DTYPE.itemsize):
+        raise ValueError(f"Ukuran data bukan kelipatan {n_features} kolom float32")
+    X = np.frombuffer(body, dtype=BINARY_DTYPE, offset=offset).reshape(-1, n_features)
+    # (n, 14), atau (14,) untuk satu pasien
+    valid_shapes = {(len(X), n_features)} | ({(n_features,)} if len(X) == 1 else set())
+    if shape is not None and tuple(shape) not in valid_shapes:
+        raise ValueError(f"Shape {tuple(shape)} tidak cocok dengan data ({len(X)}, {n_features})")
+    if not np.isfinite(X).all():
+        raise ValueError("Matriks berisi NaN/Inf")
+    return X, is_npy
+
+def score_patient(X, similar_k=None, timer=None):
+    """Prediksi, probabilitas, faktor dominan & (opsional) pasien serupa untuk satu baris fitur ter-encode."""
+    timer = timer or current_timer()
+    prediction = int(model.predict(X)[0])
+
+    # Probabilitas (Calibrated Confidence Score)
+    if hasattr(model, 'predict_proba'):
+        probability = float(model.predict_proba(X)[0][1])
+    else:
+        probability = 1.0 if prediction == 1 else 0.0
+    timer.mark('score')
+
+    # Faktor Dominan per Pasien (kontribusi fitur di jalur keputusan seluruh member)
+    feature_importance_list, explanation = [], None
+    try:
+        feature_importance_list, explanation = explain_prediction(X)
+    except Exception as e:
+        current_app.logger.warning(f"Feature Contribution Extraction Warning: {e}")
+    timer.mark('explain')
+
+    similar_patients = None
+    if similar_k and similar_index is not None:
+        similar_patients = similar_index.neighbors(X.to_numpy(), similar_k)[0]
+        timer.mark('similar')
+
+    return {
+        'prediction': prediction,
+        'probability': probability,
+        'feature_importance': feature_importance_list,
+        'explanation': explanation,
+        'similar_patients': similar_patients
+    }
+
 # --- 2. ENDPOINTS ---
 
 @api_bp.route('/predict', methods=['POST'])
+@idempotent
 def predict():
     """Endpoint utama untuk melakukan inferensi sistem pakar risiko diabetes."""
     global model
     
     # Reload model jika belum siap (Fail-safe mechanism)
     if model is None:
+        metrics.CACHE_REQUESTS.labels('model', 'miss').inc()
         load_model_resources()
         if model is None:
             return jsonify({'success': False, 'error': 'Sistem Inferensi belum siap. Hubungi admin.'}), 503
+    else:
+        metrics.CACHE_REQUESTS.labels('model', 'hit').inc()
+    g.model_version = model_version
 
     try:
+        timer = current_timer()
         data = request.get_json(silent=True)
         if not data:
             return jsonify({'success': False, 'error': 'Format data tidak valid.'}), 400
+        try:
+            # Opsional: /api/predict?similar=5 -> sertakan pasien training paling mirip
+            similar_k = parse_similar_k(request.args.get('similar'))
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
 
         preprocessor = DiabetesPreprocessor()
         
         # 1. Konversi Data ke DataFrame
         df = pd.DataFrame([data])
+        timer.mark('parse')
         
         # 2. Preprocessing & Unit Conversion
         # Standar DiaBD: Konversi otomatis imperial ke metrik & hitung BMI
         df_clean = preprocessor.clean_and_encode(df)
+        timer.mark('encode')
         
         if df_clean.empty:
             return jsonify({'success': False, 'error': 'Input data berada di luar jangkauan klinis yang valid.'}), 400
+        timer.mark('validate')
 
-        # 3. Prediksi Status (Inferensi Decision Tree CART)
+        # 3-5. Prediksi, probabilitas, faktor dominan & pasien serupa.
+        # Request bersamaan dengan vektor fitur identik berbagi satu komputasi model
         X = preprocessor.get_features(df_clean)
-        prediction_val = model.predict(X)[0]
-        prediction = int(prediction_val)
-        
-        # 4. Hitung Probabilitas (Calibrated Confidence Score)
-        if hasattr(model, 'predict_proba'):
-            probability = float(model.predict_proba(X)[0][1])
-        else:
-            probability = 1.0 if prediction == 1 else 0.0
-        
-        # 5. Ekstrak Feature Importance (Faktor Dominan)
-        # Menghitung kontribusi Information Gain setiap variabel terhadap keputusan
-        feature_importance_list = []
-        try:
-            target_model = model
-            
-            # --- PERBAIKAN UTAMA: Penanganan Versi Scikit-Learn ---
-            # Jika menggunakan CalibratedClassifierCV, kita harus mengambil estimator aslinya
-            if hasattr(model, 'calibrated_classifiers_'):
-                # Ambil classifier pertama dari list kalibrasi
-                calibrated_clf = model.calibrated_classifiers_[0]
-                
-                # Cek atribut yang tersedia (estimator untuk sklearn baru, base_estimator untuk lama)
-                if hasattr(calibrated_clf, 'estimator'):
-                    target_model = calibrated_clf.estimator
-                elif hasattr(calibrated_clf, 'base_estimator'):
-                    target_model = calibrated_clf.base_estimator
-
-            # Cek apakah target_model memiliki feature_importances_
-            if hasattr(target_model, 'feature_importances_'):
-                importances = target_model.feature_importances_
-                feature_names = preprocessor.feature_order
-                
-                # Urutkan dari yang paling berpengaruh (Descending)
-                feat_imp = sorted(zip(feature_names, importances), key=lambda x: x[1], reverse=True)
-                
-                # Mapping nama variabel teknis ke bahasa medis yang user-friendly
-                desc_map = {
-                    'hypertensive': 'Status Hipertensi (Faktor Utama)',
-                    'glucose': 'Kadar Glukosa Darah',
-                    'height': 'Tinggi Badan Pasien',
-                    'weight': 'Berat Badan Pasien',
-                    'systolic_bp': 'Tekanan Darah Sistolik',
-                    'pulse_rate': 'Detak Jantung (Pulse)',
-                    'age': 'Faktor Usia',
-                    'bmi': 'Indeks Massa Tubuh (BMI)',
-                    'diastolic_bp': 'Tekanan Darah Diastolik',
-                    'gender': 'Faktor Jenis Kelamin',
-                    'family_diabetes': 'Riwayat Diabetes Keluarga',
-                    'cvd': 'Riwayat Kardiovaskular',
-                    'stroke': 'Riwayat Stroke',
-                    'family_hypertension': 'Riwayat Hipertensi Keluarga'
-                }
-                
-                # Format output dengan presisi 3 desimal untuk transparansi analisis
-                feature_importance_list = [
-                    {
-                        'name': desc_map.get(name, name.replace('_', ' ').title()), 
-                        'value': round(float(val) * 100, 3) 
-                    } 
-                    for name, val in feat_imp if val > 0
-                ][:5] # Ambil Top 5 faktor terkuat
-        except Exception as e:
-            current_app.logger.warning(f"Feature Importance Extraction Warning: {e}")
+        timer.mark('features')
+        vector_key = hashlib.sha256(f"{model_version}:{similar_k}:".encode('utf-8')
+                                    + X.to_numpy(dtype=np.float64).tobytes()).hexdigest()
+        result, coalesced = coalesce(INFLIGHT_PREDICTIONS, vector_key, lambda: score_patient(X, similar_k, timer))
+        if coalesced:
+            timer.mark('coalesce')
+        prediction, probability = result['prediction'], result['probability']
 
         # 6. Logging ke CSV (Pencatatan Riwayat Pasien)
+        # Satu baris per request, termasuk yang menumpang komputasi (request terpisah yang kebetulan identik);
+        # retry dengan Idempotency-Key yang sama di-replay oleh @idempotent sebelum sampai ke sini
         try:
-            log_entry = {
-                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'result': 'Diabetic' if prediction == 1 else 'Non-Diabetic',
-                'confidence': f"{round(probability * 100, 2)}%",
-                **data
-            }
-            log_path = Config.PREDICTION_LOG
-            
-            # Buat header jika file baru dibuat
-            header_exists = os.path.exists(log_path)
-            log_df = pd.DataFrame([log_entry])
-            log_df.to_csv(log_path, mode='a', header=not header_exists, index=False, encoding='utf-8')
+            append_prediction_log([build_log_entry(data, prediction, probability, get_request_id())])
         except Exception as e:
             current_app.logger.error(f"Logging CSV failed: {e}")
+        timer.mark('log')
 
         # 7. Final JSON Response
         # Struktur ini disesuaikan agar formHandler.js bisa merender grafik dan PDF
-        return jsonify({
+        response = {
             'success': True,
             'label': 'Diabetic' if prediction == 1 else 'Non-Diabetic',
             'probability_percent': round(probability * 100, 2),
-            'risk_level': 'Tinggi' if probability >= 0.7 else ('Sedang' if probability >= 0.4 else 'Rendah'),
+            'risk_level': risk_level(probability),
             'input_data': data,
-            'feature_importance': feature_importance_list,
+            'feature_importance': result['feature_importance'],
+            'explanation': result['explanation'],
             'model_info': {
                 'name': 'Decision Tree (CART)', 
                 # Menggunakan fallback 99.26% jika metadata gagal dimuat
                 'accuracy': f"{model_meta.get('accuracy_cv', 0.9926) * 100:.2f}%"
             }
-        })
+        }
+        if similar_k:
+            response['similar_patients'] = result['similar_patients']
+        return jsonify(response)
 
     except Exception as e:
         current_app.logger.error(f"Critical Prediction Error: {e}")
         return jsonify({'success': False, 'error': f'Kesalahan internal sistem: {str(e)}'}), 500
 
+@api_bp.route('/predict/csv', methods=['POST'])
+def predict_csv():
+    """
+    Scoring massal dari upload CSV (skema mentah sama dengan diabetes.csv; kolom 'diabetic' opsional).
+    Upload: multipart field 'file' atau body mentah (Content-Type: text/csv).
+    File dibaca per Config.CSV_CHUNK_ROWS baris: validasi -> encode -> skor -> log -> tulis, dan
+    hasilnya di-stream balik (chunked) sehingga seluruh file tidak pernah berada di memori.
+    Baris tidak valid tidak diskor; alasannya ada di kolom 'error'.
+    """
+    if model is None:
+        return jsonify({'success': False, 'error': 'Sistem Inferensi belum siap. Hubungi admin.'}), 503
+
+    upload = request.files.get('file')
+    stream = upload.stream if upload is not None else request.stream
+    name = os.path.splitext(os.path.basename(upload.filename or ''))[0] if upload is not None else ''
+
+    # Chunk pertama dibaca sebelum response dimulai agar kesalahan format masih bisa dijawab 400
+    try:
+        reader = pd.read_csv(stream, chunksize=Config.CSV_CHUNK_ROWS, skipinitialspace=True,
+                             dtype={c: str for c in RAW_TEXT_COLUMNS})
+        first = next(reader)
+    except (StopIteration, pd.errors.EmptyDataError):
+        return jsonify({'success': False, 'error': 'File CSV kosong.'}), 400
+    except (pd.errors.ParserError, UnicodeDecodeError) as e:
+        return jsonify({'success': False, 'error': f'Format CSV tidak valid: {e}'}), 400
+
+    first.columns = first.columns.str.strip()
+    missing = [c for c in CSV_REQUIRED_COLUMNS if c not in first.columns]
+    if missing:
+        return jsonify({'success': False, 'error': f'Kolom wajib tidak ada: {missing}'}), 400
+
+    preprocessor = DiabetesPreprocessor()
+    request_id = get_request_id()
+
+    def generate():
+        header = True
+        try:
+            for chunk in itertools.chain([first], reader):
+                chunk.columns = first.columns
+                yield score_csv_chunk(chunk, preprocessor, request_id).to_csv(header=header, index=False)
+                header = False
+        except Exception as e:
+            # Status 200 sudah terkirim: kesalahan di tengah file dilaporkan sebagai baris terakhir
+            current_app.logger.error(f"CSV Scoring Error: {e}")
+            yield f"# ERROR: {e}\n"
+
+    return Response(stream_with_context(generate()), mimetype='text/csv', headers={
+        'Content-Disposition': f'attachment; filename="{name or "patients"}_scored.csv"'
+    })
+
+@api_bp.route('/predict/binary', methods=['POST'])
+def predict_binary():
+    """
+    Scoring untuk integrasi mesin-ke-mesin yang sudah memegang fitur ter-encode (tanpa JSON & clean_and_encode).
+    Body: matriks float32 little-endian n x 14 (urutan feature_order), sebagai .npy atau bytes mentah
+    (Content-Type: application/octet-stream, header X-Shape opsional 'n,14').
+    Response: probabilitas kelas Diabetic float32 '<f4' (.npy jika request .npy, selain itu bytes mentah).
+    Baris tidak dicatat ke log prediksi (log berisi data form mentah).
+    """
+    if model is None:
+        return jsonify({'success': False, 'error': 'Sistem Inferensi belum siap. Hubungi admin.'}), 503
+
+    max_bytes = Config.BINARY_MAX_ROWS * len(DiabetesPreprocessor().feature_order) * BINARY_DTYPE.itemsize + 4096
+    if request.content_length is not None and request.content_length > max_bytes:
+        return jsonify({'success': False, 'error': f'Maksimum {Config.BINARY_MAX_ROWS} baris per request.'}), 413
+
+    try:
+        X, is_npy = read_feature_matrix(request.get_data(cache=False), request.headers.get('X-Shape'))
+        if not 0 < len(X) <= Config.BINARY_MAX_ROWS:
+            raise ValueError(f'Jumlah baris harus 1-{Config.BINARY_MAX_ROWS}.')
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    # DataFrame tanpa salinan (copy=False) agar nama fitur cocok dengan model yang dilatih
+    proba = model.predict_proba(pd.DataFrame(X, columns=DiabetesPreprocessor().feature_order, copy=False))[:, 1]
+    proba = proba.astype(BINARY_DTYPE)
+    metrics.BINARY_ROWS.inc(len(proba))
+
+    if is_npy:
+        buffer = io.BytesIO()
+        np.lib.format.write_array(buffer, proba, allow_pickle=False)
+        body, media_type = buffer.getvalue(), NPY_MEDIA_TYPE
+    else:
+        body, media_type = proba.tobytes(), 'application/octet-stream'
+    return Response(body, content_type=media_type, headers={'X-Shape': str(len(proba)), 'X-Dtype': BINARY_DTYPE.str})
+
+@api_bp.route('/what-if', methods=['POST'])
+def what_if_analysis():
+    """
+    Simulasi what-if untuk satu pasien: seluruh kombinasi sumbu diskor dalam satu predict_proba.
+    Body JSON:
+    {
+        "patient": {... field form /api/predict ...},
+        "vary": {"glucose": {"min": 4, "max": 12, "steps": 17}, "bmi": [22, 25, 28]},
+        "threshold": 0.4   (opsional, ambang probabilitas counterfactual; default batas risiko Sedang)
+    }
+    """
+    if model is None:
+        return jsonify({'success': False, 'error': 'Sistem Inferensi belum siap. Hubungi admin.'}), 503
+
+    data = request.get_json(silent=True) or {}
+    patient, vary = data.get('patient'), data.get('vary')
+    if not isinstance(patient, dict) or not isinstance(vary, dict) or not vary:
+        return jsonify({'success': False, 'error': "Body wajib berisi 'patient' (objek) dan 'vary' (objek sumbu)."}), 400
+
+    try:
+        threshold = float(data.get('threshold', RISK_THRESHOLDS[0]))
+        if not 0 < threshold < 1:
+            raise ValueError("threshold harus di antara 0 dan 1 (probabilitas)")
+
+        preprocessor = DiabetesPreprocessor()
+        df_clean = preprocessor.clean_and_encode(pd.DataFrame([patient]))
+        if df_clean.empty:
+            raise ValueError('Input data berada di luar jangkauan klinis yang valid.')
+        base_row = preprocessor.get_features(df_clean).to_numpy(dtype=np.float64)[0]
+        index = {name: i for i, name in enumerate(preprocessor.feature_order)}
+
+        # Sumbu dalam satuan dataset; nilai pasien saat ini selalu ikut agar perubahan satu fitur terukur
+        axes = {}
+        for name, spec in vary.items():
+            values = what_if.parse_axis(name, spec, Config.WHAT_IF_MAX_STEPS)
+            values = preprocessor.convert_units(name, values).to_numpy(dtype=float)
+            axes[name] = np.union1d(values, [base_row[index[name]]])
+        n_variants = int(np.prod([len(v) for v in axes.values()]))
+        if n_variants > Config.WHAT_IF_MAX_VARIANTS:
+            raise ValueError(f"Grid terlalu besar ({n_variants} varian, maksimum {Config.WHAT_IF_MAX_VARIANTS}).")
+
+        X = what_if.build_variants(base_row, preprocessor.feature_order, axes)
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    try:
+        # Satu panggilan predict_proba untuk seluruh grid (+ baris pasien di posisi terakhir)
+        X_all = pd.DataFrame(np.vstack([X, base_row.astype(np.float32)]), columns=preprocessor.feature_order)
+        proba_all = model.predict_proba(X_all)[:, 1]
+        proba, base_proba = proba_all[:-1], float(proba_all[-1])
+        proba_grid = proba.reshape([len(v) for v in axes.values()])
+
+        counterfactual = None
+        if base_proba < threshold:
+            counterfactual = {'changes': {}, 'distance': 0.0, 'probability': base_proba}
+        else:
+            counterfactual = what_if.find_counterfactual(X, proba, base_row, preprocessor.feature_order, axes, threshold)
+        if counterfactual is not None:
+            probability = counterfactual.pop('probability')
+            counterfactual['probability_percent'] = round(probability * 100, 2)
+            counterfactual['risk_level'] = risk_level(probability)
+
+        single = what_if.single_feature_changes(proba_grid, axes, base_row, preprocessor.feature_order, threshold)
+        for entry in single.values():
+            if entry is not None:
+                entry['probability_percent'] = round(entry.pop('probability') * 100, 2)
+
+        return jsonify({
+            'success': True,
+            'units': {name: what_if.UNITS[name] for name in axes},
+            'baseline': {
+                'values': {name: round(float(base_row[index[name]]), 2) for name in what_if.WHAT_IF_FEATURES},
+                'probability_percent': round(base_proba * 100, 2),
+                'risk_level': risk_level(base_proba)
+            },
+            'threshold_percent': round(threshold * 100, 2),
+            'n_variants': n_variants,
+            # Urutan dimensi eksplisit: key objek JSON diurutkan ulang oleh serializer
+            'axis_order': list(axes),
+            'axes': {name: np.round(values, 2).tolist() for name, values in axes.items()},
+            # Array bersarang sesuai axis_order (sumbu terakhir = dimensi terdalam)
+            'probability_percent': np.round(proba_grid * 100, 2).tolist(),
+            'counterfactual': counterfactual,
+            'single_feature': single
+        })
+    except Exception as e:
+        current_app.logger.error(f"What-if Error: {e}")
+        return jsonify({'success': False, 'error': f'Kesalahan internal sistem: {str(e)}'}), 500
+
+@api_bp.route('/similar', methods=['POST'])
+def similar_patients():
+    """
+    Pasien training paling mirip (BallTree pada fitur terstandarisasi) beserta outcome-nya.
+    Body JSON: {"patient": {...}, "k": 5} atau batch {"patients": [{...}, ...], "k": 5}.
+    """
+    if similar_index is None:
+        return jsonify({'success': False, 'error': 'Indeks pasien serupa belum tersedia.'}), 503
+
+    data = request.get_json(silent=True) or {}
+    batch = 'patients' in data
+    patients = data.get('patients') if batch else [data.get('patient')]
+    if not isinstance(patients, list) or not patients or not all(isinstance(p, dict) for p in patients):
+        return jsonify({'success': False, 'error': "Body wajib berisi 'patient' (objek) atau 'patients' (list objek)."}), 400
+    if len(patients) > Config.SIMILAR_MAX_BATCH:
+        return jsonify({'success': False, 'error': f"Maksimum {Config.SIMILAR_MAX_BATCH} pasien per request."}), 400
+    try:
+        k = parse_similar_k(data.get('k', Config.SIMILAR_DEFAULT_K))
+        if k is None:
+            raise ValueError(f"Jumlah pasien serupa (k) harus 1-{Config.SIMILAR_MAX_K}")
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    try:
+        preprocessor = DiabetesPreprocessor()
+        X = preprocessor.get_features(preprocessor.clean_and_encode(pd.DataFrame(patients)))
+        # Satu query tree untuk seluruh batch
+        neighbors = similar_index.neighbors(X.to_numpy(), k)
+        results = [{'neighbors': n, 'summary': similar_index.summary(n)} for n in neighbors]
+
+        response = {'success': True, 'k': k, 'distance': 'euclidean (z-score)'}
+        if batch:
+            response['results'] = results
+        else:
+            response.update(results[0])
+        return jsonify(response)
+    except Exception as e:
+        current_app.logger.error(f"Similar Patients Error: {e}")
+        return jsonify({'success': False, 'error': f'Kesalahan internal sistem: {str(e)}'}), 500
+
+def prediction_log_version():
+    """
+    Versi file log dari metadata saja (inode, ukuran, mtime) tanpa membaca isi.
+    Log hanya di-append, jadi ukuran = posisi tulis terakhir; berlaku lintas worker.
+    """
+    try:
+        stat = os.stat(Config.PREDICTION_LOG)
+    except FileNotFoundError:
+        return None
+    return f"{stat.st_ino:x}-{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
+_logs_json = None   # PrecomputedJSON /api/logs terakhir di worker ini (ETag = versi file log)
+
 @api_bp.route('/logs', methods=['GET'])
 def get_logs():
-    """Mengambil riwayat log pemeriksaan untuk dashboard."""
+    """Mengambil riwayat log pemeriksaan untuk dashboard (ETag / 304; CSV hanya dibaca jika log berubah)."""
+    global _logs_json
     try:
-        log_path = Config.PREDICTION_LOG
-        if os.path.exists(log_path):
-            df = pd.read_csv(log_path)
-            # Mengisi nilai kosong dengan '-' agar tidak error di frontend
-            logs = df.tail(100).fillna('-').to_dict(orient='records')
-            logs.reverse() # Tampilkan yang terbaru di atas
-            return jsonify({"success": True, "logs": logs})
-        return jsonify({"success": True, "logs": []})
+        version = prediction_log_version()
+        etag = f"log-{version or 'empty'}"
+        cached = _logs_json
+        if cached is None or cached.etag != etag:
+            # Client yang sudah punya versi ini dijawab 304 sebelum CSV dibaca
+            not_modified_response = not_modified(etag, public=False)
+            if not_modified_response is not None:
+                return not_modified_response
+
+            logs = []
+            if version is not None:
+                df = pd.read_csv(Config.PREDICTION_LOG)
+                # Mengisi nilai kosong dengan '-' agar tidak error di frontend
+                logs = df.tail(100).fillna('-').to_dict(orient='records')
+                logs.reverse() # Tampilkan yang terbaru di atas
+            cached = _logs_json = PrecomputedJSON({"success": True, "logs": logs}, etag=etag)
+        # Data pasien: boleh disimpan browser, tidak oleh cache bersama (proxy)
+        return cached.response(public=False)
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
 @api_bp.route('/model-info', methods=['GET'])
 def get_model_info():
-    """API untuk mengambil metadata performa model."""
-    return jsonify(model_meta)
\ No newline at end of file
+    """API untuk mengambil metadata performa model (body & ETag dihitung sekali per load model)."""
+    return (model_info_json or PrecomputedJSON(model_meta, version=model_version)).response()
+
+@api_bp.route('/risk-curves', methods=['GET'])
+def get_risk_curves():
+    """Kurva risiko populasi (partial dependence) versi model aktif; mendukung ETag / 304."""
+    if risk_curves_json is None:
+        return jsonify({'success': False, 'error': 'Kurva risiko belum tersedia.'}), 503
+    # Boleh di-cache, tetapi wajib revalidasi (ETag berubah saat model diganti)
+    return risk_curves_json.response()
+
+@api_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Metrik operasional dalam format teks Prometheus (digabung dari seluruh worker)."""
+    return Response(metrics.generate_latest(), content_type=metrics.CONTENT_TYPE)
\ No newline at end of file
@@ -0,0 +1,115 @@
+from flask import Blueprint, request, jsonify
+import os
+import hmac
+from Backend.config import Config
+from Backend.monitoring import SLOW_REQUESTS, profiler, memory
+from Backend.serving import ADMISSION
+
+debug_bp = Blueprint('debug', __name__)
+
+# --- OTORISASI ADMIN ---
+def _admin_error():
+    """None jika token admin valid, selain itu response error (403)."""
+    if not Config.ADMIN_TOKEN:
+        return jsonify({'success': False, 'error': 'Endpoint admin nonaktif (ADMIN_TOKEN belum di-set).'}), 403
+    token = request.headers.get('X-Admin-Token', '')
+    if not hmac.compare_digest(token.encode('utf-8'), Config.ADMIN_TOKEN.encode('utf-8')):
+        return jsonify({'success': False, 'error': 'Token admin tidak valid.'}), 403
+    return None
+
+# --- DIAGNOSTIK LATENSI (TAIL LATENCY, KHUSUS ADMIN) ---
+@debug_bp.route('/slow', methods=['GET'])
+def get_slow_requests():
+    """
+    N request paling lambat dalam jendela waktu terakhir di worker ini.
+    Query: ?limit=10 (jumlah entri).
+    """
+    error = _admin_error()
+    if error:
+        return error
+
+    limit = request.args.get('limit', type=int)
+    return jsonify({
+        'success': True,
+        'pid': os.getpid(),
+        'capacity': Config.SLOW_REQUEST_CAPACITY,
+        'window_seconds': Config.SLOW_REQUEST_WINDOW,
+        'requests': SLOW_REQUESTS.snapshot(limit)
+    })
+
+@debug_bp.route('/slow', methods=['DELETE'])
+def clear_slow_requests():
+    """Mengosongkan buffer request lambat di worker ini."""
+    error = _admin_error()
+    if error:
+        return error
+
+    SLOW_REQUESTS.clear()
+    return jsonify({'success': True, 'pid': os.getpid()})
+
+# --- ADMISSION CONTROL (BEBAN) ---
+@debug_bp.route('/admission', methods=['GET'])
+def get_admission_status():
+    """Slot terpakai, kedalaman antrean per prioritas & jumlah request yang ditolak di worker ini."""
+    return jsonify({'success': True, 'pid': os.getpid(), **ADMISSION.snapshot()})
+
+# --- PROFILER ON-DEMAND (KHUSUS ADMIN) ---
+@debug_bp.route('/profile', methods=['GET'])
+def get_profile_status():
+    """Status sesi profiling di worker ini & hasil sesi terakhir."""
+    error = _admin_error()
+    if error:
+        return error
+
+    session = profiler.active_session()
+    return jsonify({
+        'success': True,
+        'pid': os.getpid(),
+        'active': session.status() if session else None,
+        'last_result': profiler.last_result
+    })
+
+@debug_bp.route('/profile', methods=['POST'])
+def start_profile():
+    """
+    Memprofil N request berikutnya dan/atau T detik di worker ini.
+    Body JSON: {"mode": "sample"|"cprofile", "requests": 100, "seconds": 30, "interval_ms": 5}
+    """
+    error = _admin_error()
+    if error:
+        return error
+
+    data = request.get_json(silent=True) or {}
+    try:
+        seconds = data.get('seconds')
+        if seconds is not None:
+            seconds = min(float(seconds), Config.PROFILER_MAX_SECONDS)
+        requests_limit = data.get('requests')
+        session = profiler.start_session(
+            mode=data.get('mode', 'sample'),
+            max_requests=int(requests_limit) if requests_limit else None,
+            # Sesi selalu berhenti paling lambat di PROFILER_MAX_SECONDS
+            max_seconds=seconds or Config.PROFILER_MAX_SECONDS,
+            interval_ms=float(data.get('interval_ms', 5.0))
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+
+    return jsonify({'success': True, 'pid': os.getpid(), 'active': session.status()}), 202
+
+# --- AKUNTANSI MEMORI (KHUSUS ADMIN) ---
+@debug_bp.route('/memory', methods=['GET'])
+def get_memory_report():
+    """
+    Laporan memori worker ini: object graph model & preprocessor, cache, RSS/PSS.
+    Query: ?detailed=1 (tambahkan tracemalloc saat memuat ulang bundle model).
+    """
+    error = _admin_error()
+    if error:
+        return error
+
+    from Backend.routes import api_routes
+    report = memory.build_report(api_routes, detailed=request.args.get('detailed') == '1')
+    return jsonify({'success': True, **report})
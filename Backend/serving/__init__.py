@@ -0,0 +1,29 @@
+"""
+Backend/serving/__init__.py
+Perlindungan serving: admission control & load shedding endpoint scoring,
+Idempotency-Key, penggabungan request identik yang sedang diproses, dan
+response JSON read-only yang sudah diserialisasi (ETag / 304 / gzip).
+"""
+
+from . import admission, http_cache, idempotency
+from .admission import ADMISSION, AdmissionRejected
+from .http_cache import PrecomputedJSON, not_modified
+from .idempotency import IDEMPOTENCY_RESULTS, INFLIGHT_PREDICTIONS, idempotent
+
+
+def init_app(app):
+    """Memasang hook serving (harus SETELAH monitoring agar request yang ditolak tetap tercatat)."""
+    admission.init_app(app)
+    return app
+
+
+__all__ = [
+    'ADMISSION',
+    'AdmissionRejected',
+    'IDEMPOTENCY_RESULTS',
+    'INFLIGHT_PREDICTIONS',
+    'PrecomputedJSON',
+    'idempotent',
+    'not_modified',
+    'init_app'
+]
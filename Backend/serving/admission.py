@@ -0,0 +1,194 @@
+"""
+Backend/serving/admission.py
+Admission control & load shedding untuk endpoint scoring (per worker).
+
+- Maksimal Config.ADMISSION_MAX_CONCURRENT request diproses bersamaan; sisanya menunggu di antrean
+  terbatas (Config.ADMISSION_MAX_QUEUE). Saat slot dilepas, slot langsung diserahkan ke antrean
+  terdepan (tanpa perebutan ulang), sehingga urutan dilayani sesuai prioritas lalu waktu datang.
+- Prioritas: 'interactive' (submit form web, header X-Priority: interactive) didahulukan dari
+  'batch'. Jika antrean penuh, request interactive menggeser request batch terbaru di antrean.
+- Deadline: waktu tunggu maksimum = min(Config.ADMISSION_QUEUE_TIMEOUT, header X-Deadline-Ms).
+  Request yang tidak mendapat slot sebelum deadline ditolak, bukan dikerjakan setelah client menyerah.
+- Penolakan = 503 + Retry-After (gagal cepat), dicatat per prioritas & alasan di /api/metrics.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+from flask import g, jsonify, request
+
+from Backend.config import Config
+from Backend.monitoring import metrics
+from Backend.monitoring.timing import current_timer
+
+PRIORITIES = ('interactive', 'batch')   # Indeks kecil = didahulukan
+DEADLINE_HEADER = 'X-Deadline-Ms'
+PRIORITY_HEADER = 'X-Priority'
+
+
+class AdmissionRejected(Exception):
+    """Request ditolak admission control; reason: queue_full | timeout | evicted | deadline."""
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class _Waiter:
+    __slots__ = ('priority', 'event', 'admitted', 'evicted')
+
+    def __init__(self, priority):
+        self.priority = priority
+        self.event = threading.Event()
+        self.admitted = False
+        self.evicted = False
+
+
+class AdmissionController:
+    def __init__(self, max_concurrent, max_queue, queue_timeout, clock=time.monotonic):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._clock = clock
+        self._active = 0
+        self._queue = []  # (indeks prioritas, seq, waiter): akar = berikutnya dilayani
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self.shed = {(priority, reason): 0 for priority in PRIORITIES
+                     for reason in ('queue_full', 'timeout', 'evicted', 'deadline')}
+
+    @property
+    def enabled(self):
+        return self.max_concurrent > 0
+
+    def _queued(self, priority):
+        return sum(1 for _, _, waiter in self._queue if waiter.priority == priority)
+
+    def _reject(self, priority, reason):
+        # Dipanggil dengan lock dipegang
+        self.shed[(priority, reason)] += 1
+        metrics.ADMISSION_SHED.labels(priority, reason).inc()
+        return AdmissionRejected(reason)
+
+    def _update_gauges(self):
+        metrics.ADMISSION_IN_FLIGHT.set(self._active)
+        for priority in PRIORITIES:
+            metrics.ADMISSION_QUEUE_DEPTH.labels(priority).set(self._queued(priority))
+
+    def acquire(self, priority='batch', timeout=None):
+        """
+        Menunggu slot; mengembalikan lama menunggu (detik) atau raise AdmissionRejected.
+        timeout: batas tunggu request ini (default queue_timeout, tidak pernah melebihinya).
+        """
+        timeout = self.queue_timeout if timeout is None else min(timeout, self.queue_timeout)
+        rank = PRIORITIES.index(priority)
+        with self._lock:
+            if self._active < self.max_concurrent and not self._queue:
+                self._active += 1
+                metrics.ADMISSION_IN_FLIGHT.set(self._active)
+                return 0.0
+            if timeout <= 0:
+                raise self._reject(priority, 'deadline')
+            if len(self._queue) >= self.max_queue:
+                # Antrean penuh: geser request dengan prioritas lebih rendah yang paling baru datang
+                victim = max(self._queue, key=lambda item: item[:2]) if self._queue else None
+                if victim is None or victim[0] <= rank:
+                    raise self._reject(priority, 'queue_full')
+                self._queue.remove(victim)
+                heapq.heapify(self._queue)
+                victim[2].evicted = True
+                victim[2].event.set()
+                self._reject(victim[2].priority, 'evicted')
+            waiter = _Waiter(priority)
+            heapq.heappush(self._queue, (rank, next(self._seq), waiter))
+            self._update_gauges()
+
+        start = self._clock()
+        waiter.event.wait(timeout)
+        with self._lock:
+            # Status diputuskan di bawah lock: slot bisa saja diserahkan tepat saat timeout
+            if waiter.admitted:
+                return self._clock() - start
+            if not waiter.evicted:
+                self._queue = [item for item in self._queue if item[2] is not waiter]
+                heapq.heapify(self._queue)
+                self._update_gauges()
+                raise self._reject(priority, 'timeout')
+        raise AdmissionRejected('evicted')
+
+    def release(self):
+        """Melepas slot; jika ada antrean, slot langsung diserahkan ke request terdepan."""
+        with self._lock:
+            if self._queue:
+                _, _, waiter = heapq.heappop(self._queue)
+                waiter.admitted = True
+                waiter.event.set()
+            else:
+                self._active -= 1
+            self._update_gauges()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'in_flight': self._active,
+                'max_concurrent': self.max_concurrent,
+                'queued': {priority: self._queued(priority) for priority in PRIORITIES},
+                'max_queue': self.max_queue,
+                'queue_timeout_s': self.queue_timeout,
+                'shed': {f"{priority}/{reason}": count for (priority, reason), count in self.shed.items()}
+            }
+
+
+ADMISSION = AdmissionController(Config.ADMISSION_MAX_CONCURRENT, Config.ADMISSION_MAX_QUEUE,
+                                Config.ADMISSION_QUEUE_TIMEOUT)
+
+
+def request_priority(endpoint):
+    """'interactive' hanya jika endpoint mengizinkan DAN client memintanya; selain itu 'batch'."""
+    allowed = Config.ADMISSION_ENDPOINTS.get(endpoint)
+    if allowed == 'interactive' and request.headers.get(PRIORITY_HEADER, '').lower() == 'interactive':
+        return 'interactive'
+    return 'batch'
+
+
+def request_deadline():
+    """Sisa waktu tunggu client (detik) dari header X-Deadline-Ms, atau None."""
+    value = request.headers.get(DEADLINE_HEADER)
+    try:
+        return float(value) / 1000 if value else None
+    except ValueError:
+        return None
+
+
+def init_app(app):
+    """Memasang admission control pada endpoint di Config.ADMISSION_ENDPOINTS (setelah hook monitoring)."""
+
+    @app.before_request
+    def _admit_request():
+        if not ADMISSION.enabled or request.endpoint not in Config.ADMISSION_ENDPOINTS:
+            return None
+        priority = request_priority(request.endpoint)
+        try:
+            waited = ADMISSION.acquire(priority, request_deadline())
+        except AdmissionRejected as e:
+            response = jsonify({'success': False, 'error': 'Server sedang sibuk, silakan coba lagi sebentar.',
+                                'reason': e.reason})
+            response.status_code = 503
+            response.headers['Retry-After'] = str(Config.ADMISSION_RETRY_AFTER)
+            return response
+        g._admission_slot = True
+        metrics.ADMISSION_WAIT.labels(priority).observe(waited)
+        if waited:
+            current_timer().mark('queue')
+        return None
+
+    # teardown_request: slot dilepas juga saat exception & setelah response streaming (CSV) selesai
+    @app.teardown_request
+    def _release_slot(exc):
+        if g.pop('_admission_slot', False):
+            ADMISSION.release()
+
+    return app
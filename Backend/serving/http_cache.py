@@ -0,0 +1,61 @@
+"""
+Backend/serving/http_cache.py
+Response JSON read-only yang sudah diserialisasi sekali (+ versi gzip) dengan ETag kuat.
+
+- Body (bytes) & versi gzip dibuat saat data berubah (model dimuat, log bertambah), bukan per request.
+- ETag berasal dari versi data (versi model, posisi tulis log), sehingga If-None-Match bisa dijawab
+  304 sebelum body dibangun, tanpa membaca file.
+- gzip hanya untuk body >= Config.GZIP_MIN_BYTES dan client yang mengirim Accept-Encoding: gzip.
+  Representasi gzip memakai ETag sendiri (akhiran '-gz') karena ETag kuat berlaku per byte.
+- Cache-Control: no-cache -> browser boleh menyimpan, tetapi wajib revalidasi (murah: 304).
+"""
+
+import gzip
+import hashlib
+import json
+
+from flask import Response, request
+
+from Backend.config import Config
+
+GZIP_SUFFIX = '-gz'
+
+
+def _cache_headers(response, etag, public):
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    if public:
+        response.cache_control.public = True
+    else:
+        response.cache_control.private = True
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def not_modified(etag, public=True):
+    """Response 304 jika If-None-Match cocok dengan representasi etag (identity/gzip), selain itu None."""
+    for candidate in (etag, etag + GZIP_SUFFIX):
+        if request.if_none_match.contains(candidate):
+            return _cache_headers(Response(status=304), candidate, public)
+    return None
+
+
+class PrecomputedJSON:
+    __slots__ = ('body', 'gzip_body', 'etag')
+
+    def __init__(self, payload=None, etag=None, body=None, version=''):
+        # Format sama dengan jsonify (key terurut, tanpa spasi)
+        self.body = body if body is not None else json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        self.etag = etag or hashlib.sha1(f"{version}\0".encode('utf-8') + self.body).hexdigest()[:20]
+        self.gzip_body = gzip.compress(self.body, compresslevel=6) if len(self.body) >= Config.GZIP_MIN_BYTES else None
+
+    def response(self, public=True):
+        cached = not_modified(self.etag, public)
+        if cached is not None:
+            return cached
+
+        use_gzip = self.gzip_body is not None and request.accept_encodings['gzip'] > 0
+        response = Response(self.gzip_body if use_gzip else self.body, content_type='application/json')
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+        return _cache_headers(response, self.etag + GZIP_SUFFIX if use_gzip else self.etag, public)
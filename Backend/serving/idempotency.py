@@ -0,0 +1,178 @@
+"""
+Backend/serving/idempotency.py
+Idempotency-Key & penggabungan (coalescing) request identik yang sedang diproses (per worker).
+
+- Idempotency-Key: response pertama untuk sebuah key disimpan selama Config.IDEMPOTENCY_TTL detik.
+  Retry dengan key & payload sama mendapat response yang sama (header Idempotent-Replayed: true)
+  tanpa menjalankan model atau menulis log lagi. Key sama dengan payload berbeda -> 422.
+- Request dengan key sama yang datang saat request pertama masih diproses menunggu Future yang sama.
+- Coalescing tanpa key: /api/predict dengan vektor fitur ter-encode identik yang sedang diproses
+  berbagi satu komputasi model (store dengan TTL 0: hasil dibuang begitu selesai). Setiap request
+  tetap menulis baris log sendiri; hanya replay Idempotency-Key yang tidak dicatat ulang.
+- Response 5xx tidak disimpan (retry berikutnya dihitung ulang), hanya dibagikan ke yang sedang menunggu.
+"""
+
+import re
+import hashlib
+import functools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from flask import Response, current_app, jsonify, request
+
+from Backend.config import Config
+from Backend.monitoring import metrics
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+_KEY_PATTERN = re.compile(r'^[\x21-\x7e]{1,255}$')
+
+
+class IdempotencyConflict(Exception):
+    """Key sudah dipakai untuk payload lain."""
+
+
+class InFlightStore:
+    def __init__(self, ttl=0.0, max_entries=10000, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> [fingerprint, future, kedaluwarsa (None = masih diproses)]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _purge(self, now):
+        # Urutan insertion ~ urutan selesai, jadi cukup buang dari depan selama sudah kedaluwarsa
+        while self._entries:
+            key, (_, _, expires) = next(iter(self._entries.items()))
+            if expires is None or expires > now:
+                break
+            del self._entries[key]
+
+    def claim(self, key, fingerprint=None):
+        """
+        (future, owner): owner=True -> pemanggil wajib menghitung lalu complete()/fail().
+        owner=False -> future milik request lain (sedang diproses atau hasil tersimpan).
+        """
+        with self._lock:
+            now = self._clock()
+            self._purge(now)
+            entry = self._entries.get(key)
+            if entry is not None and (entry[2] is None or entry[2] > now):
+                if entry[0] != fingerprint:
+                    raise IdempotencyConflict(key)
+                return entry[1], False
+            future = Future()
+            self._entries[key] = [fingerprint, future, None]
+            self._entries.move_to_end(key)
+            # Batas memori: buang entri selesai paling lama (entri yang masih diproses dipertahankan)
+            if len(self._entries) > self.max_entries:
+                for old_key, (_, _, expires) in list(self._entries.items()):
+                    if len(self._entries) <= self.max_entries:
+                        break
+                    if expires is not None:
+                        del self._entries[old_key]
+            return future, True
+
+    def _owns(self, key, future):
+        # Entri bisa sudah tergeser (max_entries) atau diganti claim baru setelah kedaluwarsa
+        entry = self._entries.get(key)
+        return entry is not None and entry[1] is future
+
+    def complete(self, key, future, result, keep=True):
+        """Mengisi hasil; disimpan selama ttl jika keep (selain itu hanya untuk yang sedang menunggu)."""
+        with self._lock:
+            if self._owns(key, future):
+                if keep and self.ttl > 0:
+                    self._entries[key][2] = self._clock() + self.ttl
+                    self._entries.move_to_end(key)
+                else:
+                    del self._entries[key]
+        future.set_result(result)
+
+    def fail(self, key, future, exc):
+        with self._lock:
+            if self._owns(key, future):
+                del self._entries[key]
+        future.set_exception(exc)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+IDEMPOTENCY_RESULTS = InFlightStore(Config.IDEMPOTENCY_TTL, Config.IDEMPOTENCY_MAX_KEYS)
+INFLIGHT_PREDICTIONS = InFlightStore()
+
+
+def coalesce(store, key, compute):
+    """
+    Menjalankan compute() sekali untuk seluruh pemanggil bersamaan dengan key sama.
+    Mengembalikan (hasil, shared): shared=True jika hasil berasal dari komputasi request lain.
+    """
+    future, owner = store.claim(key)
+    if not owner:
+        metrics.CACHE_REQUESTS.labels('inflight_predict', 'hit').inc()
+        return future.result(timeout=Config.IDEMPOTENCY_WAIT_TIMEOUT), True
+    metrics.CACHE_REQUESTS.labels('inflight_predict', 'miss').inc()
+    try:
+        result = compute()
+    except BaseException as e:
+        store.fail(key, future, e)
+        raise
+    store.complete(key, future, result, keep=False)
+    return result, False
+
+
+def _replay(result):
+    status, body, mimetype = result
+    response = Response(body, status=status, mimetype=mimetype)
+    response.headers[REPLAYED_HEADER] = 'true'
+    return response
+
+
+def idempotent(view):
+    """Dekorator endpoint POST: mendukung header Idempotency-Key (tanpa header: tidak ada perubahan)."""
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return view(*args, **kwargs)
+        if not _KEY_PATTERN.match(key):
+            return jsonify({'success': False, 'error': f'{IDEMPOTENCY_HEADER} tidak valid (1-255 karakter ASCII).'}), 400
+
+        # Key berlaku per endpoint; fingerprint = path+query+body agar key yang dipakai ulang untuk payload lain terdeteksi
+        store_key = f"{request.endpoint}:{key}"
+        fingerprint = hashlib.sha256(request.full_path.encode('utf-8') + b'\0' + request.get_data()).hexdigest()
+        try:
+            future, owner = IDEMPOTENCY_RESULTS.claim(store_key, fingerprint)
+        except IdempotencyConflict:
+            return jsonify({'success': False,
+                            'error': f'{IDEMPOTENCY_HEADER} sudah dipakai untuk payload yang berbeda.'}), 422
+
+        if not owner:
+            metrics.CACHE_REQUESTS.labels('idempotency', 'hit').inc()
+            try:
+                return _replay(future.result(timeout=Config.IDEMPOTENCY_WAIT_TIMEOUT))
+            except FutureTimeoutError:
+                return jsonify({'success': False,
+                                'error': f'Request dengan {IDEMPOTENCY_HEADER} yang sama masih diproses.'}), 409
+            except Exception:
+                return jsonify({'success': False, 'error': 'Request asal gagal diproses.'}), 500
+
+        metrics.CACHE_REQUESTS.labels('idempotency', 'miss').inc()
+        try:
+            response = current_app.make_response(view(*args, **kwargs))
+        except BaseException as e:
+            IDEMPOTENCY_RESULTS.fail(store_key, future, e)
+            raise
+        result = (response.status_code, response.get_data(), response.mimetype)
+        IDEMPOTENCY_RESULTS.complete(store_key, future, result, keep=response.status_code < 500)
+        return response
+
+    return wrapper
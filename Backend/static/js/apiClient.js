@@ -9,6 +9,8 @@ class DiabetesApiClient {
         // Otomatis deteksi URL. Jika kosong, gunakan origin saat ini (http://localhost:8000)
         this.baseUrl = baseUrl || window.location.origin;
         this.isConnected = false;
+        // Satu request /api/model-info dipakai bersama oleh checkConnection() & getModelInfo()
+        this.modelInfoPromise = null;
         
         console.log('🌐 Diabetes API Client initialized');
         console.log('   Base URL:', this.baseUrl);
@@ -67,7 +69,7 @@ class DiabetesApiClient {
      * Menggunakan endpoint model-info karena api_routes.py tidak memiliki /health khusus.
      */
     async checkConnection() {
-        return this.request('/api/model-info');
+        return this.getModelInfo();
     }
 
     /**
@@ -75,13 +77,25 @@ class DiabetesApiClient {
      * Mengirim data payload mentah ke Backend.
      * Biarkan Backend/models/preprocess.py yang melakukan cleaning agar konsisten.
      */
-    async predict(payload) {
+    async predict(payload, idempotencyKey = null) {
         if (!payload || typeof payload !== 'object') {
             throw new Error("Data input tidak valid.");
         }
-        
+
+        // Request dari browser = interaktif (didahulukan dari batch oleh admission control).
+        // idempotencyKey opsional: pemanggil yang melakukan retry mengirim key yang sama di setiap percobaan.
+        const headers = {
+            'Content-Type': 'application/json',
+            'Accept': 'application/json',
+            'X-Priority': 'interactive'
+        };
+        if (idempotencyKey) {
+            headers['Idempotency-Key'] = idempotencyKey;
+        }
+
         return this.request('/api/predict', {
             method: 'POST',
+            headers,
             body: payload
         });
     }
@@ -99,7 +113,14 @@ class DiabetesApiClient {
      * Mengambil metadata akurasi model
      */
     async getModelInfo() {
-        return this.request('/api/model-info');
+        if (!this.modelInfoPromise) {
+            // Gagal -> promise dibuang agar panggilan berikutnya mencoba lagi
+            this.modelInfoPromise = this.request('/api/model-info').catch(error => {
+                this.modelInfoPromise = null;
+                throw error;
+            });
+        }
+        return this.modelInfoPromise;
     }
 }
 
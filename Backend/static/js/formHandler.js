@@ -30,6 +30,50 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     // --- 3. LOGIKA PREDIKSI ---
+    // Idempotency-Key dibuat sekali per submit form dan dipakai ulang di setiap retry,
+    // sehingga retry tidak menjalankan model & menulis log dua kali.
+    // crypto.randomUUID hanya ada di secure context (HTTPS/localhost); akses LAN via HTTP memakai fallback.
+    const newIdempotencyKey = () => {
+        const c = window.crypto;
+        if (c && typeof c.randomUUID === 'function') {
+            return c.randomUUID();
+        }
+        if (c && typeof c.getRandomValues === 'function') {
+            return Array.from(c.getRandomValues(new Uint8Array(16)), b => b.toString(16).padStart(2, '0')).join('');
+        }
+        return Date.now().toString(36) + '-' + Math.random().toString(36).slice(2);
+    };
+
+    const PREDICT_RETRIES = 2;
+    const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+    const postPrediction = async (payload, idempotencyKey) => {
+        for (let attempt = 0; ; attempt++) {
+            try {
+                const response = await fetch('/api/predict', {
+                    method: 'POST',
+                    // Submit form didahulukan dari traffic batch saat server penuh
+                    headers: {
+                        'Content-Type': 'application/json',
+                        'X-Priority': 'interactive',
+                        'Idempotency-Key': idempotencyKey
+                    },
+                    body: JSON.stringify(payload)
+                });
+                // Server penuh (503): tunggu sesuai Retry-After lalu kirim ulang dengan key yang sama
+                if (response.status === 503 && attempt < PREDICT_RETRIES) {
+                    await sleep((parseFloat(response.headers.get('Retry-After')) || 1) * 1000);
+                    continue;
+                }
+                return response;
+            } catch (err) {
+                // Gagal jaringan: request pertama mungkin sudah diproses, retry di-replay server lewat key
+                if (attempt >= PREDICT_RETRIES) throw err;
+                await sleep(500 * (attempt + 1));
+            }
+        }
+    };
+
     if (btnPredict && form) {
         btnPredict.addEventListener('click', async (e) => {
             e.preventDefault(); 
@@ -62,11 +106,7 @@ document.addEventListener('DOMContentLoaded', () => {
                     }
                 }
 
-                const response = await fetch('/api/predict', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify(payload)
-                });
+                const response = await postPrediction(payload, newIdempotencyKey());
 
                 if (!response.ok) throw new Error(`HTTP Error: ${response.status}`);
 
@@ -112,11 +152,13 @@ document.addEventListener('DOMContentLoaded', () => {
                     
                     if (res.feature_importance && res.feature_importance.length > 0) {
                         res.feature_importance.forEach(f => {
+                            // Kontribusi per pasien bertanda: (+) menaikkan risiko, (−) menurunkan risiko
+                            const sign = f.contribution === undefined ? '' : (f.contribution >= 0 ? '+' : '−');
                             fList.innerHTML += `
                                 <li style="margin-bottom: 12px;">
                                     <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 4px;">
                                         <span class="feat-name" style="font-size:0.85rem; opacity: 0.8;">• ${f.name}</span>
-                                        <strong class="feat-val" style="font-size:0.85rem; color: ${color};">${f.value.toFixed(3)}%</strong>
+                                        <strong class="feat-val" style="font-size:0.85rem; color: ${color};">${sign}${f.value.toFixed(3)}%</strong>
                                     </div>
                                     <div class="bar-track" style="width:100%; height:6px; background:rgba(255,255,255,0.1); border-radius:3px; overflow:hidden;">
                                         <div class="bar-fill" style="width:${f.value}%; height:100%; background:${color}; opacity:0.8;"></div>
@@ -0,0 +1,72 @@
+/**
+ * Kurva Risiko Populasi (Partial Dependence)
+ * Mengambil /api/risk-curves (dihitung sekali per versi model, di-cache browser via ETag)
+ * lalu menggambar grafik SVG ringan tanpa library chart ke setiap elemen [data-risk-curves].
+ */
+
+(function () {
+    const W = 320, H = 200;
+    const PAD = { left: 40, right: 12, top: 14, bottom: 36 };
+    const COLOR = { line: '#38bdf8', band: 'rgba(56, 189, 248, 0.15)', axis: 'rgba(148, 163, 184, 0.35)', text: '#94a3b8', marker: '#f59e0b' };
+
+    function linear(d0, d1, r0, r1) {
+        const span = (d1 - d0) || 1;
+        return v => r0 + (v - d0) / span * (r1 - r0);
+    }
+
+    function renderCurve(curve) {
+        const xs = curve.values;
+        const x = linear(xs[0], xs[xs.length - 1], PAD.left, W - PAD.right);
+        const y = linear(0, 100, H - PAD.bottom, PAD.top);
+
+        const line = xs.map((v, i) => `${x(v).toFixed(1)},${y(curve.mean_percent[i]).toFixed(1)}`).join(' ');
+        const band = xs.map((v, i) => `${x(v).toFixed(1)},${y(curve.p90_percent[i]).toFixed(1)}`)
+            .concat(xs.slice().reverse().map((v, k) => {
+                const i = xs.length - 1 - k;
+                return `${x(v).toFixed(1)},${y(curve.p10_percent[i]).toFixed(1)}`;
+            })).join(' ');
+
+        const yTicks = [0, 50, 100].map(t => `
+            <line x1="${PAD.left}" x2="${W - PAD.right}" y1="${y(t)}" y2="${y(t)}" stroke="${COLOR.axis}" stroke-dasharray="2 3"/>
+            <text x="${PAD.left - 6}" y="${y(t) + 4}" text-anchor="end" font-size="10" fill="${COLOR.text}">${t}%</text>`).join('');
+        const xTicks = [xs[0], xs[Math.floor(xs.length / 2)], xs[xs.length - 1]].map(v => `
+            <text x="${x(v)}" y="${H - PAD.bottom + 14}" text-anchor="middle" font-size="10" fill="${COLOR.text}">${v}</text>`).join('');
+
+        // Penanda median populasi
+        const median = curve.population_quantiles && curve.population_quantiles.p50;
+        const marker = median === undefined ? '' : `
+            <line x1="${x(median)}" x2="${x(median)}" y1="${PAD.top}" y2="${H - PAD.bottom}" stroke="${COLOR.marker}" stroke-dasharray="3 3" opacity="0.7"/>
+            <text x="${x(median) + 4}" y="${PAD.top + 10}" font-size="9" fill="${COLOR.marker}">median</text>`;
+
+        return `
+            <figure class="risk-curve">
+                <figcaption>${curve.label}${curve.unit ? ` <span>(${curve.unit})</span>` : ''}</figcaption>
+                <svg viewBox="0 0 ${W} ${H}" role="img" aria-label="Kurva risiko ${curve.label}">
+                    ${yTicks}
+                    <polygon points="${band}" fill="${COLOR.band}"/>
+                    <polyline points="${line}" fill="none" stroke="${COLOR.line}" stroke-width="2.5"/>
+                    ${marker}
+                    ${xTicks}
+                    <text x="${(PAD.left + W - PAD.right) / 2}" y="${H - 6}" text-anchor="middle" font-size="10" fill="${COLOR.text}">Garis: rata-rata risiko populasi · Area: pasien p10–p90</text>
+                </svg>
+            </figure>`;
+    }
+
+    async function loadRiskCurves() {
+        const targets = document.querySelectorAll('[data-risk-curves]');
+        if (!targets.length) return;
+
+        try {
+            const res = await fetch('/api/risk-curves', { headers: { 'Accept': 'application/json' } });
+            if (!res.ok) throw new Error(`HTTP ${res.status}`);
+            const data = await res.json();
+            const html = Object.values(data.curves).map(renderCurve).join('');
+            targets.forEach(el => { el.innerHTML = html; });
+        } catch (err) {
+            console.log('Kurva risiko tidak tersedia:', err.message);
+            targets.forEach(el => { el.innerHTML = '<p class="risk-curves-empty">Kurva risiko belum tersedia.</p>'; });
+        }
+    }
+
+    document.addEventListener('DOMContentLoaded', loadRiskCurves);
+})();
@@ -0,0 +1,107 @@
+"""
+Backend/test/test_admission.py
+Unit Test untuk admission control (Backend/serving/admission.py).
+Fokus: Antrean terbatas + prioritas interactive, timeout/deadline, 503 + Retry-After saat penuh.
+"""
+
+import sys
+import importlib
+import threading
+import time
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from Backend.serving import admission
+from Backend.serving.admission import AdmissionController, AdmissionRejected
+
+
+def _acquire_in_thread(controller, priority, timeout, results):
+    def run():
+        try:
+            controller.acquire(priority, timeout)
+            results[priority] = 'admitted'
+        except AdmissionRejected as e:
+            results[priority] = e.reason
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_interactive_evicts_batch_and_gets_next_slot():
+    controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=5.0)
+    assert controller.acquire('batch') == 0.0
+
+    results = {}
+    batch = _acquire_in_thread(controller, 'batch', None, results)
+    while controller.snapshot()['queued']['batch'] == 0:
+        time.sleep(0.001)
+
+    # Antrean penuh: batch baru ditolak, interactive menggeser batch yang menunggu
+    with pytest.raises(AdmissionRejected) as e:
+        controller.acquire('batch')
+    assert e.value.reason == 'queue_full'
+    interactive = _acquire_in_thread(controller, 'interactive', None, results)
+    batch.join(timeout=2)
+    assert results['batch'] == 'evicted'
+
+    controller.release()
+    interactive.join(timeout=2)
+    snapshot = controller.snapshot()
+    print(f"\nSnapshot: {snapshot}")
+    assert results['interactive'] == 'admitted'
+    assert snapshot['in_flight'] == 1 and snapshot['queued'] == {'interactive': 0, 'batch': 0}
+    assert snapshot['shed']['batch/queue_full'] == 1 and snapshot['shed']['batch/evicted'] == 1
+
+
+def test_queue_timeout_and_deadline():
+    controller = AdmissionController(max_concurrent=1, max_queue=4, queue_timeout=0.05)
+    controller.acquire('batch')
+    start = time.perf_counter()
+    with pytest.raises(AdmissionRejected) as e:
+        controller.acquire('interactive', timeout=10)  # Tidak melebihi queue_timeout
+    assert e.value.reason == 'timeout' and time.perf_counter() - start < 1
+    with pytest.raises(AdmissionRejected) as e:
+        controller.acquire('interactive', timeout=0)
+    assert e.value.reason == 'deadline'
+
+    controller.release()
+    assert controller.snapshot()['in_flight'] == 0 and controller.acquire('batch') == 0.0
+
+
+def _register_routes_app():
+    from flask import Flask
+    from Backend.routes import register_routes
+    return register_routes(Flask(__name__))
+
+
+@pytest.mark.parametrize('factory', ['Backend.app', 'run_app', 'Backend.routes.register_routes'])
+def test_overloaded_predict_returns_503(factory, monkeypatch):
+    # run_app = entrypoint produksi (gunicorn.conf.py: run_app:create_app()); semua factory wajib memasang hook
+    if factory == 'Backend.routes.register_routes':
+        create_app = _register_routes_app
+    else:
+        create_app = importlib.import_module(factory).create_app
+    controller = AdmissionController(max_concurrent=1, max_queue=0, queue_timeout=0.05)
+    monkeypatch.setattr(admission, 'ADMISSION', controller)
+    client = create_app().test_client()
+
+    controller.acquire('batch')  # Satu-satunya slot sedang dipakai
+    response = client.post('/api/predict', json={'age': 42}, headers={'X-Priority': 'interactive'})
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1' and response.get_json()['reason'] == 'queue_full'
+
+    # Slot request dilepas setelah response (termasuk request yang gagal validasi)
+    controller.release()
+    client.post('/api/predict', data='bukan json', content_type='text/plain')
+    assert controller.snapshot()['in_flight'] == 0
+
+
+if __name__ == "__main__":
+    # Test endpoint memakai fixture pytest (monkeypatch): jalankan seluruh file lewat pytest
+    sys.exit(pytest.main([__file__, '-s', '-q']))
@@ -0,0 +1,65 @@
+"""
+Backend/test/test_binary_predict.py
+Unit Test untuk scoring biner float32 (/api/predict/binary).
+Fokus: .npy & bytes mentah dibaca tanpa salinan, probabilitas sama dengan predict_proba.
+"""
+
+import io
+import sys
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from Backend.routes import api_routes
+
+
+def test_read_feature_matrix_wraps_body_without_copy():
+    X = np.arange(28, dtype='<f4').reshape(2, 14)
+    body = X.tobytes()
+    Y, is_npy = api_routes.read_feature_matrix(body, '2,14')
+    assert not is_npy and np.array_equal(X, Y)
+    assert np.shares_memory(Y, np.frombuffer(body, dtype=np.uint8))
+
+    buffer = io.BytesIO()
+    np.save(buffer, X)
+    Y, is_npy = api_routes.read_feature_matrix(buffer.getvalue())
+    assert is_npy and np.array_equal(X, Y)
+
+    with pytest.raises(ValueError):
+        api_routes.read_feature_matrix(body, '3,14')
+    with pytest.raises(ValueError):
+        api_routes.read_feature_matrix(X.astype('<f8').tobytes(), '2,14')
+
+
+def test_binary_endpoint_matches_predict_proba():
+    from Backend.app import create_app
+    if api_routes.model is None:
+        pytest.skip("Bundle model belum dilatih")
+
+    feature_order = api_routes.DiabetesPreprocessor().feature_order
+    X = np.tile(np.array([[42, 0, 66, 110, 73, 5.88, 1.65, 70.2, 25.75, 0, 0, 0, 0, 0],
+                          [60, 1, 90, 160, 100, 15.0, 1.70, 90.0, 31.14, 1, 1, 1, 0, 0]], dtype='<f4'), (50, 1))
+    buffer = io.BytesIO()
+    np.save(buffer, X)
+
+    response = create_app().test_client().post('/api/predict/binary', data=buffer.getvalue(),
+                                               content_type='application/x-npy')
+    assert response.status_code == 200
+    proba = np.load(io.BytesIO(response.get_data()))
+    expected = api_routes.model.predict_proba(pd.DataFrame(X, columns=feature_order))[:, 1]
+    print(f"\nProbabilitas: {proba[:2]}")
+    assert proba.dtype == np.float32 and proba.shape == (100,)
+    assert np.allclose(proba, expected, atol=1e-6)
+
+
+if __name__ == "__main__":
+    test_read_feature_matrix_wraps_body_without_copy()
+    test_binary_endpoint_matches_predict_proba()
+    print("✅ BINARY PREDICT TESTS COMPLETED")
@@ -0,0 +1,64 @@
+"""
+Backend/test/test_csv_upload.py
+Unit Test untuk scoring upload CSV (/api/predict/csv).
+Fokus: Validasi per baris (kolom error), hasil sama dengan /api/predict, log ditulis per chunk.
+"""
+
+import io
+import sys
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import pandas as pd
+import pytest
+
+from Backend.config import Config
+from Backend.models.preprocess import DiabetesPreprocessor
+
+HEADER = 'age,gender,pulse_rate,systolic_bp,diastolic_bp,glucose,height,weight,bmi,family_diabetes,hypertensive,family_hypertension,cardiovascular_disease,stroke'
+VALID = '42,Female,66,110,73,5.88,1.65,70.2,25.75,0,0,0,0,0'
+
+
+def test_row_errors_flag_invalid_rows_only():
+    csv = f"{HEADER}\n{VALID}\n,Male,66,110,73,abc,1.65,70.2,,0,Maybe,0,0,0\n42,x,66,110,73,5.88,170,70.2,,Yes,No,No,No,No\n"
+    errors = DiabetesPreprocessor().row_errors(pd.read_csv(io.StringIO(csv), dtype=str))
+    print(f"\nErrors: {errors.tolist()}")
+    assert errors.tolist() == ['', 'age kosong; glucose bukan angka; hypertensive tidak dikenali', 'gender tidak dikenali']
+
+
+def test_csv_upload_streams_scored_rows(tmp_path, monkeypatch):
+    from Backend.app import create_app
+    from Backend.routes import api_routes
+    if api_routes.model is None:
+        pytest.skip("Bundle model belum dilatih")
+
+    log_path = tmp_path / 'prediction_logs.csv'
+    monkeypatch.setattr(Config, 'PREDICTION_LOG', str(log_path))
+    monkeypatch.setattr(Config, 'CSV_CHUNK_ROWS', 2)
+    client = create_app().test_client()
+
+    body = f"{HEADER}\n{VALID}\n{VALID}\n42,Male,,110,73,5.88,1.65,70.2,,0,0,0,0,0\n"
+    response = client.post('/api/predict/csv', data={'file': (io.BytesIO(body.encode()), 'clinic.csv')},
+                           content_type='multipart/form-data')
+    assert response.status_code == 200
+    scored = pd.read_csv(io.BytesIO(response.get_data()), keep_default_na=False)
+    print(f"\n{scored[['result', 'probability_percent', 'risk_level', 'error']]}")
+
+    single = client.post('/api/predict', json=dict(zip(HEADER.split(','), VALID.split(',')))).get_json()
+    assert float(scored['probability_percent'][0]) == single['probability_percent']
+    assert scored['error'].tolist() == ['', '', 'pulse_rate kosong']
+    # Baris tidak valid tidak diskor dan tidak masuk log
+    assert scored['result'][2] == ''
+    assert len(pd.read_csv(log_path)) == 3  # 2 baris upload + 1 /api/predict
+
+    missing = client.post('/api/predict/csv', data=b'age,gender\n1,Male\n', content_type='text/csv')
+    assert missing.status_code == 400
+
+
+if __name__ == "__main__":
+    # Test memakai fixture pytest (tmp_path/monkeypatch): jalankan seluruh file lewat pytest
+    sys.exit(pytest.main([__file__, '-s', '-q']))
@@ -0,0 +1,143 @@
+"""
+Backend/test/test_distill.py
+Unit Test untuk distilasi model (Backend/models/distill.py).
+Fokus: Angka fidelitas vs ensemble, fallback ke ensemble saat bundle guru berubah,
+dan model yang gagal ambang Config.DISTILL_* tidak pernah dipakai serving.
+"""
+
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import tempfile
+import joblib
+import numpy as np
+import pandas as pd
+
+from Backend.config import Config
+from Backend.models.preprocess import DiabetesPreprocessor
+from Backend.models.training import train_single_pass
+from Backend.models.distill import (
+    DistilledTreeClassifier, distill_model, fidelity_report, passes_thresholds,
+    select_serving_bundle, build_distilled_bundle
+)
+
+TEACHER_TIMESTAMP = '2026-10-19T08:00:00'
+
+
+@contextmanager
+def _config(**overrides):
+    """Mengganti atribut Config sementara (dikembalikan walau test gagal)."""
+    original = {k: getattr(Config, k) for k in overrides}
+    for k, v in overrides.items():
+        setattr(Config, k, v)
+    try:
+        yield
+    finally:
+        for k, v in original.items():
+            setattr(Config, k, v)
+
+
+def _teacher_and_data():
+    pp = DiabetesPreprocessor()
+    df = pp.clean_and_encode(pd.read_csv(Config.RAW_DATA), is_training=True)
+    X, y = pp.get_features(df), pp.get_target(df)
+    teacher, _ = train_single_pass(X, y, n_jobs=1)
+    return teacher, X
+
+
+def _fidelity(max_err=0.01, mean_err=0.001, agreement=1.0):
+    row = {'max_abs_error': max_err, 'mean_abs_error': mean_err, 'agreement_rate': agreement}
+    return {'training_rows': dict(row), 'synthetic_holdout': dict(row)}
+
+
+def _serve(distilled_bundle):
+    """select_serving_bundle untuk bundle guru TEACHER_TIMESTAMP dengan bundle distilasi tertentu."""
+    teacher_bundle = {'model': 'ensemble', 'timestamp': TEACHER_TIMESTAMP}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / 'distilled_tree_bundle.pkl')
+        joblib.dump(distilled_bundle, path)
+        with _config(USE_DISTILLED_MODEL=True, DISTILLED_MODEL_PATH=path):
+            return select_serving_bundle(teacher_bundle)
+
+
+def test_fidelity_numbers_match_ensemble():
+    print("\n[1] Laporan fidelitas vs probabilitas ensemble")
+    teacher, X = _teacher_and_data()
+    feature_names = list(X.columns)
+    student, report = distill_model(teacher, X, feature_names, n_samples=5000, refine_rounds=1)
+    assert isinstance(student, DistilledTreeClassifier)
+
+    p_teacher = teacher.predict_proba(X)[:, 1]
+    p_student = student.predict_proba(X)[:, 1]
+    err = np.abs(p_teacher - p_student)
+    real = report['training_rows']
+    print(f"   Error maks: {real['max_abs_error']} | rata-rata: {real['mean_abs_error']} "
+          f"| agreement: {real['agreement_rate']}")
+
+    assert real['n_samples'] == len(X)
+    assert real['max_abs_error'] == round(float(err.max()), 6)
+    assert real['mean_abs_error'] == round(float(err.mean()), 6)
+    assert real['agreement_rate'] == round(float(np.mean((p_teacher >= 0.5) == (p_student >= 0.5))), 6)
+    assert report['synthetic_holdout']['n_samples'] == 2500
+
+    # Laporan dihitung ulang langsung dari fidelity_report -> angka sama
+    assert fidelity_report(teacher, student, X.to_numpy(dtype=np.float32), feature_names) == real
+
+
+def test_stale_teacher_timestamp_falls_back_to_ensemble():
+    print("\n[2] Bundle distilasi dari guru lama -> ensemble")
+    fresh = {'model': 'distilled', 'teacher_timestamp': TEACHER_TIMESTAMP, 'fidelity': _fidelity()}
+    stale = {**fresh, 'teacher_timestamp': '2026-01-01T00:00:00'}
+
+    assert _serve(fresh)['model'] == 'distilled'
+    assert _serve(stale)['model'] == 'ensemble'
+    assert _serve({**fresh, 'teacher_timestamp': None})['model'] == 'ensemble'
+
+
+def test_bundle_failing_thresholds_is_never_served():
+    print("\n[3] Bundle yang gagal ambang Config.DISTILL_* tidak dipakai serving")
+    failing = {
+        'max_abs_error': _fidelity(max_err=Config.DISTILL_MAX_PROBA_ERROR + 0.01),
+        'mean_abs_error': _fidelity(mean_err=Config.DISTILL_MEAN_PROBA_ERROR + 0.001),
+        'agreement_rate': _fidelity(agreement=Config.DISTILL_MIN_AGREEMENT - 0.001),
+        'laporan_kosong': {},
+    }
+    for reason, fidelity in failing.items():
+        bundle = {'model': 'distilled', 'teacher_timestamp': TEACHER_TIMESTAMP, 'fidelity': fidelity}
+        print(f"   Gagal karena {reason}")
+        assert not passes_thresholds(fidelity)
+        assert _serve(bundle)['model'] == 'ensemble'
+
+    # Tepat di ambang masih lolos; tanpa opt-in USE_DISTILLED_MODEL tetap ensemble
+    edge = _fidelity(Config.DISTILL_MAX_PROBA_ERROR, Config.DISTILL_MEAN_PROBA_ERROR, Config.DISTILL_MIN_AGREEMENT)
+    assert passes_thresholds(edge)
+    with _config(USE_DISTILLED_MODEL=False):
+        assert select_serving_bundle({'model': 'ensemble', 'timestamp': TEACHER_TIMESTAMP})['model'] == 'ensemble'
+
+
+def test_real_distilled_bundle_round_trip():
+    print("\n[4] Bundle distilasi asli: teacher_timestamp & fidelitas ikut tersimpan")
+    teacher, X = _teacher_and_data()
+    student, report = distill_model(teacher, X, list(X.columns), n_samples=5000, refine_rounds=1)
+    bundle = build_distilled_bundle(student, report, {'timestamp': TEACHER_TIMESTAMP})
+
+    served = _serve(bundle)
+    print(f"   Lolos ambang: {passes_thresholds(report)} | Dipakai: {type(served['model']).__name__}")
+    assert isinstance(served['model'], DistilledTreeClassifier) == passes_thresholds(report)
+    if passes_thresholds(report):
+        assert served['teacher_timestamp'] == TEACHER_TIMESTAMP
+        np.testing.assert_allclose(served['model'].predict_proba(X), student.predict_proba(X))
+
+
+if __name__ == "__main__":
+    test_fidelity_numbers_match_ensemble()
+    test_stale_teacher_timestamp_falls_back_to_ensemble()
+    test_bundle_failing_thresholds_is_never_served()
+    test_real_distilled_bundle_round_trip()
+    print("✅ DISTILLATION TESTS COMPLETED")
@@ -0,0 +1,70 @@
+"""
+Backend/test/test_explain.py
+Unit Test untuk penjelasan jalur keputusan (Backend/models/explain.py).
+Fokus: base value + kontribusi == predict_proba (ensemble terkalibrasi), fallback importance untuk Pipeline.
+"""
+
+import sys
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+from Backend.config import Config
+from Backend.models.preprocess import DiabetesPreprocessor
+from Backend.models.explain import PathExplainer
+
+
+def _training_data():
+    pp = DiabetesPreprocessor()
+    df = pp.clean_and_encode(pd.read_csv(Config.RAW_DATA), is_training=True)
+    return pp.get_features(df), df['diabetic'], pp.feature_order
+
+
+def test_contributions_sum_to_calibrated_probability():
+    X, y, features = _training_data()
+    pipeline = Pipeline([('scaler', StandardScaler()), ('dt', DecisionTreeClassifier(max_depth=6, random_state=42))])
+
+    for method in ('sigmoid', 'isotonic'):
+        model = CalibratedClassifierCV(pipeline, method=method, cv=5).fit(X, y)
+        explainer = PathExplainer.from_model(model, features)
+        assert explainer is not None and len(explainer.members) == 5
+
+        base, contributions = explainer.explain(X)
+        proba = model.predict_proba(X)[:, 1]
+        error = np.abs(base + contributions.sum(axis=1) - proba).max()
+        print(f"\n{method}: base={base:.4f}, error maks={error:.2e}")
+        assert error < 1e-9
+
+    # Fitur yang tidak pernah dipakai split tidak boleh mendapat kontribusi
+    used = {f for clf in model.calibrated_classifiers_ for f in clf.estimator[-1].tree_.feature if f >= 0}
+    unused = [i for i in range(len(features)) if i not in used]
+    assert np.all(contributions[:, unused] == 0)
+
+
+def test_global_importance_handles_pipeline_members():
+    from Backend.routes.api_routes import extract_feature_importance
+
+    X, y, features = _training_data()
+    pipeline = Pipeline([('scaler', StandardScaler()), ('dt', DecisionTreeClassifier(max_depth=4, random_state=0))])
+    model = CalibratedClassifierCV(pipeline, method='sigmoid', cv=3).fit(X, y)
+
+    top = extract_feature_importance(model, features)
+    print(f"\nTop importance: {top}")
+    assert len(top) > 0
+    assert top == sorted(top, key=lambda f: f['value'], reverse=True)
+
+
+if __name__ == "__main__":
+    test_contributions_sum_to_calibrated_probability()
+    test_global_importance_handles_pipeline_members()
+    print("✅ EXPLAIN TESTS COMPLETED")
@@ -0,0 +1,71 @@
+"""
+Backend/test/test_http_cache.py
+Unit Test untuk response read-only ber-ETag (/api/model-info, /api/logs; Backend/serving/http_cache.py).
+Fokus: 304 untuk If-None-Match tanpa membaca CSV log, ETag berubah saat log bertambah, gzip identik.
+"""
+
+import gzip
+import json
+import sys
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import pandas as pd
+import pytest
+
+from Backend.config import Config
+from Backend.routes import api_routes
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    from Backend.app import create_app
+    log_path = tmp_path / 'prediction_logs.csv'
+    monkeypatch.setattr(Config, 'PREDICTION_LOG', str(log_path))
+    monkeypatch.setattr(api_routes, '_logs_json', None)
+    return create_app().test_client(), log_path
+
+
+def test_model_info_etag_and_304(client):
+    client, _ = client
+    first = client.get('/api/model-info')
+    assert first.status_code == 200 and json.loads(first.get_data()) == api_routes.model_meta
+    cached = client.get('/api/model-info', headers={'If-None-Match': first.headers['ETag']})
+    assert cached.status_code == 304 and cached.get_data() == b''
+    assert cached.headers['ETag'] == first.headers['ETag']
+
+
+def test_logs_revalidate_without_reading_csv(client, monkeypatch):
+    client, log_path = client
+    rows = [{'timestamp': f'2026-10-19 08:{i:02d}:00', 'result': 'Diabetic', 'confidence': '88.5%', 'age': 40 + i}
+            for i in range(60)]
+    api_routes.append_prediction_log(rows)
+
+    first = client.get('/api/logs', headers={'Accept-Encoding': 'gzip'})
+    assert first.status_code == 200 and first.headers['Content-Encoding'] == 'gzip'
+    logs = json.loads(gzip.decompress(first.get_data()))['logs']
+    print(f"\nETag: {first.headers['ETag']} | {len(first.get_data())} bytes gzip")
+    assert len(logs) == 60 and logs[0]['age'] == 99  # Terbaru di atas
+
+    # Worker lain (cache kosong) tetap menjawab 304 hanya dari metadata file
+    monkeypatch.setattr(api_routes, '_logs_json', None)
+    monkeypatch.setattr(api_routes.pd, 'read_csv', lambda *a, **k: pytest.fail("CSV tidak boleh dibaca"))
+    cached = client.get('/api/logs', headers={'If-None-Match': first.headers['ETag']})
+    assert cached.status_code == 304
+    monkeypatch.undo()
+
+    monkeypatch.setattr(Config, 'PREDICTION_LOG', str(log_path))
+    api_routes.append_prediction_log([{**rows[0], 'age': 18}])
+    changed = client.get('/api/logs', headers={'If-None-Match': first.headers['ETag']})
+    assert changed.status_code == 200 and changed.headers['ETag'] != first.headers['ETag']
+    assert changed.get_json()['logs'][0]['age'] == 18 and 'Content-Encoding' not in changed.headers
+    assert len(pd.read_csv(log_path)) == 61
+
+
+if __name__ == "__main__":
+    # Test memakai fixture pytest (tmp_path/monkeypatch): jalankan seluruh file lewat pytest
+    sys.exit(pytest.main([__file__, '-s', '-q']))
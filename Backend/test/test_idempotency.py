@@ -0,0 +1,101 @@
+"""
+Backend/test/test_idempotency.py
+Unit Test untuk Idempotency-Key & coalescing request identik (Backend/serving/idempotency.py).
+Fokus: Retry dengan key sama di-replay tanpa log ganda, request bersamaan berbagi satu komputasi
+(namun tetap satu baris log per request).
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import pandas as pd
+import pytest
+
+from Backend.config import Config
+from Backend.serving.idempotency import InFlightStore, IdempotencyConflict, IDEMPOTENCY_RESULTS
+
+PATIENT = {'age': 42, 'gender': 'Female', 'pulse_rate': 66, 'systolic_bp': 110, 'diastolic_bp': 73,
+           'glucose': 5.88, 'height': 1.65, 'weight': 70.2, 'bmi': 25.75, 'family_diabetes': 0,
+           'hypertensive': 0, 'family_hypertension': 0, 'cardiovascular_disease': 0, 'stroke': 0}
+
+
+def test_store_ttl_and_conflict():
+    now = [0.0]
+    store = InFlightStore(ttl=10, clock=lambda: now[0])
+    future, owner = store.claim('k', 'payload-a')
+    assert owner and store.claim('k', 'payload-a') == (future, False)
+    with pytest.raises(IdempotencyConflict):
+        store.claim('k', 'payload-b')
+
+    store.complete('k', future, 'hasil')
+    now[0] = 9.0
+    replay, owner = store.claim('k', 'payload-a')
+    assert not owner and replay.result() == 'hasil'
+    now[0] = 11.0  # Kedaluwarsa: key boleh dipakai lagi
+    assert store.claim('k', 'payload-b')[1] and len(store) == 1
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    from Backend.app import create_app
+    from Backend.routes import api_routes
+    if api_routes.model is None:
+        pytest.skip("Bundle model belum dilatih")
+    log_path = tmp_path / 'prediction_logs.csv'
+    monkeypatch.setattr(Config, 'PREDICTION_LOG', str(log_path))
+    IDEMPOTENCY_RESULTS.clear()
+    yield create_app().test_client(), log_path
+    IDEMPOTENCY_RESULTS.clear()
+
+
+def test_retry_with_same_key_is_replayed(client):
+    client, log_path = client
+    headers = {'Idempotency-Key': 'form-123'}
+    first = client.post('/api/predict', json=PATIENT, headers=headers)
+    retry = client.post('/api/predict', json=PATIENT, headers=headers)
+    print(f"\nReplay header: {retry.headers.get('Idempotent-Replayed')}")
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.headers['Idempotent-Replayed'] == 'true' and 'Idempotent-Replayed' not in first.headers
+    assert retry.get_data() == first.get_data()
+    assert len(pd.read_csv(log_path)) == 1
+
+    other = client.post('/api/predict', json={**PATIENT, 'age': 60}, headers=headers)
+    assert other.status_code == 422
+
+
+def test_concurrent_identical_requests_share_one_computation(client, monkeypatch):
+    from Backend.routes import api_routes
+    client, log_path = client
+    calls, original = [], api_routes.score_patient
+
+    def slow_score(*args):
+        calls.append(1)
+        time.sleep(0.2)  # Request kedua datang saat komputasi pertama masih berjalan
+        return original(*args)
+    monkeypatch.setattr(api_routes, 'score_patient', slow_score)
+
+    responses = []
+    threads = [threading.Thread(target=lambda: responses.append(client.post('/api/predict', json=PATIENT)))
+               for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    assert len({r.get_json()['probability_percent'] for r in responses}) == 1
+    # Satu komputasi model, tetapi tiap request terpisah tetap tercatat di log
+    assert len(calls) == 1 and len(pd.read_csv(log_path)) == 3
+
+
+if __name__ == "__main__":
+    # Test memakai fixture pytest (tmp_path/monkeypatch): jalankan seluruh file lewat pytest
+    sys.exit(pytest.main([__file__, '-s', '-q']))
@@ -0,0 +1,189 @@
+"""
+Backend/test/test_metrics.py
+Unit Test untuk observability (Backend/monitoring/).
+Fokus: Format teks Prometheus, penggabungan snapshot antar worker, buffer request lambat.
+"""
+
+import sys
+import subprocess
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Backend.monitoring.metrics import MetricsRegistry, merge_snapshots, render_text
+from Backend.monitoring.slow_requests import SlowRequestBuffer
+
+
+def test_histogram_text_format():
+    registry = MetricsRegistry()
+    latency = registry.histogram('latency_seconds', 'Latensi', ('route',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.labels(route='/api/predict').observe(value)
+
+    text = render_text(merge_snapshots([registry.snapshot()]))
+    print("\n" + text)
+    assert '# TYPE latency_seconds histogram' in text
+    # Bucket kumulatif, batas atas inklusif (le)
+    assert 'latency_seconds_bucket{route="/api/predict",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{route="/api/predict",le="1"} 3' in text
+    assert 'latency_seconds_bucket{route="/api/predict",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{route="/api/predict"} 4' in text
+
+
+def test_merge_across_workers():
+    # PID proses yang sudah selesai = worker gunicorn yang sudah mati
+    dead = subprocess.Popen([sys.executable, '-c', 'pass'])
+    dead.wait()
+
+    snapshots = []
+    for pid, count in ((dead.pid, 3), (None, 4)):
+        registry = MetricsRegistry()
+        registry.counter('requests_total', 'Request', ('status',)).labels(200).inc(count)
+        registry.gauge('queue_depth', 'Antrean').set(count)
+        snap = registry.snapshot()
+        if pid is not None:
+            snap['pid'] = pid
+        snapshots.append(snap)
+
+    merged = merge_snapshots(snapshots)
+    print(f"\nMerged: {merged['requests_total']['samples']} | {merged['queue_depth']['samples']}")
+    # Counter dijumlahkan (termasuk worker mati), gauge hanya dari worker yang hidup
+    assert merged['requests_total']['samples'][('200',)] == 7
+    assert merged['queue_depth']['samples'][()] == 4
+
+
+def test_slow_request_buffer_keeps_slowest_in_window():
+    now = [0.0]
+    buffer = SlowRequestBuffer(capacity=3, window_seconds=60, clock=lambda: now[0])
+
+    for i, duration in enumerate([5, 50, 1, 30, 10, 40]):
+        buffer.offer(duration, {'id': i})
+    slowest = [e['id'] for e in buffer.snapshot()]
+    print(f"\nTop-3 (id): {slowest}")
+    assert slowest == [1, 5, 3]
+    # Request cepat ditolak tanpa membangun entri
+    assert not buffer.would_accept(2)
+
+    # Setelah jendela lewat, entri lama dibuang dan request cepat kembali diterima
+    now[0] = 61.0
+    buffer.offer(2, {'id': 'baru'})
+    assert [e['id'] for e in buffer.snapshot()] == ['baru']
+
+
+def test_deep_sizeof_counts_shared_and_view_buffers_once():
+    import numpy as np
+    from Backend.monitoring.memory import deep_sizeof
+
+    array = np.zeros(10_000)
+    shared = {'a': array, 'b': array, 'view': array[:10]}
+    size = deep_sizeof(shared)
+    print(f"\nDeep size: {size:,} B (buffer {array.nbytes:,} B)")
+    # Buffer 80 KB dihitung sekali walau dirujuk dua kali dan lewat view
+    assert array.nbytes <= size < 2 * array.nbytes
+
+
+def test_predict_stage_marks_follow_pipeline_order(tmp_path, monkeypatch):
+    import pytest
+    from Backend.config import Config
+    from Backend.app import create_app
+    from Backend.routes import api_routes
+    if api_routes.model is None:
+        pytest.skip("Bundle model belum dilatih")
+    monkeypatch.setattr(Config, 'PREDICTION_LOG', str(tmp_path / 'prediction_logs.csv'))
+
+    patient = {'age': 42, 'gender': 'Female', 'pulse_rate': 66, 'systolic_bp': 110, 'diastolic_bp': 73,
+               'glucose': 5.88, 'height': 1.65, 'weight': 70.2, 'bmi': 25.75}
+    response = create_app().test_client().post('/api/predict', json=patient)
+    stages = [part.split(';')[0] for part in response.headers['Server-Timing'].split(', ')]
+    print(f"\nServer-Timing: {stages}")
+    # 'validate' ditandai setelah cek jangkauan klinis, pemilihan kolom fitur terpisah ('features')
+    assert response.status_code == 200
+    assert stages[stages.index('parse'):stages.index('score') + 1] == ['parse', 'encode', 'validate', 'features', 'score']
+
+
+
+def test_stage_histogram_only_counts_predict_endpoint(tmp_path, monkeypatch):
+    import pytest
+    from Backend.config import Config
+    from Backend.app import create_app
+    from Backend.monitoring.metrics import PREDICT_STAGE_SECONDS
+    from Backend.routes import api_routes
+    if api_routes.model is None:
+        pytest.skip("Bundle model belum dilatih")
+    monkeypatch.setattr(Config, 'PREDICTION_LOG', str(tmp_path / 'prediction_logs.csv'))
+
+    from Backend.serving import admission
+    # Setiap request dianggap sempat antre -> admission menandai tahap 'queue' di semua endpoint
+    controller = admission.AdmissionController(max_concurrent=4, max_queue=4, queue_timeout=1.0)
+    acquire = controller.acquire
+    monkeypatch.setattr(controller, 'acquire', lambda *args: acquire(*args) or 0.001)
+    monkeypatch.setattr(admission, 'ADMISSION', controller)
+
+    def stage_counts():
+        return [sum(PREDICT_STAGE_SECONDS.labels(stage).snapshot()['counts']) for stage in ('queue', 'serialize')]
+
+    client = create_app().test_client()
+    before = stage_counts()
+    import pandas as pd
+    csv_body = pd.read_csv(Config.RAW_DATA).head(3).drop(columns=['diabetic']).to_csv(index=False)
+    csv_response = client.post('/api/predict/csv', data=csv_body, content_type='text/csv')
+    csv_response.get_data()
+    # Endpoint lain tetap mendapat Server-Timing, tetapi tidak masuk histogram tahap /api/predict
+    assert csv_response.status_code == 200 and 'queue' in csv_response.headers['Server-Timing']
+    assert stage_counts() == before
+
+    client.post('/api/predict', json={'age': 42, 'gender': 'Female', 'glucose': 5.88, 'bmi': 25.75})
+    assert stage_counts() == [before[0] + 1, before[1] + 1]
+
+
+
+def test_slow_request_endpoint_requires_admin(monkeypatch):
+    from Backend.config import Config
+    from Backend.app import create_app
+    from Backend.monitoring import SLOW_REQUESTS
+    client = create_app().test_client()
+    SLOW_REQUESTS.offer(10_000, {'path': '/api/predict'})
+
+    # Tanpa ADMIN_TOKEN / token salah: ditolak, buffer tidak tersentuh (GET tidak bisa lagi mengosongkan)
+    monkeypatch.setattr(Config, 'ADMIN_TOKEN', '')
+    assert client.get('/api/debug/slow').status_code == 403
+    monkeypatch.setattr(Config, 'ADMIN_TOKEN', 'rahasia')
+    assert client.get('/api/debug/slow?clear=1', headers={'X-Admin-Token': 'salah'}).status_code == 403
+    assert client.delete('/api/debug/slow').status_code == 403
+
+    admin = {'X-Admin-Token': 'rahasia'}
+    response = client.get('/api/debug/slow?clear=1', headers=admin)
+    assert response.status_code == 200 and response.get_json()['requests']
+    assert SLOW_REQUESTS.snapshot()
+    assert client.delete('/api/debug/slow', headers=admin).status_code == 200
+    assert SLOW_REQUESTS.snapshot() == []
+
+
+
+def test_memory_report_lists_serving_caches():
+    from Backend.monitoring.memory import build_report, deep_sizeof
+    from Backend.routes import api_routes
+    from Backend.serving.idempotency import IDEMPOTENCY_RESULTS
+
+    before = build_report(api_routes)['caches']
+    IDEMPOTENCY_RESULTS.claim('laporan-memori', 'x' * 10_000)
+    try:
+        caches = build_report(api_routes)['caches']
+    finally:
+        IDEMPOTENCY_RESULTS.clear()
+    print(f"\nCaches: {caches}")
+
+    assert {'idempotency_results', 'inflight_predictions', 'model_info_json', 'logs_json',
+            'risk_curves_json', 'explainer_tables', 'similar_index'} <= set(caches)
+    assert caches['idempotency_results'] - before['idempotency_results'] >= 10_000
+    if api_routes.explainer is not None:
+        assert 0 < caches['explainer_tables'] <= deep_sizeof(api_routes.explainer)
+
+
+if __name__ == "__main__":
+    import pytest
+    # Test memakai fixture pytest (tmp_path/monkeypatch): jalankan seluruh file lewat pytest
+    sys.exit(pytest.main([__file__, '-s', '-q']))
@@ -0,0 +1,90 @@
+"""
+Backend/test/test_profiler.py
+Unit Test untuk profiler on-demand (Backend/monitoring/profiler.py, /api/debug/profile).
+Fokus: File .collapsed/.prof/.txt di LOGS_DIR, sesi berhenti sendiri setelah N request / T detik,
+dan endpoint ditolak tanpa ADMIN_TOKEN.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from Backend.config import Config
+from Backend.monitoring import profiler
+
+ADMIN = {'X-Admin-Token': 'rahasia'}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    from Backend.app import create_app
+    monkeypatch.setattr(Config, 'LOGS_DIR', str(tmp_path))
+    monkeypatch.setattr(Config, 'ADMIN_TOKEN', 'rahasia')
+    yield create_app().test_client(), tmp_path
+    profiler.stop_session()  # Jangan tinggalkan sesi aktif untuk test lain
+
+
+def _suffixes(result):
+    return sorted(os.path.splitext(path)[1] for path in result['files'])
+
+
+@pytest.mark.parametrize('mode, expected', [('sample', ['.collapsed', '.txt']), ('cprofile', ['.prof', '.txt'])])
+def test_session_stops_after_n_requests(client, mode, expected):
+    client, logs_dir = client
+    response = client.post('/api/debug/profile', json={'mode': mode, 'requests': 3, 'interval_ms': 1}, headers=ADMIN)
+    assert response.status_code == 202 and profiler.active_session() is not None
+
+    for _ in range(3):
+        assert client.get('/api/model-info').status_code == 200
+    result = profiler.last_result
+    print(f"\n[{mode}] {result}")
+
+    # Request POST yang memulai sesi tidak ikut dihitung; sesi berhenti tepat setelah request ke-3
+    assert profiler.active_session() is None
+    assert result['mode'] == mode and result['requests_profiled'] == 3
+    assert _suffixes(result) == expected
+    assert all(Path(path).parent == logs_dir for path in result['files'])
+    assert os.path.getsize(result['files'][-1]) > 0  # Ringkasan .txt
+    assert sorted(p.suffix for p in logs_dir.glob('profile_*')) == expected
+
+    status = client.get('/api/debug/profile', headers=ADMIN).get_json()
+    assert status['active'] is None and status['last_result'] == result
+
+
+@pytest.mark.parametrize('mode', ['sample', 'cprofile'])
+def test_session_stops_after_t_seconds_without_requests(client, mode):
+    _, logs_dir = client
+    session = profiler.start_session(mode=mode, max_seconds=0.2, interval_ms=10)
+    deadline = time.monotonic() + 5
+    while profiler.active_session() is session and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    assert profiler.active_session() is None
+    assert profiler.last_result['requests_profiled'] == 0
+    assert (logs_dir / os.path.basename(profiler.last_result['files'][-1])).exists()
+
+
+def test_profile_endpoint_refused_without_admin_token(client, monkeypatch):
+    client, logs_dir = client
+    assert client.post('/api/debug/profile', json={'requests': 1}, headers={'X-Admin-Token': 'salah'}).status_code == 403
+    assert client.post('/api/debug/profile', json={'requests': 1}).status_code == 403
+
+    monkeypatch.setattr(Config, 'ADMIN_TOKEN', '')
+    response = client.post('/api/debug/profile', json={'requests': 1}, headers=ADMIN)
+    assert response.status_code == 403 and 'ADMIN_TOKEN' in response.get_json()['error']
+    assert client.get('/api/debug/profile', headers=ADMIN).status_code == 403
+
+    assert profiler.active_session() is None and list(logs_dir.glob('profile_*')) == []
+
+
+if __name__ == "__main__":
+    # Test memakai fixture pytest (tmp_path/monkeypatch): jalankan seluruh file lewat pytest
+    sys.exit(pytest.main([__file__, '-s', '-q']))
@@ -0,0 +1,73 @@
+"""
+Backend/test/test_replay.py
+Unit Test untuk replay log prediksi (Scripts/replay_predictions.py).
+Fokus: Blok log dipotong di batas baris, model identik = nol flip, agregat cocok dengan skor langsung.
+"""
+
+import sys
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.tree import DecisionTreeClassifier
+
+from Backend.config import Config
+from Backend.models.preprocess import DiabetesPreprocessor
+from Backend.models.utils import risk_level, risk_level_codes
+from Scripts.replay_predictions import run_replay
+
+
+def _fit_bundle(path, max_depth):
+    pp = DiabetesPreprocessor()
+    df = pp.clean_and_encode(pd.read_csv(Config.RAW_DATA), is_training=True)
+    model = DecisionTreeClassifier(max_depth=max_depth, random_state=0).fit(pp.get_features(df), df['diabetic'])
+    joblib.dump({'model': model, 'timestamp': f'depth-{max_depth}'}, path)
+    return model
+
+
+def test_risk_level_scalar_and_vector_agree():
+    probabilities = np.array([0.0, 0.39, 0.4, 0.69, 0.7, 1.0])
+    assert [risk_level(p) for p in probabilities] == ['Rendah', 'Rendah', 'Sedang', 'Sedang', 'Tinggi', 'Tinggi']
+    assert list(risk_level_codes(probabilities)) == [0, 0, 1, 1, 2, 2]
+
+
+def test_replay_matches_direct_scoring(tmp_path):
+    current_path, candidate_path = tmp_path / 'current.pkl', tmp_path / 'candidate.pkl'
+    _fit_bundle(current_path, max_depth=6)
+    candidate = _fit_bundle(candidate_path, max_depth=2)
+
+    raw = pd.read_csv(Config.RAW_DATA, nrows=1000).drop(columns=['diabetic'])
+    raw.insert(0, 'result', 'Non-Diabetic')
+    log_path = tmp_path / 'prediction_logs.csv'
+    raw.to_csv(log_path, index=False)
+
+    # Blok ~1 KB: log terpecah ke banyak blok, tidak boleh ada baris yang hilang/terpotong
+    same = run_replay([str(log_path)], str(current_path), str(current_path), workers=1,
+                      block_mb=0.001, latency_samples=0)
+    print(f"\nModel identik: {same['rows']} baris, flip={same['label_flips']['total']}")
+    assert same['rows'] == 1000
+    assert same['label_flips']['total'] == 0
+    assert same['probability_shift']['max_abs'] == 0.0
+    migration = same['risk_migration']
+    assert sum(migration[a][b] for a in migration for b in migration if a != b) == 0
+
+    report = run_replay([str(log_path)], str(candidate_path), str(current_path), workers=1, latency_samples=0)
+    pp = DiabetesPreprocessor()
+    X = pp.get_features(pp.clean_and_encode(raw))
+    current = joblib.load(current_path)['model']
+    expected_flips = int(((current.predict_proba(X)[:, 1] >= 0.5) != (candidate.predict_proba(X)[:, 1] >= 0.5)).sum())
+    print(f"Kandidat: flip={report['label_flips']['total']} (langsung: {expected_flips})")
+    assert report['label_flips']['total'] == expected_flips
+    assert report['logged_agreement']['rows'] == 1000
+
+
+if __name__ == "__main__":
+    import pytest
+    # Test memakai fixture pytest (tmp_path/monkeypatch): jalankan seluruh file lewat pytest
+    sys.exit(pytest.main([__file__, '-s', '-q']))
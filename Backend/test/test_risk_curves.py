@@ -0,0 +1,56 @@
+"""
+Backend/test/test_risk_curves.py
+Unit Test untuk kurva risiko populasi (Backend/models/risk_curves.py).
+Fokus: Partial dependence sama dengan perhitungan manual, serving hanya memuat file untuk versi yang sama.
+"""
+
+import os
+import sys
+import json
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import pandas as pd
+from sklearn.tree import DecisionTreeClassifier
+
+from Backend.config import Config
+from Backend.models.preprocess import DiabetesPreprocessor
+from Backend.models import risk_curves
+
+
+def test_partial_dependence_matches_manual_average(tmp_path):
+    pp = DiabetesPreprocessor()
+    df = pp.clean_and_encode(pd.read_csv(Config.RAW_DATA), is_training=True)
+    model = DecisionTreeClassifier(max_depth=5, random_state=0).fit(pp.get_features(df), df['diabetic'])
+    X_bg = risk_curves.background_sample(300)
+
+    curves = risk_curves.compute_risk_curves(model, X_bg, pp.feature_order, features=['glucose'], n_points=10)
+    curve = curves['glucose']
+    print(f"\nGlukosa: {list(zip(curve['values'], curve['mean_percent']))}")
+
+    g = pp.feature_order.index('glucose')
+    for value, mean in zip(curve['values'][:3], curve['mean_percent'][:3]):
+        X = X_bg.copy()
+        X[:, g] = value
+        manual = model.predict_proba(pd.DataFrame(X, columns=pp.feature_order))[:, 1].mean() * 100
+        assert abs(manual - mean) < 0.01
+    assert all(lo <= hi for lo, hi in zip(curve['p10_percent'], curve['p90_percent']))
+
+    # Serving hanya membaca file: versi sama -> payload, file hilang / versi lain -> None (tanpa menulis)
+    path = str(tmp_path / 'curves.json')
+    assert risk_curves.load_risk_curves('v1', path) is None and not os.path.exists(path)
+    payload = risk_curves.build_risk_curves(model, 'v1', X_bg)
+    risk_curves.save_risk_curves(payload, path)
+    assert risk_curves.load_risk_curves('v1', path) == json.loads(json.dumps(payload))
+    mtime = os.path.getmtime(path)
+    assert risk_curves.load_risk_curves('v2', path) is None and os.path.getmtime(path) == mtime
+
+
+if __name__ == "__main__":
+    import pytest
+    # Test memakai fixture pytest (tmp_path/monkeypatch): jalankan seluruh file lewat pytest
+    sys.exit(pytest.main([__file__, '-s', '-q']))
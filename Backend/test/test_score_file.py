@@ -0,0 +1,82 @@
+"""
+Backend/test/test_score_file.py
+Unit Test untuk scoring file offline (Scripts/score_file.py).
+Fokus: Hasil sesuai urutan input & sama dengan skor langsung, resume setelah terhenti identik.
+"""
+
+import sys
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.tree import DecisionTreeClassifier
+
+from Backend.config import Config
+from Backend.models.preprocess import DiabetesPreprocessor
+import Scripts.score_file as score_file
+
+
+@pytest.fixture
+def bundle_and_input(tmp_path):
+    pp = DiabetesPreprocessor()
+    df = pp.clean_and_encode(pd.read_csv(Config.RAW_DATA), is_training=True)
+    model = DecisionTreeClassifier(max_depth=4, random_state=0).fit(pp.get_features(df), df['diabetic'])
+    model_path = tmp_path / 'bundle.pkl'
+    joblib.dump({'model': model, 'timestamp': 'test'}, model_path)
+
+    raw = pd.read_csv(Config.RAW_DATA).head(450)
+    input_path = tmp_path / 'patients.csv'
+    raw.to_csv(input_path, index=False)
+    return model, str(model_path), str(input_path), raw
+
+
+def test_scores_in_input_order(bundle_and_input, tmp_path):
+    model, model_path, input_path, raw = bundle_and_input
+    output = str(tmp_path / 'scored.csv')
+    result = score_file.score_file(input_path, output, model_path=model_path, workers=1, chunk_rows=100)
+
+    scored = pd.read_csv(output, keep_default_na=False)
+    pp = DiabetesPreprocessor()
+    expected = model.predict_proba(pp.get_features(pp.clean_and_encode(raw)))[:, 1]
+    print(f"\nHasil: {result['rows']} baris, {result['rows_per_sec']} baris/detik")
+    assert result['rows'] == len(raw) == len(scored)
+    assert list(scored['age'].astype(str)) == list(raw['age'].astype(str))
+    assert np.allclose(scored['probability_percent'], np.round(expected * 100, 2))
+
+
+def test_resume_after_interrupt_is_identical(bundle_and_input, tmp_path, monkeypatch):
+    _, model_path, input_path, _ = bundle_and_input
+    clean = str(tmp_path / 'clean.csv')
+    score_file.score_file(input_path, clean, model_path=model_path, workers=1, chunk_rows=100)
+
+    # Terhenti saat chunk ke-3
+    original, calls = score_file.score_chunk, []
+    def interrupted(*args):
+        calls.append(1)
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        return original(*args)
+    monkeypatch.setattr(score_file, 'score_chunk', interrupted)
+
+    resumed = str(tmp_path / 'resumed.csv')
+    with pytest.raises(KeyboardInterrupt):
+        score_file.score_file(input_path, resumed, model_path=model_path, workers=1, chunk_rows=100)
+    assert Path(score_file.checkpoint_path(resumed)).exists()
+
+    monkeypatch.setattr(score_file, 'score_chunk', original)
+    result = score_file.score_file(input_path, resumed, model_path=model_path, workers=1, chunk_rows=100)
+    assert result['rows'] == 450
+    assert Path(resumed).read_bytes() == Path(clean).read_bytes()
+    assert not Path(score_file.checkpoint_path(resumed)).exists()
+
+
+if __name__ == "__main__":
+    # Test memakai fixture pytest (tmp_path/monkeypatch): jalankan seluruh file lewat pytest
+    sys.exit(pytest.main([__file__, '-s', '-q']))
@@ -0,0 +1,73 @@
+"""
+Backend/test/test_screening.py
+Unit Test untuk seleksi kohort top-K (Backend/models/screening.py & score_file.py --top-k).
+Fokus: Hasil per chunk + heap sama dengan sort penuh (seri: urutan input), ringkasan per tingkat risiko.
+"""
+
+import sys
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.tree import DecisionTreeClassifier
+
+from Backend.config import Config
+from Backend.models.preprocess import DiabetesPreprocessor
+from Backend.models.screening import TopKSelector, chunk_top_k, risk_level_counts
+from Backend.models.utils import risk_level_codes
+import Scripts.score_file as score_file
+
+
+def test_chunked_selection_matches_full_sort():
+    rng = np.random.default_rng(0)
+    # Banyak seri (probabilitas decision tree hanya sedikit nilai unik) + baris tidak valid
+    proba = rng.choice([0.05, 0.4, 0.75, 0.9, 1.0], size=5000)
+    proba[rng.choice(5000, 200, replace=False)] = np.nan
+    k = 37
+
+    selector = TopKSelector(k)
+    chunks = list(range(0, len(proba), 300))
+    for start in reversed(chunks):  # urutan selesai chunk tidak menentukan hasil
+        block = proba[start:start + 300]
+        idx = chunk_top_k(block, k, selector.threshold)
+        selector.extend((block[i], start + i, None) for i in idx)
+        selector.risk_counts += risk_level_counts(block)
+
+    valid = np.flatnonzero(~np.isnan(proba))
+    expected = valid[np.lexsort((valid, -proba[valid]))[:k]]
+    assert [order for _, order, _ in selector.ranked()] == expected.tolist()
+    assert selector.risk_counts.tolist() == np.bincount(risk_level_codes(proba[valid]), minlength=3).tolist()
+
+
+def test_screen_file_reports_top_patients(tmp_path):
+    pp = DiabetesPreprocessor()
+    df = pp.clean_and_encode(pd.read_csv(Config.RAW_DATA), is_training=True)
+    model = DecisionTreeClassifier(max_depth=4, random_state=0).fit(pp.get_features(df), df['diabetic'])
+    model_path = tmp_path / 'bundle.pkl'
+    joblib.dump({'model': model, 'timestamp': 'test'}, model_path)
+
+    raw = pd.read_csv(Config.RAW_DATA).head(450)
+    input_path = tmp_path / 'patients.csv'
+    raw.to_csv(input_path, index=False)
+
+    report = score_file.screen_file(str(input_path), 10, model_path=str(model_path), workers=1, chunk_rows=64)
+    proba = model.predict_proba(pp.get_features(pp.clean_and_encode(raw)))[:, 1]
+    expected = np.lexsort((np.arange(len(proba)), -proba))[:10]
+    print(f"\nRisk levels: {report['risk_levels']} | Top-1: {report['top'][0]['probability_percent']}%")
+
+    assert report['rows'] == 450 and sum(report['risk_levels'].values()) == 450 - report['invalid']
+    # Baris data ke-i ada di baris file ke-(i + 2) karena header CSV
+    assert [entry['line'] for entry in report['top']] == (expected + 2).tolist()
+    assert [str(entry['patient']['age']) for entry in report['top']] == raw['age'].astype(str).iloc[expected].tolist()
+
+
+if __name__ == "__main__":
+    import pytest
+    # Test memakai fixture pytest (tmp_path/monkeypatch): jalankan seluruh file lewat pytest
+    sys.exit(pytest.main([__file__, '-s', '-q']))
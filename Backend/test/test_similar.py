@@ -0,0 +1,60 @@
+"""
+Backend/test/test_similar.py
+Unit Test untuk indeks pasien serupa (Backend/models/similar.py).
+Fokus: Tetangga sama dengan pencarian linear, indeks dimuat ulang dengan memory-map.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from Backend.models.similar import SimilarPatientIndex
+
+
+def test_index_matches_linear_scan_after_mmap_reload(tmp_path):
+    path = str(tmp_path / 'similar.joblib')
+    SimilarPatientIndex.from_dataset().save(path)
+    index = SimilarPatientIndex.load(path)
+    assert isinstance(index.records, np.memmap)
+
+    # Query = pasien training yang sedikit digeser
+    rng = np.random.default_rng(0)
+    X = index.records[:50] + rng.normal(0, 0.5, (50, index.records.shape[1])).astype(np.float32)
+    distances, indices = index.query(X, k=3)
+
+    Z = (index.records - index.mean) / index.scale
+    Zq = (X - index.mean) / index.scale
+    brute = np.sqrt(((Zq[:, None, :] - Z[None, :, :]) ** 2).sum(axis=2))
+    print(f"\nJarak tetangga pertama: {distances[:3, 0]}")
+    assert np.allclose(distances, np.sort(brute, axis=1)[:, :3])
+
+    # Batch == query satu per satu
+    single = index.neighbors(X[:1], k=3)[0]
+    assert [n['row'] for n in single] == list(indices[0])
+    assert index.summary(single)['k'] == 3
+
+
+def test_load_if_fresh_never_builds(tmp_path):
+    path = tmp_path / 'similar.joblib'
+    # File belum ada -> None, serving tidak membangun/menulis indeks
+    assert SimilarPatientIndex.load_if_fresh(str(path)) is None and not path.exists()
+
+    SimilarPatientIndex.from_dataset().save(str(path))
+    assert SimilarPatientIndex.load_if_fresh(str(path)) is not None
+
+    # Indeks lebih lama dari dataset -> dianggap basi
+    os.utime(path, (0, 0))
+    assert SimilarPatientIndex.load_if_fresh(str(path)) is None
+
+
+if __name__ == "__main__":
+    import pytest
+    # Test memakai fixture pytest (tmp_path/monkeypatch): jalankan seluruh file lewat pytest
+    sys.exit(pytest.main([__file__, '-s', '-q']))
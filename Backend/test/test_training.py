@@ -0,0 +1,108 @@
+"""
+Backend/test/test_training.py
+Unit Test untuk training single-pass (Backend/models/training.py).
+Fokus: Model hasil rakitan member fold harus identik dengan model final mode standard
+(CalibratedClassifierCV cv=5), serta jadwal & cache fold Successive Halving.
+"""
+
+import sys
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.calibration import CalibratedClassifierCV
+
+from Backend.config import Config
+from Backend.models import training
+from Backend.models.preprocess import DiabetesPreprocessor
+from Backend.models.training import build_pipeline, train_single_pass, search_hyperparameters
+import Scripts.train_model as train_model
+
+# 9 kandidat, eta=3, 5 fold -> rung 0: 9 x 1 fold, rung 1: 3 x 3 fold, rung 2: 1 x 5 fold
+SEARCH_SPACE = {'max_depth': [2, 4, 6], 'min_samples_leaf': [5, 10, 20]}
+
+
+def _load_encoded_dataset():
+    pp = DiabetesPreprocessor()
+    df = pp.clean_and_encode(pd.read_csv(Config.RAW_DATA), is_training=True)
+    return pp.get_features(df), pp.get_target(df)
+
+
+def test_single_pass_matches_calibrated_cv():
+    print("\n[1] Single-pass CV vs CalibratedClassifierCV (mode standard)")
+    X, y = _load_encoded_dataset()
+
+    model, cv_scores = train_single_pass(X, y, n_jobs=1)
+    reference = CalibratedClassifierCV(
+        estimator=build_pipeline(), method='sigmoid', cv=5
+    ).fit(X, y)
+
+    max_diff = np.abs(model.predict_proba(X) - reference.predict_proba(X)).max()
+    print(f"   Max selisih probabilitas: {max_diff:.2e}")
+    print(f"   Akurasi CV: {cv_scores.mean():.4f}")
+
+    assert max_diff < 1e-9
+    assert (model.predict(X) == reference.predict(X)).all()
+    assert len(cv_scores) == 5
+    assert 0.5 < cv_scores.mean() <= 1.0
+    assert list(model.feature_names_in_) == list(X.columns)
+
+
+def test_search_rejects_eta_below_two():
+    X, y = _load_encoded_dataset()
+    for eta in (1, 0):
+        with pytest.raises(ValueError):
+            search_hyperparameters(X, y, search_space=SEARCH_SPACE, eta=eta, n_jobs=1)
+
+
+def test_successive_halving_schedule_and_fold_cache(monkeypatch):
+    print("\n[2] Jadwal Successive Halving & cache (kandidat, fold)")
+    X, y = _load_encoded_dataset()
+    evaluated, original = [], training._evaluate_candidate_fold
+
+    def counting_evaluate(params, X_arr, y_arr, train_idx, test_idx, *args):
+        evaluated.append((training._candidate_key(params), tuple(test_idx[:3])))
+        return original(params, X_arr, y_arr, train_idx, test_idx, *args)
+    monkeypatch.setattr(training, '_evaluate_candidate_fold', counting_evaluate)
+
+    best_params, result = search_hyperparameters(
+        X, y, search_space=SEARCH_SPACE, eta=3, latency_repeats=1, n_jobs=1
+    )
+    schedule = [(rung, {t['n_folds'] for t in result['trace'] if t['rung'] == rung},
+                 sum(t['rung'] == rung for t in result['trace'])) for rung in range(3)]
+    print(f"   Jadwal (rung, n_folds, kandidat): {schedule} | Fit: {result['n_fits']}")
+
+    assert schedule == [(0, {1}, 9), (1, {3}, 3), (2, {5}, 1)]
+    # Kandidat yang naik rung tidak dilatih ulang pada fold yang sudah dievaluasi: 9 + 3*2 + 1*2
+    assert result['n_fits'] == len(evaluated) == len(set(evaluated)) == 17
+    assert result['trace'][-1]['params'] == best_params == result['best_params']
+
+
+def test_search_trace_written_to_metadata(monkeypatch):
+    saved = {}
+    monkeypatch.setattr(Config, 'BALANCED_DATA', Config.RAW_DATA)
+    monkeypatch.setattr(train_model, 'save_artifacts',
+                        lambda model, feature_names, metadata: saved.update(metadata))
+
+    assert train_model.train_model(mode='search', n_jobs=1, search_options={
+        'search_space': {**SEARCH_SPACE, 'criterion': ['gini']}, 'eta': 3, 'latency_repeats': 1
+    })
+    search = saved['hyperparameter_search']
+    assert search['eta'] == 3 and search['n_fits'] == 17 and len(search['trace']) == 13
+    assert saved['training_mode'] == 'search'
+    assert saved['algorithm'] == 'Calibrated Decision Tree (Gini)'
+    assert search['candidate_scoring'] == 'uncalibrated_pipeline_threshold_0.5'
+    # Skor cross-fitted bukan estimator cross_val_score mode standard -> key terpisah
+    assert 'accuracy_cv' not in saved and 0.5 < saved['accuracy_cross_fitted'] <= 1.0
+    assert all(saved['hyperparameters'][k] == v for k, v in search['best_params'].items())
+
+
+if __name__ == "__main__":
+    # Sebagian test memakai fixture pytest (monkeypatch): jalankan seluruh file lewat pytest
+    sys.exit(pytest.main([__file__, '-s', '-q']))
@@ -0,0 +1,62 @@
+"""
+Backend/test/test_what_if.py
+Unit Test untuk simulasi what-if (Backend/models/what_if.py).
+Fokus: Grid varian konsisten (BMI/berat turunan), counterfactual dengan perubahan terkecil.
+"""
+
+import sys
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from Backend.models.preprocess import DiabetesPreprocessor
+from Backend.models import what_if
+
+FEATURES = DiabetesPreprocessor().feature_order
+IDX = {name: i for i, name in enumerate(FEATURES)}
+BASE = np.array([50, 1, 80, 135, 87, 17.04, 1.68, 67.8, 24.13, 0, 0, 0, 0, 0], dtype=float)
+
+
+def test_variants_keep_derived_bmi_consistent():
+    axes = {'weight': np.array([60.0, 67.8, 80.0]), 'glucose': np.array([5.0, 17.04])}
+    X = what_if.build_variants(BASE, FEATURES, axes)
+    print(f"\nGrid: {X.shape}")
+    assert X.shape == (6, len(FEATURES))
+    # Sumbu terakhir berubah paling cepat (indexing 'ij')
+    assert list(X[:2, IDX['glucose']]) == [5.0, np.float32(17.04)]
+
+    weight, bmi = X[:, IDX['weight']], X[:, IDX['bmi']]
+    changed = ~np.isclose(weight, 67.8)
+    assert np.allclose(bmi[changed], np.round(weight[changed] / 1.68 ** 2, 2))
+    # Berat asli pasien: BMI form tidak dihitung ulang
+    assert np.allclose(bmi[~changed], 24.13)
+
+    X_bmi = what_if.build_variants(BASE, FEATURES, {'bmi': np.array([22.0, 24.13])})
+    assert np.isclose(X_bmi[0, IDX['weight']], round(22.0 * 1.68 ** 2, 2))
+    assert np.isclose(X_bmi[1, IDX['weight']], 67.8)
+
+
+def test_counterfactual_prefers_smallest_normalized_change():
+    axes = {'glucose': np.array([5.0, 10.0, 17.04]), 'systolic_bp': np.array([110.0, 135.0])}
+    X = what_if.build_variants(BASE, FEATURES, axes)
+    # Risiko turun jika glukosa turun; tekanan darah tidak berpengaruh
+    proba = np.where(X[:, IDX['glucose']] < 12, 0.2, 0.7)
+
+    result = what_if.find_counterfactual(X, proba, BASE, FEATURES, axes, threshold=0.4)
+    print(f"\nCounterfactual: {result}")
+    assert result['changes'] == {'glucose': {'from': 17.04, 'to': 10.0}}
+
+    single = what_if.single_feature_changes(proba.reshape(3, 2), axes, BASE, FEATURES, 0.4)
+    assert single['glucose']['to'] == 10.0
+    assert single['systolic_bp'] is None
+
+
+if __name__ == "__main__":
+    test_variants_keep_derived_bmi_consistent()
+    test_counterfactual_prefers_smallest_normalized_change()
+    print("✅ WHAT-IF TESTS COMPLETED")
@@ -1,7 +1,8 @@
 import pandas as pd
 import os
 import sys
-from imblearn.over_sampling import SMOTE
+import time
+import argparse
 from collections import Counter
 
 # Menambahkan root folder ke path agar bisa import Backend
@@ -12,10 +13,11 @@ sys.path.append(project_root)
 
 from Backend.config import Config
 from Backend.models.preprocess import DiabetesPreprocessor
+from Backend.models.balancing import smote_resample, BALANCE_METHODS
 
-def balance_data():
+def balance_data(method='exact', n_jobs=-1, chunk_size=10000, max_index_size=50000, random_state=42):
     print("="*60)
-    print("⚖️  BALANCING DATASET (SMOTE)")
+    print(f"⚖️  BALANCING DATASET (SMOTE - {method})")
     print("="*60)
 
     # --- 1. VALIDASI FILE RAW ---
@@ -48,8 +50,12 @@ def balance_data():
 
         # --- 4. TERAPKAN SMOTE ---
         print("🔄 Menjalankan algoritma SMOTE (Synthetic Minority Over-sampling)...")
-        smote = SMOTE(random_state=42)
-        X_resampled, y_resampled = smote.fit_resample(X, y)
+        start_time = time.perf_counter()
+        X_resampled, y_resampled = smote_resample(
+            X, y, method=method, random_state=random_state, n_jobs=n_jobs,
+            chunk_size=chunk_size, max_index_size=max_index_size
+        )
+        print(f"⏱️  Waktu SMOTE: {time.perf_counter() - start_time:.2f} detik")
 
         print(f"✅ Distribusi Setelah SMOTE: {Counter(y_resampled)}")
 
@@ -71,4 +77,18 @@ def balance_data():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    balance_data()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Balancing dataset diabetes dengan SMOTE")
+    parser.add_argument('--method', choices=BALANCE_METHODS, default='exact',
+                        help="exact: imblearn SMOTE | chunked: k-NN eksak per chunk di worker pool "
+                             "| approx: k-NN aproksimasi KDTree dengan memori terbatas")
+    parser.add_argument('--n-jobs', type=int, default=-1, help="Jumlah worker (-1 = semua core)")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="Sampel sintetis per chunk")
+    parser.add_argument('--max-index-size', type=int, default=50000,
+                        help="Jumlah maksimum titik minoritas di index KDTree (metode approx)")
+    parser.add_argument('--random-state', type=int, default=42)
+    args = parser.parse_args()
+
+    # Catatan: untuk SMOTE on-the-fly tanpa menulis CSV, gunakan:
+    #   python Scripts/train_model.py --balance fold
+    balance_data(method=args.method, n_jobs=args.n_jobs, chunk_size=args.chunk_size,
+                 max_index_size=args.max_index_size, random_state=args.random_state)
\ No newline at end of file
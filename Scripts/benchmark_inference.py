@@ -0,0 +1,220 @@
+"""
+Scripts/benchmark_inference.py
+Micro-benchmark latensi & throughput jalur inferensi (per tahap dan end-to-end).
+
+Tahap yang diukur (per ukuran batch):
+- clean_and_encode   : DiabetesPreprocessor.clean_and_encode
+- get_features       : DiabetesPreprocessor.get_features
+- predict_proba      : model.predict_proba
+- explain            : kontribusi fitur jalur keputusan per baris (api_routes.explainer)
+- feature_importance : Top-5 faktor satu pasien seperti di /api/predict (api_routes.explain_prediction)
+- log_write          : append CSV log prediksi (api_routes.append_prediction_log)
+- end_to_end         : POST /api/predict lewat Flask test client (JSON, selalu 1 pasien per request)
+- end_to_end_csv     : POST /api/predict/csv lewat Flask test client (seluruh batch dalam satu upload
+                       CSV: parse, validasi, encode, skor, log & stream hasil), untuk semua ukuran batch
+
+Hasil disimpan ke JSON lalu dibandingkan dengan baseline; regresi p50 di atas
+toleransi ditandai dan membuat exit code = 1.
+"""
+
+import sys
+import os
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent
+sys.path.insert(0, str(project_root))
+
+# 2. Import Module
+try:
+    from Backend.config import Config
+    from Backend.models.preprocess import DiabetesPreprocessor
+    import Backend.routes.api_routes as api_routes
+    from run_app import create_app
+except ModuleNotFoundError as e:
+    print(f"❌ CRITICAL ERROR: Module tidak ditemukan. {e}")
+    sys.exit(1)
+
+DEFAULT_SIZES = [1, 10, 100, 1000, 10000, 100000]
+
+
+def _time_call(fn, budget_s=1.0, min_repeats=3, max_repeats=200):
+    """Menjalankan fn berulang (1x warmup) dan mengembalikan list durasi (ns)."""
+    fn()
+    timings = []
+    deadline = time.perf_counter() + budget_s
+    while len(timings) < max_repeats and (len(timings) < min_repeats or time.perf_counter() < deadline):
+        start = time.perf_counter_ns()
+        fn()
+        timings.append(time.perf_counter_ns() - start)
+    return timings
+
+
+def _summarize(timings_ns, n_rows):
+    t = np.asarray(timings_ns, dtype=float) / 1000.0
+    p50 = float(np.percentile(t, 50))
+    return {
+        'repeats': len(t),
+        'p50_us': round(p50, 2),
+        'p95_us': round(float(np.percentile(t, 95)), 2),
+        'p99_us': round(float(np.percentile(t, 99)), 2),
+        'mean_us': round(float(t.mean()), 2),
+        'rows_per_sec': round(n_rows / (p50 / 1e6), 1) if p50 > 0 else None
+    }
+
+
+def _sample_raw_rows(n, rng):
+    """Mengambil n baris mentah (format form/dataset) dari diabetes.csv."""
+    df = pd.read_csv(Config.RAW_DATA).drop(columns=['diabetic'])
+    idx = rng.integers(0, len(df), size=n)
+    return df.iloc[idx].reset_index(drop=True)
+
+
+def run_benchmark(sizes=None, budget_s=1.0, seed=42):
+    sizes = sizes or DEFAULT_SIZES
+    rng = np.random.default_rng(seed)
+    pp = DiabetesPreprocessor()
+    model = api_routes.model
+    if model is None:
+        raise RuntimeError("Model belum tersedia. Jalankan: python Scripts/train_model.py")
+
+    results = {}
+
+    def record(stage, size, timings):
+        results.setdefault(stage, {})[str(size)] = _summarize(timings, size)
+        r = results[stage][str(size)]
+        print(f"   {stage:<20} n={size:<7} p50={r['p50_us']:>12.1f}µs  p99={r['p99_us']:>12.1f}µs  "
+              f"{r['rows_per_sec'] or 0:>14,.0f} baris/detik")
+
+    # Log ditulis ke folder sementara agar log produksi tidak tercemar
+    tmp_dir = tempfile.mkdtemp(prefix='bench_')
+    original_log = Config.PREDICTION_LOG
+    Config.PREDICTION_LOG = os.path.join(tmp_dir, 'prediction_logs.csv')
+
+    try:
+        print("\n⏱️  BENCHMARK PER TAHAP")
+        for size in sizes:
+            df_raw = _sample_raw_rows(size, rng)
+            df_clean = pp.clean_and_encode(df_raw)
+            X = pp.get_features(df_clean)
+            records = df_raw.to_dict(orient='records')
+            proba = model.predict_proba(X)[:, 1]
+            entries = [api_routes.build_log_entry(r, int(p >= 0.5), float(p)) for r, p in zip(records, proba)]
+
+            record('clean_and_encode', size, _time_call(lambda: pp.clean_and_encode(df_raw), budget_s))
+            record('get_features', size, _time_call(lambda: pp.get_features(df_clean), budget_s))
+            record('predict_proba', size, _time_call(lambda: model.predict_proba(X), budget_s))
+            record('log_write', size, _time_call(lambda: api_routes.append_prediction_log(entries), budget_s))
+            if api_routes.explainer is not None:
+                record('explain', size, _time_call(lambda: api_routes.explainer.explain(X), budget_s))
+
+        # Faktor dominan dihitung sekali per request (satu baris)
+        X_one = pp.get_features(pp.clean_and_encode(_sample_raw_rows(1, rng)))
+        record('feature_importance', 1, _time_call(lambda: api_routes.explain_prediction(X_one), budget_s))
+
+        print("\n⏱️  BENCHMARK END-TO-END (Flask test client)")
+        client = create_app().test_client()
+        payload = _sample_raw_rows(1, rng).iloc[0].to_dict()
+        payload = {k: (v.item() if hasattr(v, 'item') else v) for k, v in payload.items()}
+
+        def _post():
+            response = client.post('/api/predict', json=payload)
+            assert response.status_code == 200, response.get_data(as_text=True)
+
+        record('end_to_end', 1, _time_call(_post, budget_s))
+
+        # Jalur HTTP batch: satu upload CSV per ukuran batch (response di-stream, dibaca sampai habis)
+        for size in sizes:
+            body = _sample_raw_rows(size, rng).to_csv(index=False).encode('utf-8')
+
+            def _post_csv():
+                response = client.post('/api/predict/csv', data=body, content_type='text/csv')
+                assert response.status_code == 200, response.get_data(as_text=True)
+                assert response.get_data().count(b'\n') == size + 1
+
+            record('end_to_end_csv', size, _time_call(_post_csv, budget_s))
+    finally:
+        Config.PREDICTION_LOG = original_log
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    import sklearn
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'sklearn': sklearn.__version__,
+            'model_type': type(model).__name__
+        },
+        'results': results
+    }
+
+
+def compare_with_baseline(report, baseline, tolerance):
+    """Menandai tahap yang p50-nya lebih lambat dari baseline * (1 + tolerance)."""
+    regressions = []
+    for stage, by_size in report['results'].items():
+        for size, current in by_size.items():
+            base = baseline.get('results', {}).get(stage, {}).get(size)
+            if not base:
+                continue
+            ratio = current['p50_us'] / base['p50_us'] if base['p50_us'] else 1.0
+            current['baseline_p50_us'] = base['p50_us']
+            current['ratio_vs_baseline'] = round(ratio, 3)
+            if ratio > 1 + tolerance:
+                regressions.append({'stage': stage, 'size': int(size), 'ratio': round(ratio, 3)})
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark latensi & throughput inferensi")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Ukuran batch yang diuji")
+    parser.add_argument('--budget', type=float, default=1.0, help="Detik per (tahap, ukuran)")
+    parser.add_argument('--output', default=Config.BENCHMARK_RESULTS, help="File hasil JSON")
+    parser.add_argument('--baseline', default=Config.BENCHMARK_BASELINE, help="File baseline JSON")
+    parser.add_argument('--tolerance', type=float, default=0.20, help="Toleransi regresi p50 (0.20 = 20%%)")
+    parser.add_argument('--save-baseline', action='store_true', help="Simpan hasil run ini sebagai baseline")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("📊 BENCHMARK INFERENSI - DIABETES DSS")
+    print("=" * 70)
+
+    report = run_benchmark(args.sizes, args.budget)
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, 'r') as f:
+            regressions = compare_with_baseline(report, json.load(f), args.tolerance)
+        report['regressions'] = regressions
+
+        print("\n⚖️  PERBANDINGAN BASELINE")
+        if regressions:
+            for r in regressions:
+                print(f"   ⚠️  REGRESI: {r['stage']} (n={r['size']}) {r['ratio']}x lebih lambat")
+        else:
+            print(f"   ✅ Tidak ada regresi di atas toleransi {args.tolerance:.0%}")
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=4)
+    print(f"\n💾 Hasil benchmark disimpan: {args.output}")
+
+    if args.save_baseline:
+        shutil.copyfile(args.output, args.baseline)
+        print(f"📌 Baseline diperbarui: {args.baseline}")
+
+    if regressions:
+        sys.exit(1)
@@ -0,0 +1,120 @@
+"""
+Scripts/distill_model.py
+Distilasi ensemble terkalibrasi (5 pipeline) menjadi satu regression tree untuk serving.
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import joblib
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent
+sys.path.insert(0, str(project_root))
+
+# 2. Import Module
+try:
+    from Backend.config import Config
+    from Backend.models.preprocess import DiabetesPreprocessor
+    from Backend.models.distill import distill_model, passes_thresholds, build_distilled_bundle
+except ModuleNotFoundError as e:
+    print(f"❌ CRITICAL ERROR: Module tidak ditemukan. {e}")
+    sys.exit(1)
+
+
+def run_distillation(n_samples=200000, refine_rounds=3, force=False):
+    print("=" * 60)
+    print("🧪 DISTILASI MODEL (ENSEMBLE -> SATU TREE)")
+    print("=" * 60)
+
+    # --- 1. Validasi File ---
+    if not os.path.exists(Config.MODEL_PATH):
+        print(f"❌ Model tidak ditemukan di: {Config.MODEL_PATH}")
+        print("   👉 Jalankan: python Scripts/train_model.py")
+        return False
+
+    if not os.path.exists(Config.BALANCED_DATA):
+        print(f"❌ Dataset balanced tidak ditemukan di: {Config.BALANCED_DATA}")
+        print("   👉 Jalankan: python Scripts/balance_dataset.py")
+        return False
+
+    try:
+        # --- 2. Load Model Guru & Distribusi Training ---
+        teacher_bundle = joblib.load(Config.MODEL_PATH)
+        if not isinstance(teacher_bundle, dict) or 'model' not in teacher_bundle:
+            teacher_bundle = {'model': teacher_bundle}
+        teacher = teacher_bundle['model']
+
+        pp = DiabetesPreprocessor()
+        df = pd.read_csv(Config.BALANCED_DATA).dropna()
+        X_train = df[pp.feature_order].to_numpy(dtype=np.float32)
+        print(f"📂 Distribusi training: {len(X_train)} baris")
+
+        # --- 3. Distilasi ---
+        print(f"🔄 Melabeli {n_samples} sampel sintetis + {refine_rounds} ronde refinement...")
+        start_time = time.perf_counter()
+        student, report = distill_model(
+            teacher, X_train, pp.feature_order,
+            n_samples=n_samples, refine_rounds=refine_rounds
+        )
+        print(f"⏱️  Waktu distilasi: {time.perf_counter() - start_time:.2f} detik")
+
+        # --- 4. Laporan Fidelitas ---
+        real, synth = report['training_rows'], report['synthetic_holdout']
+        print("\n📈 FIDELITAS (Guru vs Distilasi)")
+        print("-" * 30)
+        print(f"   {'':<20} {'Data Asli':<12} {'Sintetis':<12}")
+        for key in ('max_abs_error', 'mean_abs_error', 'p99_abs_error', 'agreement_rate'):
+            print(f"   {key:<20} {real[key]:<12} {synth[key]:<12}")
+        print(f"\n   Daun: {report['n_leaves']} | Kedalaman: {report['depth']}")
+        print(f"   Latensi 1 baris: {report['latency_us']['teacher']} µs -> {report['latency_us']['distilled']} µs")
+
+        passed = passes_thresholds(report)
+        report['passes_thresholds'] = passed
+        print(f"\n{'✅' if passed else '⚠️ '} Ambang fidelitas: "
+              f"maks ≤ {Config.DISTILL_MAX_PROBA_ERROR}, rata-rata ≤ {Config.DISTILL_MEAN_PROBA_ERROR}, "
+              f"agreement ≥ {Config.DISTILL_MIN_AGREEMENT} -> {'LOLOS' if passed else 'TIDAK LOLOS'}")
+
+        # --- 5. Simpan Artefak ---
+        if passed or force:
+            joblib.dump(build_distilled_bundle(student, report, teacher_bundle), Config.DISTILLED_MODEL_PATH)
+            print(f"💾 Model distilasi tersimpan: {Config.DISTILLED_MODEL_PATH}")
+            if not Config.USE_DISTILLED_MODEL:
+                print("   ℹ️  Serving tetap memakai ensemble; set USE_DISTILLED_MODEL=1 untuk mengaktifkan.")
+        else:
+            print("   Model distilasi TIDAK disimpan (gunakan --force untuk menyimpan tetap).")
+
+        if os.path.exists(Config.META_PATH):
+            with open(Config.META_PATH, 'r') as f:
+                metadata = json.load(f)
+            metadata['distillation'] = report
+            with open(Config.META_PATH, 'w') as f:
+                json.dump(metadata, f, indent=4)
+            print(f"📄 Laporan distilasi ditambahkan ke: {Config.META_PATH}")
+
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Distilasi Gagal: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distilasi model ensemble menjadi satu tree")
+    parser.add_argument('--n-samples', type=int, default=200000, help="Jumlah sampel sintetis awal")
+    parser.add_argument('--refine-rounds', type=int, default=3, help="Ronde refinement area error tinggi")
+    parser.add_argument('--force', action='store_true', help="Simpan model walau tidak lolos ambang")
+    args = parser.parse_args()
+
+    if run_distillation(args.n_samples, args.refine_rounds, args.force):
+        print("\n✅ Distilasi Selesai.")
+    else:
+        sys.exit(1)
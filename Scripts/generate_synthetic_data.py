@@ -0,0 +1,117 @@
+"""
+Scripts/generate_synthetic_data.py
+Membangkitkan jutaan baris data pasien sintetis (realistis) dari diabetes.csv untuk uji skala.
+
+Format output (ditentukan dari ekstensi --output):
+- .csv : format ter-encode (seperti diabetes_balanced.csv) atau format mentah (--raw)
+- .npy : matriks float32 (n_rows x 14, urutan feature_order) + label uint8 di <nama>_labels.npy
+
+Contoh:
+    python Scripts/generate_synthetic_data.py --rows 5000000 --output Backend/data/synthetic.csv
+    python Scripts/generate_synthetic_data.py --rows 1000000 --raw --output Backend/data/synthetic_raw.csv
+    python Scripts/generate_synthetic_data.py --rows 10000000 --output Backend/data/synthetic.npy
+"""
+
+import sys
+import os
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent
+sys.path.insert(0, str(project_root))
+
+# 2. Import Module
+try:
+    from Backend.config import Config
+    from Backend.models.preprocess import DiabetesPreprocessor
+    from Backend.models.synthetic import SyntheticPatientGenerator, to_raw_form
+except ModuleNotFoundError as e:
+    print(f"❌ CRITICAL ERROR: Module tidak ditemukan. {e}")
+    sys.exit(1)
+
+
+def fit_generator(source_path):
+    """Mempelajari distribusi dari CSV mentah (setelah clean_and_encode)."""
+    preprocessor = DiabetesPreprocessor()
+    df = preprocessor.clean_and_encode(pd.read_csv(source_path), is_training=True)
+    if df.empty:
+        raise ValueError(f"Data sumber kosong setelah preprocessing: {source_path}")
+    return SyntheticPatientGenerator(feature_order=preprocessor.feature_order).fit(df), len(df)
+
+
+def generate(rows, output, source=None, random_state=42, raw=False, positive_rate=None,
+             unit_mix=0.5, missing_bmi=0.1):
+    print("=" * 60)
+    print("🧬 GENERATOR DATA PASIEN SINTETIS")
+    print("=" * 60)
+
+    # --- 1. FIT DISTRIBUSI ---
+    source = source or Config.RAW_DATA
+    generator, n_source = fit_generator(source)
+    print(f"📂 Sumber distribusi : {source} ({n_source:,} baris)")
+    print(f"📊 Prior kelas       : {dict(zip(generator.classes_.tolist(), generator.class_prior_.round(4).tolist()))}")
+
+    is_npy = output.lower().endswith('.npy')
+    if is_npy and raw:
+        raise ValueError("Format mentah (--raw) hanya didukung untuk output .csv")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    # --- 2. STREAM BLOK KE DISK ---
+    n_features = len(generator.feature_order)
+    if is_npy:
+        label_path = output[:-4] + '_labels.npy'
+        features = np.lib.format.open_memmap(output, mode='w+', dtype=np.float32, shape=(rows, n_features))
+        labels = np.lib.format.open_memmap(label_path, mode='w+', dtype=np.uint8, shape=(rows,))
+
+    start_time = time.perf_counter()
+    written = 0
+    seed_seq = np.random.SeedSequence([random_state, 1])
+    for block in generator.iter_blocks(rows, random_state=random_state, positive_rate=positive_rate):
+        n = len(block)
+        if is_npy:
+            features[written:written + n] = block[generator.feature_order].to_numpy(dtype=np.float32)
+            labels[written:written + n] = block[generator.target_].to_numpy(dtype=np.uint8)
+        else:
+            if raw:
+                block = to_raw_form(block, seed_seq.spawn(1)[0], unit_mix=unit_mix, missing_bmi=missing_bmi)
+            block.to_csv(output, mode='w' if written == 0 else 'a', header=written == 0, index=False)
+        written += n
+
+        elapsed = time.perf_counter() - start_time
+        print(f"\r   ⏳ {written:,}/{rows:,} baris ({written / max(elapsed, 1e-9):,.0f} baris/detik)", end='', flush=True)
+
+    if is_npy:
+        features.flush()
+        labels.flush()
+        del features, labels
+
+    elapsed = time.perf_counter() - start_time
+    print(f"\n✅ {written:,} baris dibuat dalam {elapsed:.2f} detik")
+    print(f"💾 Output: {output}" + (f" (+ {label_path})" if is_npy else ""))
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generator data pasien sintetis untuk uji skala")
+    parser.add_argument('--rows', type=int, default=1000000, help="Jumlah baris yang dibuat")
+    parser.add_argument('--output', default=os.path.join(Config.DATA_DIR, 'synthetic_patients.csv'),
+                        help="File output (.csv atau .npy)")
+    parser.add_argument('--source', default=Config.RAW_DATA, help="CSV mentah sumber distribusi")
+    parser.add_argument('--random-state', type=int, default=42)
+    parser.add_argument('--raw', action='store_true',
+                        help="Tulis format mentah (mg/dL, cm, Yes/No) untuk menguji konversi clean_and_encode")
+    parser.add_argument('--positive-rate', type=float, default=None,
+                        help="Proporsi kelas diabetic (default: sama seperti data sumber)")
+    parser.add_argument('--unit-mix', type=float, default=0.5,
+                        help="Format mentah: proporsi baris dengan glukosa mg/dL & tinggi cm")
+    parser.add_argument('--missing-bmi', type=float, default=0.1,
+                        help="Format mentah: proporsi baris dengan BMI kosong (dihitung ulang preprocess)")
+    args = parser.parse_args()
+
+    generate(args.rows, args.output, source=args.source, random_state=args.random_state, raw=args.raw,
+             positive_rate=args.positive_rate, unit_mix=args.unit_mix, missing_bmi=args.missing_bmi)
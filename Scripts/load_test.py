@@ -0,0 +1,403 @@
+"""
+Scripts/load_test.py
+Load test lokal untuk API Flask: mencari titik saturasi sebelum deploy.
+
+Mode target:
+- inprocess : Flask test client di proses yang sama (default)
+- spawn     : menjalankan server lokal (threaded) di subprocess lalu kirim HTTP
+- --url     : server yang sudah berjalan (misal gunicorn lokal)
+
+Beban:
+- closed-loop : N worker, masing-masing langsung mengirim request berikutnya
+- open-loop   : --rate R request/detik (kedatangan Poisson); latensi dihitung dari
+                jadwal kedatangan sehingga antrean di sisi klien ikut terukur
+
+Setelah run, harness memverifikasi konsistensi:
+- log prediksi: jumlah baris bertambah tepat = jumlah predict sukses, CSV tetap valid
+- singleton DiabetesModel & model global api_routes tidak berubah selama stress (inprocess)
+"""
+
+import sys
+import os
+import json
+import time
+import queue
+import random
+import shutil
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+import http.client
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from urllib.parse import urlparse
+from collections import defaultdict
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Backend.config import Config
+
+ENDPOINTS = {
+    'predict': ('POST', '/api/predict'),
+    'logs': ('GET', '/api/logs'),
+    'model-info': ('GET', '/api/model-info'),
+}
+
+# Batas bucket histogram latensi (milidetik)
+LATENCY_BUCKETS_MS = [0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float('inf')]
+
+
+def parse_mix(text):
+    """'predict=0.8,logs=0.15,model-info=0.05' -> dict bobot ternormalisasi."""
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Endpoint tidak dikenal: {name}. Pilihan: {list(ENDPOINTS)}")
+        mix[name] = float(weight or 1)
+    total = sum(mix.values())
+    return {k: v / total for k, v in mix.items()}
+
+
+def load_payloads(n=500, seed=42):
+    """Payload predict dari baris mentah diabetes.csv (format yang dikirim form)."""
+    df = pd.read_csv(Config.RAW_DATA).drop(columns=['diabetic']).sample(n=n, replace=True, random_state=seed)
+    return [{k: (v.item() if hasattr(v, 'item') else v) for k, v in row.items()} for row in df.to_dict('records')]
+
+
+def count_log_rows(path):
+    if not os.path.exists(path):
+        return 0
+    return len(pd.read_csv(path))
+
+
+# --- TRANSPORT ---
+
+class InProcessTransport:
+    """Satu Flask test client per thread worker."""
+
+    def __init__(self, app):
+        self.app = app
+        self.local = threading.local()
+
+    def send(self, method, path, payload):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        if method == 'POST':
+            response = client.post(path, json=payload)
+        else:
+            response = client.get(path)
+        return response.status_code
+
+
+class HttpTransport:
+    """Koneksi HTTP keep-alive per thread worker."""
+
+    def __init__(self, base_url, timeout=30):
+        parsed = urlparse(base_url)
+        self.host, self.port = parsed.hostname, parsed.port or 80
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = self.local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def send(self, method, path, payload):
+        body = json.dumps(payload) if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body else {}
+        for attempt in range(2):
+            conn = self._conn()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                return response.status
+            except (http.client.HTTPException, ConnectionError, socket.timeout):
+                conn.close()
+                self.local.conn = None
+                if attempt == 1:
+                    raise
+
+
+def spawn_server(log_path, port=None):
+    """Menjalankan server Flask threaded di subprocess dengan log prediksi terpisah."""
+    if port is None:
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            port = s.getsockname()[1]
+
+    env = dict(os.environ, PREDICTION_LOG=log_path)
+    code = (
+        "from run_app import create_app; "
+        f"create_app().run(host='127.0.0.1', port={port}, threaded=True, debug=False, use_reloader=False)"
+    )
+    proc = subprocess.Popen([sys.executable, '-c', code], cwd=str(project_root), env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if HttpTransport(base_url, timeout=2).send('GET', '/api/model-info', None) == 200:
+                return proc, base_url
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("Server lokal gagal start dalam 60 detik")
+
+
+# --- LOAD GENERATOR ---
+
+class LoadRecorder:
+    """Mengumpulkan latensi, error, dan throughput per detik (thread-safe)."""
+
+    def __init__(self, start_time):
+        self.start_time = start_time
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.status_counts = defaultdict(lambda: defaultdict(int))
+        self.errors = defaultdict(int)
+        self.timeline = defaultdict(lambda: {'ok': 0, 'error': 0})
+
+    def record(self, endpoint, latency_s, status, error=None):
+        second = int(time.perf_counter() - self.start_time)
+        ok = error is None and status is not None and status < 400
+        with self.lock:
+            self.latencies[endpoint].append(latency_s * 1000.0)
+            if status is not None:
+                self.status_counts[endpoint][status] += 1
+            if error is not None:
+                self.errors[f"{endpoint}: {type(error).__name__}"] += 1
+            self.timeline[second]['ok' if ok else 'error'] += 1
+
+    def summary(self, duration_s):
+        endpoints = {}
+        for endpoint, values in self.latencies.items():
+            lat = np.asarray(values)
+            counts, _ = np.histogram(lat, bins=[0] + LATENCY_BUCKETS_MS)
+            endpoints[endpoint] = {
+                'requests': int(len(lat)),
+                'throughput_rps': round(len(lat) / duration_s, 2),
+                'status_codes': {str(k): v for k, v in self.status_counts[endpoint].items()},
+                'latency_ms': {
+                    'p50': round(float(np.percentile(lat, 50)), 2),
+                    'p95': round(float(np.percentile(lat, 95)), 2),
+                    'p99': round(float(np.percentile(lat, 99)), 2),
+                    'max': round(float(lat.max()), 2),
+                    'mean': round(float(lat.mean()), 2)
+                },
+                'histogram_ms': {
+                    (f"<= {b:g}" if b != float('inf') else "> 5000"): int(c)
+                    for b, c in zip(LATENCY_BUCKETS_MS, counts)
+                }
+            }
+        return {
+            'endpoints': endpoints,
+            'errors': dict(self.errors),
+            'timeline': [
+                {'second': s, **self.timeline[s]} for s in sorted(self.timeline)
+            ]
+        }
+
+
+def run_load(transport, mix, payloads, duration_s, concurrency, rate=None, seed=42):
+    """
+    Menjalankan beban selama duration_s. Jika rate diberikan -> open-loop (Poisson),
+    jika tidak -> closed-loop dengan `concurrency` worker.
+    """
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    start = time.perf_counter()
+    recorder = LoadRecorder(start)
+    stop_at = start + duration_s
+
+    def _execute(endpoint, scheduled_at):
+        method, path = ENDPOINTS[endpoint]
+        payload = rng.choice(payloads) if method == 'POST' else None
+        status, error = None, None
+        try:
+            status = transport.send(method, path, payload)
+        except Exception as e:
+            error = e
+        recorder.record(endpoint, time.perf_counter() - scheduled_at, status, error)
+
+    if rate is None:
+        def _closed_worker():
+            while time.perf_counter() < stop_at:
+                _execute(rng.choices(names, weights)[0], time.perf_counter())
+
+        workers = [threading.Thread(target=_closed_worker, daemon=True) for _ in range(concurrency)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+    else:
+        tasks = queue.Queue()
+
+        def _open_worker():
+            while True:
+                item = tasks.get()
+                if item is None:
+                    return
+                _execute(*item)
+
+        workers = [threading.Thread(target=_open_worker, daemon=True) for _ in range(concurrency)]
+        for w in workers:
+            w.start()
+
+        # Dispatcher: jadwal kedatangan Poisson, tidak menunggu respons (open-loop)
+        next_at = start
+        while next_at < stop_at:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            tasks.put((rng.choices(names, weights)[0], next_at))
+            next_at += rng.expovariate(rate)
+
+        for _ in workers:
+            tasks.put(None)
+        for w in workers:
+            w.join()
+
+    elapsed = time.perf_counter() - start
+    return recorder, elapsed
+
+
+def check_singleton(concurrency=32):
+    """Memanggil DiabetesModel.get_instance() serentak dari banyak thread; harus satu objek."""
+    from Backend.models.decision_tree_model import DiabetesModel
+    ids = set()
+    barrier = threading.Barrier(concurrency)
+
+    def _grab():
+        barrier.wait()
+        ids.add(id(DiabetesModel.get_instance()))
+
+    threads = [threading.Thread(target=_grab) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return len(ids) == 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test lokal untuk API Diabetes")
+    parser.add_argument('--target', choices=['inprocess', 'spawn'], default='inprocess')
+    parser.add_argument('--url', help="Base URL server yang sudah berjalan (mengabaikan --target)")
+    parser.add_argument('--mix', default='predict=0.8,logs=0.15,model-info=0.05')
+    parser.add_argument('--concurrency', type=int, default=8, help="Jumlah worker thread")
+    parser.add_argument('--rate', type=float, help="Open-loop: kedatangan rata-rata per detik")
+    parser.add_argument('--duration', type=float, default=10.0, help="Durasi (detik)")
+    parser.add_argument('--output', default=os.path.join(Config.LOGS_DIR, 'load_test_report.json'))
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("🔥 LOAD TEST - DIABETES API")
+    print("=" * 70)
+
+    mix = parse_mix(args.mix)
+    payloads = load_payloads()
+
+    # Log prediksi dialihkan ke file sementara (kecuali target --url)
+    tmp_dir = tempfile.mkdtemp(prefix='loadtest_')
+    log_path = Config.PREDICTION_LOG if args.url else os.path.join(tmp_dir, 'prediction_logs.csv')
+    proc = None
+    model_ids = None
+
+    try:
+        if args.url:
+            transport, target = HttpTransport(args.url), args.url
+        elif args.target == 'spawn':
+            proc, base_url = spawn_server(log_path)
+            transport, target = HttpTransport(base_url), base_url
+        else:
+            Config.PREDICTION_LOG = log_path
+            from run_app import create_app
+            import Backend.routes.api_routes as api_routes
+            from Backend.models.decision_tree_model import DiabetesModel
+            transport, target = InProcessTransport(create_app()), 'inprocess'
+            model_ids = (id(api_routes.model), id(DiabetesModel.get_instance()))
+
+        mode = f"open-loop {args.rate}/s" if args.rate else "closed-loop"
+        print(f"🎯 Target: {target} | {mode} | concurrency={args.concurrency} | durasi={args.duration}s")
+        print(f"   Mix: {mix}")
+
+        log_before = count_log_rows(log_path)
+        recorder, elapsed = run_load(transport, mix, payloads, args.duration, args.concurrency, args.rate)
+        summary = recorder.summary(elapsed)
+
+        # --- KONSISTENSI ---
+        predict_ok = recorder.status_counts['predict'].get(200, 0)
+        consistency = {'predict_success': predict_ok}
+        try:
+            log_after = count_log_rows(log_path)
+            consistency['log_rows_added'] = log_after - log_before
+            consistency['log_parse_ok'] = True
+        except Exception as e:
+            consistency['log_parse_ok'] = False
+            consistency['log_error'] = str(e)
+        consistency['log_consistent'] = consistency.get('log_rows_added') == predict_ok
+
+        if model_ids is not None:
+            import Backend.routes.api_routes as api_routes
+            from Backend.models.decision_tree_model import DiabetesModel
+            consistency['model_global_unchanged'] = id(api_routes.model) == model_ids[0]
+            consistency['singleton_unchanged'] = id(DiabetesModel.get_instance()) == model_ids[1]
+            consistency['singleton_single_instance'] = check_singleton()
+
+        report = {
+            'timestamp': datetime.now().isoformat(),
+            'config': {
+                'target': target, 'mix': mix, 'concurrency': args.concurrency,
+                'rate': args.rate, 'duration_s': args.duration
+            },
+            'elapsed_s': round(elapsed, 2),
+            **summary,
+            'consistency': consistency
+        }
+
+        print("\n📈 HASIL")
+        for endpoint, stats in summary['endpoints'].items():
+            lat = stats['latency_ms']
+            print(f"   {endpoint:<12} {stats['requests']:>7} req  {stats['throughput_rps']:>8} rps  "
+                  f"p50={lat['p50']}ms p95={lat['p95']}ms p99={lat['p99']}ms  status={stats['status_codes']}")
+        if summary['errors']:
+            print(f"   ⚠️  Error: {summary['errors']}")
+
+        print("\n🔍 KONSISTENSI")
+        for key, value in consistency.items():
+            print(f"   {key:<28}: {value}")
+
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=4)
+        print(f"\n💾 Laporan load test: {args.output}")
+
+        checks = [v for k, v in consistency.items() if isinstance(v, bool)]
+        return all(checks)
+
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    if not main():
+        print("\n❌ Load test menemukan inkonsistensi.")
+        sys.exit(1)
+    print("\n✅ Load test selesai.")
@@ -0,0 +1,157 @@
+"""
+Scripts/memory_report.py
+Laporan footprint memori serving untuk sizing container.
+
+Isi laporan:
+- Ukuran object graph model serving, singleton DiabetesModel, tabel mapping DiabetesPreprocessor
+- Ukuran cache/ring buffer (buffer request lambat, registry metrik, sesi profiler)
+- RSS/PSS proses sebelum & sesudah model dimuat, tracemalloc saat memuat bundle
+- Alokasi per request /api/predict (tracemalloc, log prediksi di folder sementara)
+- --workers N: fork N worker SETELAH model dimuat (seperti gunicorn --preload), masing-masing
+  melayani request lalu melaporkan RSS/PSS/private -> efek copy-on-write terlihat langsung.
+
+Contoh:
+    python Scripts/memory_report.py --workers 4
+"""
+
+import sys
+import os
+import json
+import shutil
+import argparse
+import tempfile
+import pandas as pd
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent
+sys.path.insert(0, str(project_root))
+
+# 2. Import Module
+try:
+    from Backend.monitoring import memory
+    memory.mark_rss('process_start')
+
+    from Backend.config import Config
+    import Backend.routes.api_routes as api_routes
+    from run_app import create_app
+except ModuleNotFoundError as e:
+    print(f"❌ CRITICAL ERROR: Module tidak ditemukan. {e}")
+    sys.exit(1)
+
+
+def _mb(value):
+    return f"{value / 1024 / 1024:>9.2f} MB" if isinstance(value, (int, float)) else f"{'-':>12}"
+
+
+def _sample_payload():
+    """Satu baris diabetes.csv (format mentah form) sebagai payload /api/predict."""
+    row = pd.read_csv(Config.RAW_DATA, nrows=1).drop(columns=['diabetic']).iloc[0].to_dict()
+    return {k: (v.item() if hasattr(v, 'item') else v) for k, v in row.items()}
+
+
+def _worker_memory(client, payload, n_requests, queue):
+    for _ in range(n_requests):
+        client.post('/api/predict', json=payload)
+    queue.put({'pid': os.getpid(), **memory.process_memory()})
+
+
+def fork_workers(client, payload, n_workers, n_requests):
+    """Fork worker setelah model dimuat; kembalikan memori tiap worker setelah melayani request."""
+    import multiprocessing as mp
+    ctx = mp.get_context('fork')
+    queue = ctx.Queue()
+    procs = [ctx.Process(target=_worker_memory, args=(client, payload, n_requests, queue)) for _ in range(n_workers)]
+    for p in procs:
+        p.start()
+    results = [queue.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return results
+
+
+def run_report(workers=0, requests_per_worker=50, repeats=20):
+    tmp_dir = tempfile.mkdtemp(prefix='memory_')
+    original_log = Config.PREDICTION_LOG
+    Config.PREDICTION_LOG = os.path.join(tmp_dir, 'prediction_logs.csv')
+    try:
+        client = create_app().test_client()
+        payload = _sample_payload()
+
+        report = memory.build_report(api_routes, detailed=True)
+        report['predict_allocations'] = memory.measure_request_allocations(
+            client, '/api/predict', payload, repeats=repeats)
+        if workers:
+            report['forked_workers'] = fork_workers(client, payload, workers, requests_per_worker)
+    finally:
+        Config.PREDICTION_LOG = original_log
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return report
+
+
+def print_report(report):
+    print("\n📦 OBJECT GRAPH")
+    for name, value in report['objects'].items():
+        if isinstance(value, dict):
+            for sub, size in value.items():
+                print(f"   {name + '.' + sub:<45} {size:>12,} B")
+        elif value is None:
+            print(f"   {name:<45} {'-':>12}")
+        else:
+            print(f"   {name:<45} {value:>12,} B")
+
+    print("\n🗃️  CACHE & BUFFER")
+    for name, size in report['caches'].items():
+        print(f"   {name:<45} {size:>12,} B")
+
+    if 'bundle_load_traced' in report:
+        traced = report['bundle_load_traced']
+        print("\n💾 MEMUAT BUNDLE (tracemalloc)")
+        print(f"   File: {traced['file_bytes']:,} B | retained: {traced['retained_bytes']:,} B | "
+              f"peak: {traced['peak_bytes']:,} B")
+
+    print("\n🧠 MEMORI PROSES (RSS / PSS / private)")
+    for name, mark in {**report['rss_marks'], 'current': report['process']}.items():
+        print(f"   {name:<20} pid={mark.get('pid', report['pid']):<7} rss={_mb(mark.get('rss'))} "
+              f"pss={_mb(mark.get('pss'))} private={_mb(mark.get('private'))}")
+
+    alloc = report.get('predict_allocations')
+    if alloc:
+        print(f"\n🔁 ALOKASI PER REQUEST {alloc['path']} ({alloc['repeats']}x)")
+        print(f"   Peak sementara : {alloc['peak_bytes_per_request']:,} B")
+        print(f"   Sisa (retained): {alloc['retained_bytes_per_request']:,} B "
+              f"({alloc['retained_blocks_per_request']} blok)")
+
+    workers = report.get('forked_workers')
+    if workers:
+        print(f"\n👥 WORKER FORK SETELAH MODEL DIMUAT (copy-on-write)")
+        for w in workers:
+            print(f"   pid={w['pid']:<7} rss={_mb(w.get('rss'))} pss={_mb(w.get('pss'))} "
+                  f"shared={_mb(w.get('shared'))} private={_mb(w.get('private'))}")
+        if all(w.get('pss') for w in workers):
+            total_pss = sum(w['pss'] for w in workers)
+            total_rss = sum(w['rss'] for w in workers)
+            print(f"   Total PSS {_mb(total_pss)} vs total RSS {_mb(total_rss)} "
+                  f"(hemat {1 - total_pss / total_rss:.0%} berkat halaman bersama)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Laporan footprint memori model, preprocessor & cache")
+    parser.add_argument('--workers', type=int, default=0, help="Jumlah worker fork untuk uji copy-on-write")
+    parser.add_argument('--requests', type=int, default=50, help="Request /api/predict per worker fork")
+    parser.add_argument('--repeats', type=int, default=20, help="Request yang diukur tracemalloc")
+    parser.add_argument('--output', default=os.path.join(Config.LOGS_DIR, 'memory_report.json'),
+                        help="File hasil JSON")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("🧮 LAPORAN MEMORI - DIABETES DSS")
+    print("=" * 70)
+
+    report = run_report(args.workers, args.requests, args.repeats)
+    print_report(report)
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=4)
+    print(f"\n💾 Laporan disimpan: {args.output}")
@@ -0,0 +1,379 @@
+"""
+Scripts/replay_predictions.py
+Replay log prediksi (Backend/logs/prediction_logs.csv) ke model AKTIF dan model KANDIDAT
+sebelum bundle hasil retraining dipromosikan.
+
+Alur:
+1. Log (atau partisinya: beberapa file / glob / folder berisi *.csv) dibaca per blok byte
+   yang dipotong di batas baris; proses utama hanya membaca file.
+2. Worker (process pool) mem-parse blok, encode sekali dengan DiabetesPreprocessor, lalu
+   menskor batch yang sama dengan kedua model.
+3. Worker hanya mengembalikan agregat kecil (matriks flip, histogram pergeseran probabilitas,
+   matriks migrasi risiko, waktu) sehingga jutaan baris tidak perlu dikirim balik.
+
+Laporan:
+- Flip label (Non-Diabetic <-> Diabetic) dan positive rate kedua model
+- Distribusi pergeseran probabilitas (kandidat - aktif): mean, |mean|, kuantil, porsi >= 5/10 poin
+- Migrasi tingkat risiko (Rendah/Sedang/Tinggi, ambang sama dengan /api/predict)
+- Kesesuaian model aktif dengan label yang tercatat di log
+- Latensi per baris: amortisasi batch & satu-baris-per-panggilan (seperti serving)
+
+Contoh:
+    python Scripts/replay_predictions.py --candidate Backend/models/candidate_bundle.pkl
+    python Scripts/replay_predictions.py --candidate new.pkl --log "archive/logs_2026-*.csv" --max-flip-rate 0.01
+"""
+
+import sys
+import os
+import io
+import glob
+import json
+import time
+import argparse
+import contextlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent
+sys.path.insert(0, str(project_root))
+
+# 2. Import Module
+try:
+    from Backend.config import Config
+    from Backend.models.preprocess import DiabetesPreprocessor
+    from Backend.models.decision_tree_model import DiabetesModel
+    from Backend.models.utils import RISK_LEVELS, risk_level_codes
+except ModuleNotFoundError as e:
+    print(f"❌ CRITICAL ERROR: Module tidak ditemukan. {e}")
+    sys.exit(1)
+
+# Histogram pergeseran probabilitas: bin 0.005 dengan titik tengah tepat di 0
+SHIFT_BIN = 0.005
+SHIFT_EDGES = np.linspace(-1.0 - SHIFT_BIN / 2, 1.0 + SHIFT_BIN / 2, int(round(2 / SHIFT_BIN)) + 2)
+SHIFT_CENTERS = (SHIFT_EDGES[:-1] + SHIFT_EDGES[1:]) / 2
+
+_worker = {}    # State per proses worker: preprocessor & kedua model
+
+
+# --- 1. PEMBACAAN LOG ---
+
+def resolve_log_paths(patterns):
+    """File, glob, atau folder (semua *.csv di dalamnya) -> daftar path terurut."""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.extend(sorted(glob.glob(os.path.join(pattern, '*.csv'))))
+        else:
+            paths.extend(sorted(glob.glob(pattern)) or [pattern])
+    missing = [p for p in paths if not os.path.exists(p)]
+    if missing:
+        raise FileNotFoundError(f"File log tidak ditemukan: {', '.join(missing)}")
+    return paths
+
+
+def iter_log_blocks(paths, block_bytes):
+    """(header, blok byte) per file; blok selalu berakhir di batas baris."""
+    for path in paths:
+        with open(path, 'rb') as f:
+            header = f.readline()
+            remainder = b''
+            while True:
+                data = f.read(block_bytes)
+                if not data:
+                    break
+                data = remainder + data
+                cut = data.rfind(b'\n') + 1
+                remainder = data[cut:]
+                if cut:
+                    yield header, data[:cut]
+            if remainder.strip():
+                yield header, remainder
+
+
+# --- 2. WORKER ---
+
+def _load_model(path):
+    # Pesan load per worker disembunyikan; kegagalan tetap dilaporkan lewat exception
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = DiabetesModel(model_path=path)
+    if not model.model_bundle:
+        raise RuntimeError(f"Model gagal dimuat: {path}")
+    return model
+
+
+def _init_worker(current_path, candidate_path):
+    _worker['preprocessor'] = DiabetesPreprocessor()
+    _worker['current'] = _load_model(current_path)
+    _worker['candidate'] = _load_model(candidate_path)
+
+
+def _empty_stats():
+    n_levels = len(RISK_LEVELS)
+    return {
+        'rows': 0,
+        'label_matrix': np.zeros(4, dtype=np.int64),            # (aktif, kandidat) -> 2*a + k
+        'risk_matrix': np.zeros(n_levels * n_levels, dtype=np.int64),
+        'shift_hist': np.zeros(len(SHIFT_CENTERS), dtype=np.int64),
+        'shift_sum': 0.0, 'shift_abs_sum': 0.0, 'shift_abs_max': 0.0,
+        'shift_ge_005': 0, 'shift_ge_010': 0,
+        'logged_rows': 0, 'logged_agree': 0,
+        'encode_ns': 0, 'current_ns': 0, 'candidate_ns': 0,
+        'block_ns_per_row': {'current': [], 'candidate': []}
+    }
+
+
+def _merge(total, part):
+    for key, value in part.items():
+        if key == 'block_ns_per_row':
+            for name, values in value.items():
+                total[key][name].extend(values)
+        elif key == 'shift_abs_max':
+            total[key] = max(total[key], value)
+        else:
+            total[key] += value
+    return total
+
+
+def replay_block(header, block):
+    """Parse, encode & skor satu blok log dengan kedua model; kembalikan agregat."""
+    pp, current, candidate = _worker['preprocessor'], _worker['current'], _worker['candidate']
+    df = pd.read_csv(io.BytesIO(header + block), on_bad_lines='skip')
+    stats = _empty_stats()
+    n = len(df)
+    if n == 0:
+        return stats
+
+    t0 = time.perf_counter_ns()
+    X = pp.get_features(pp.clean_and_encode(df))
+    t1 = time.perf_counter_ns()
+    p_cur = current.score_features(X)
+    t2 = time.perf_counter_ns()
+    p_cand = candidate.score_features(X)
+    t3 = time.perf_counter_ns()
+
+    label_cur = (p_cur >= 0.5).astype(np.int64)
+    label_cand = (p_cand >= 0.5).astype(np.int64)
+    n_levels = len(RISK_LEVELS)
+    shift = p_cand - p_cur
+    abs_shift = np.abs(shift)
+
+    stats.update({
+        'rows': n,
+        'label_matrix': np.bincount(2 * label_cur + label_cand, minlength=4),
+        'risk_matrix': np.bincount(risk_level_codes(p_cur) * n_levels + risk_level_codes(p_cand),
+                                   minlength=n_levels * n_levels),
+        'shift_hist': np.histogram(shift, SHIFT_EDGES)[0],
+        'shift_sum': float(shift.sum()), 'shift_abs_sum': float(abs_shift.sum()),
+        'shift_abs_max': float(abs_shift.max()),
+        'shift_ge_005': int((abs_shift >= 0.05).sum()), 'shift_ge_010': int((abs_shift >= 0.10).sum()),
+        'encode_ns': t1 - t0, 'current_ns': t2 - t1, 'candidate_ns': t3 - t2,
+        'block_ns_per_row': {'current': [(t2 - t1) / n], 'candidate': [(t3 - t2) / n]}
+    })
+
+    # Label yang tercatat di log (kolom 'result') vs model aktif: deteksi model aktif != model saat logging
+    if 'result' in df.columns:
+        logged = df['result'].astype(str).str.strip().str.lower()
+        known = logged.isin(['diabetic', 'non-diabetic']).to_numpy()
+        stats['logged_rows'] = int(known.sum())
+        stats['logged_agree'] = int(((logged.to_numpy() == 'diabetic') == (label_cur == 1))[known].sum())
+    return stats
+
+
+# --- 3. LATENSI SATU BARIS ---
+
+def single_row_latency(paths, current_path, candidate_path, n_samples):
+    """Latensi skor satu baris per panggilan (pola /api/predict) untuk kedua model (µs)."""
+    if n_samples <= 0:
+        return None
+    df = pd.read_csv(paths[0], nrows=n_samples)
+    if df.empty:
+        return None
+    pp = DiabetesPreprocessor()
+    X = pp.get_features(pp.clean_and_encode(df))
+    result = {}
+    for name, path in (('current', current_path), ('candidate', candidate_path)):
+        model = _load_model(path)
+        model.score_features(X.iloc[[0]])  # warmup
+        timings = []
+        for i in range(len(X)):
+            row = X.iloc[[i]]
+            start = time.perf_counter_ns()
+            model.score_features(row)
+            timings.append((time.perf_counter_ns() - start) / 1000.0)
+        result[name] = {'p50_us': round(float(np.percentile(timings, 50)), 2),
+                        'p99_us': round(float(np.percentile(timings, 99)), 2)}
+    return result
+
+
+# --- 4. REPLAY & LAPORAN ---
+
+def _hist_quantile(hist, q):
+    cumulative = np.cumsum(hist)
+    return float(SHIFT_CENTERS[np.searchsorted(cumulative, q * cumulative[-1])])
+
+
+def summarize(stats, current_path, candidate_path, elapsed):
+    n = stats['rows']
+    if n == 0:
+        raise ValueError("Log tidak berisi baris prediksi")
+
+    lm = stats['label_matrix']
+    levels = len(RISK_LEVELS)
+    risk = stats['risk_matrix'].reshape(levels, levels)
+    hist = stats['shift_hist']
+
+    def ns_per_row(key):
+        return round(stats[key] / n, 1)
+
+    return {
+        'rows': n,
+        'elapsed_s': round(elapsed, 2),
+        'rows_per_sec': round(n / elapsed, 1) if elapsed > 0 else None,
+        'current_model': current_path,
+        'candidate_model': candidate_path,
+        'label_flips': {
+            'total': int(lm[1] + lm[2]),
+            'rate': round(float(lm[1] + lm[2]) / n, 6),
+            'non_diabetic_to_diabetic': int(lm[1]),
+            'diabetic_to_non_diabetic': int(lm[2])
+        },
+        'positive_rate': {
+            'current': round(float(lm[2] + lm[3]) / n, 6),
+            'candidate': round(float(lm[1] + lm[3]) / n, 6)
+        },
+        'logged_agreement': {
+            'rows': stats['logged_rows'],
+            'rate': round(stats['logged_agree'] / stats['logged_rows'], 6) if stats['logged_rows'] else None
+        },
+        'probability_shift': {
+            'mean': round(stats['shift_sum'] / n, 6),
+            'mean_abs': round(stats['shift_abs_sum'] / n, 6),
+            'max_abs': round(stats['shift_abs_max'], 6),
+            # Kuantil dari histogram (resolusi SHIFT_BIN)
+            **{f'p{q}': round(_hist_quantile(hist, q / 100), 4) for q in (1, 5, 50, 95, 99)},
+            'share_abs_ge_0.05': round(stats['shift_ge_005'] / n, 6),
+            'share_abs_ge_0.10': round(stats['shift_ge_010'] / n, 6),
+            'bin_width': SHIFT_BIN,
+            'histogram': {f"{c:+.3f}": int(h) for c, h in zip(SHIFT_CENTERS, hist) if h}
+        },
+        'risk_migration': {
+            RISK_LEVELS[i]: {RISK_LEVELS[j]: int(risk[i, j]) for j in range(levels)} for i in range(levels)
+        },
+        'latency': {
+            'batch_ns_per_row': {
+                'encode': ns_per_row('encode_ns'),
+                'current': ns_per_row('current_ns'),
+                'candidate': ns_per_row('candidate_ns')
+            },
+            'block_ns_per_row_p95': {
+                name: round(float(np.percentile(values, 95)), 1)
+                for name, values in stats['block_ns_per_row'].items() if values
+            }
+        }
+    }
+
+
+def run_replay(log_patterns, candidate_path, current_path=None, workers=None, block_mb=8.0,
+               latency_samples=200):
+    current_path = current_path or Config.MODEL_PATH
+    paths = resolve_log_paths(log_patterns)
+    workers = os.cpu_count() if workers is None else workers
+    block_bytes = max(int(block_mb * 1024 * 1024), 1024)
+    total = _empty_stats()
+
+    start = time.perf_counter()
+    if workers <= 1:
+        _init_worker(current_path, candidate_path)
+        for header, block in iter_log_blocks(paths, block_bytes):
+            _merge(total, replay_block(header, block))
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(current_path, candidate_path)) as pool:
+            pending = set()
+            for header, block in iter_log_blocks(paths, block_bytes):
+                # Batasi blok yang sedang diproses agar memori tetap konstan
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _merge(total, future.result())
+                pending.add(pool.submit(replay_block, header, block))
+            for future in pending:
+                _merge(total, future.result())
+    elapsed = time.perf_counter() - start
+
+    report = summarize(total, current_path, candidate_path, elapsed)
+    report['log_files'] = paths
+    report['workers'] = workers
+    report['latency']['single_row_us'] = single_row_latency(paths, current_path, candidate_path, latency_samples)
+    return report
+
+
+def print_report(report):
+    print(f"\n📄 {report['rows']:,} baris dari {len(report['log_files'])} file "
+          f"dalam {report['elapsed_s']} detik ({report['rows_per_sec'] or 0:,.0f} baris/detik)")
+
+    flips = report['label_flips']
+    print("\n🔀 FLIP LABEL")
+    print(f"   Total          : {flips['total']:,} ({flips['rate']:.4%})")
+    print(f"   Non -> Diabetic: {flips['non_diabetic_to_diabetic']:,}")
+    print(f"   Diabetic -> Non: {flips['diabetic_to_non_diabetic']:,}")
+    print(f"   Positive rate  : aktif {report['positive_rate']['current']:.2%} | "
+          f"kandidat {report['positive_rate']['candidate']:.2%}")
+    agreement = report['logged_agreement']
+    if agreement['rate'] is not None:
+        print(f"   Model aktif vs label di log: {agreement['rate']:.2%} sama ({agreement['rows']:,} baris)")
+
+    shift = report['probability_shift']
+    print("\n📈 PERGESERAN PROBABILITAS (kandidat - aktif)")
+    print(f"   Mean {shift['mean']:+.4f} | |mean| {shift['mean_abs']:.4f} | max |Δ| {shift['max_abs']:.4f}")
+    print(f"   p1 {shift['p1']:+.3f} | p5 {shift['p5']:+.3f} | p50 {shift['p50']:+.3f} | "
+          f"p95 {shift['p95']:+.3f} | p99 {shift['p99']:+.3f}")
+    print(f"   |Δ| >= 0.05: {shift['share_abs_ge_0.05']:.2%} | |Δ| >= 0.10: {shift['share_abs_ge_0.10']:.2%}")
+
+    print("\n🩺 MIGRASI TINGKAT RISIKO (baris = aktif, kolom = kandidat)")
+    print("   " + " " * 8 + "".join(f"{level:>12}" for level in RISK_LEVELS))
+    for level, row in report['risk_migration'].items():
+        print(f"   {level:<8}" + "".join(f"{row[col]:>12,}" for col in RISK_LEVELS))
+
+    latency = report['latency']
+    batch = latency['batch_ns_per_row']
+    print("\n⏱️  LATENSI PER BARIS")
+    print(f"   Batch (amortisasi): encode {batch['encode']:,.0f} ns | aktif {batch['current']:,.0f} ns | "
+          f"kandidat {batch['candidate']:,.0f} ns")
+    single = latency.get('single_row_us')
+    if single:
+        for name, label in (('current', 'aktif'), ('candidate', 'kandidat')):
+            print(f"   Satu baris {label:<8}: p50 {single[name]['p50_us']:,.1f} µs | p99 {single[name]['p99_us']:,.1f} µs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay log prediksi: model aktif vs model kandidat")
+    parser.add_argument('--candidate', required=True, help="Path bundle .pkl kandidat")
+    parser.add_argument('--current', default=Config.MODEL_PATH, help="Path bundle aktif (default: Config.MODEL_PATH)")
+    parser.add_argument('--log', nargs='+', default=[Config.PREDICTION_LOG],
+                        help="File log, glob, atau folder partisi (*.csv)")
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses worker (default: semua core, 1 = tanpa pool)")
+    parser.add_argument('--block-mb', type=float, default=8.0, help="Ukuran blok log per task (MB)")
+    parser.add_argument('--latency-samples', type=int, default=200, help="Jumlah baris untuk uji latensi satu baris")
+    parser.add_argument('--max-flip-rate', type=float, help="Exit code 1 jika flip rate melebihi nilai ini")
+    parser.add_argument('--output', default=os.path.join(Config.LOGS_DIR, 'replay_report.json'), help="File hasil JSON")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("🔁 REPLAY LOG PREDIKSI - MODEL AKTIF vs KANDIDAT")
+    print("=" * 70)
+
+    report = run_replay(args.log, args.candidate, args.current, args.workers, args.block_mb, args.latency_samples)
+    print_report(report)
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=4)
+    print(f"\n💾 Laporan disimpan: {args.output}")
+
+    if args.max_flip_rate is not None and report['label_flips']['rate'] > args.max_flip_rate:
+        print(f"❌ Flip rate {report['label_flips']['rate']:.4%} melebihi batas {args.max_flip_rate:.4%}")
+        sys.exit(1)
@@ -0,0 +1,423 @@
+"""
+Scripts/score_file.py
+Scoring massal file pasien di luar web server (pengganti batch malam yang memanggil HTTP per baris).
+
+Alur:
+1. Input CSV (skema mentah diabetes.csv) atau JSONL dibaca dari file atau stdin per chunk baris;
+   proses utama hanya membaca & menulis.
+2. Worker (process pool, model dimuat sekali per worker) memvalidasi, encode & menskor satu chunk
+   dengan logika yang sama seperti /api/predict/csv (score_raw_rows), lalu mengembalikan teks hasil.
+3. Hasil ditulis sesuai urutan input: kolom asli + result, probability_percent, risk_level, error.
+
+Resume: setelah setiap chunk ditulis, posisi (baris input & byte output) disimpan atomik di
+<output>.progress.json. Jika proses terhenti, jalankan perintah yang sama untuk melanjutkan;
+output dipotong ke posisi checkpoint terakhir lalu baris input yang sudah selesai dilewati.
+
+Mode skrining (--top-k K): tidak menulis file skor per baris. Setiap worker hanya mengembalikan
+kandidat top-K chunk-nya (probabilitas >= ambang heap saat submit); proses utama menggabungkan
+ke heap berukuran K (Backend/models/screening.py) dan menyimpan laporan JSON berisi daftar
+peringkat + jumlah pasien per tingkat risiko. Memori konstan terhadap ukuran input.
+
+Contoh:
+    python Scripts/score_file.py clinic_export.csv
+    python Scripts/score_file.py patients.jsonl --output scored.jsonl --workers 4
+    cat clinic_export.csv | python Scripts/score_file.py - --output - > scored.csv
+    python Scripts/score_file.py clinic_export.csv --top-k 500
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import signal
+import argparse
+import itertools
+import contextlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+
+# 1. Setup Path Project
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent
+sys.path.insert(0, str(project_root))
+
+# 2. Import Module
+try:
+    from Backend.config import Config
+    from Backend.models.preprocess import DiabetesPreprocessor
+    from Backend.models.decision_tree_model import DiabetesModel
+    from Backend.models.utils import score_raw_rows, risk_level, RAW_TEXT_COLUMNS, RISK_LEVELS, SCORE_COLUMNS
+    from Backend.models.screening import TopKSelector, chunk_top_k, risk_level_counts
+except ModuleNotFoundError as e:
+    print(f"❌ CRITICAL ERROR: Module tidak ditemukan. {e}")
+    sys.exit(1)
+
+_worker = {}    # State per proses worker: preprocessor & model
+
+
+def status(message):
+    # Pesan status ke stderr agar output '-' (stdout) tetap berisi data saja
+    print(message, file=sys.stderr, flush=True)
+
+
+# --- 1. INPUT ---
+
+def detect_format(path, fmt):
+    if fmt != 'auto':
+        return fmt
+    return 'jsonl' if str(path).lower().endswith(('.jsonl', '.ndjson')) else 'csv'
+
+
+def iter_chunks(stream, chunk_rows):
+    """Blok byte berisi tepat chunk_rows baris (kecuali blok terakhir)."""
+    while True:
+        lines = list(itertools.islice(stream, chunk_rows))
+        if not lines:
+            return
+        yield len(lines), b''.join(lines)
+
+
+# --- 2. WORKER ---
+
+def _init_worker(model_path, ignore_sigint=False):
+    if ignore_sigint:
+        # Ctrl+C ditangani proses utama (checkpoint tetap konsisten), worker tidak ikut berhenti di tengah chunk
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Pesan load per worker disembunyikan; kegagalan tetap dilaporkan lewat exception
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = DiabetesModel(model_path=model_path)
+    if not model.model_bundle:
+        raise RuntimeError(f"Model gagal dimuat: {model_path}")
+    _worker['preprocessor'] = DiabetesPreprocessor()
+    _worker['model'] = model.model_bundle['model']
+
+
+def read_block(fmt, header, block):
+    """Blok byte -> (baris non-kosong, posisi baris tsb dalam blok, DataFrame mentah)."""
+    positions, lines = [], []
+    for position, line in enumerate(block.splitlines()):
+        if line.strip():
+            positions.append(position)
+            lines.append(line)
+    if fmt == 'jsonl':
+        df = pd.read_json(io.BytesIO(b'\n'.join(lines)), lines=True, dtype=False)
+    else:
+        df = pd.read_csv(io.BytesIO(header + b'\n'.join(lines)), skipinitialspace=True,
+                         dtype={c: str for c in RAW_TEXT_COLUMNS})
+        df.columns = df.columns.str.strip()
+    return lines, positions, df
+
+
+def score_chunk(fmt, header, block):
+    """Skor satu blok; mengembalikan (bytes output, jumlah baris, baris tidak valid, baris Diabetic)."""
+    lines, _, df = read_block(fmt, header, block)
+    scored, valid, _ = score_raw_rows(_worker['model'], df, _worker['preprocessor'])
+    stats = (len(df), int((~valid).sum()), int((scored['result'] == 'Diabetic').sum()))
+    if fmt == 'csv' and len(df) == len(lines):
+        # Baris input ditulis ulang apa adanya + kolom hasil (format angka tidak bergantung isi chunk);
+        # baris dengan field kurang dari header diberi koma tambahan agar kolom hasil tetap sejajar
+        n_commas = header.count(b',')
+        suffixes = scored.to_csv(header=False, index=False).encode('utf-8').splitlines()
+        return b''.join(line + b',' * max(n_commas - line.count(b','), 0) + b',' + suffix + b'\n'
+                        for line, suffix in zip(lines, suffixes)), *stats
+
+    out = df.assign(**scored)
+    if fmt == 'jsonl':
+        text = out.to_json(orient='records', lines=True, force_ascii=False).rstrip('\n') + '\n'
+    else:
+        text = out.to_csv(header=False, index=False)
+    return text.encode('utf-8'), *stats
+
+
+def screen_chunk(fmt, header, block, first_line, k, threshold):
+    """
+    Mode skrining: hanya kandidat top-k chunk yang dikirim balik ke proses utama.
+    Mengembalikan (jumlah baris, baris tidak valid, hitungan per tingkat risiko,
+    [(probabilitas, nomor baris input, data pasien)]).
+    """
+    lines, positions, df = read_block(fmt, header, block)
+    _, valid, proba = score_raw_rows(_worker['model'], df, _worker['preprocessor'])
+    idx = chunk_top_k(proba, k, threshold)
+    # Nomor baris fisik di file input (untuk tie-break & penelusuran); fallback urutan baris jika parsing menggabung baris
+    line_numbers = np.asarray(positions) + first_line if len(df) == len(lines) else np.arange(len(df)) + first_line
+    records = json.loads(df.iloc[idx].to_json(orient='records', force_ascii=False))
+    candidates = [(float(proba[i]), int(line_numbers[i]), record) for i, record in zip(idx, records)]
+    return len(df), int((~valid).sum()), risk_level_counts(proba), candidates
+
+
+# --- 3. CHECKPOINT ---
+
+def checkpoint_path(output):
+    return f"{output}.progress.json"
+
+
+def input_signature(input_path, fmt, model_path):
+    """Identitas run: checkpoint hanya dipakai jika input, format & model sama."""
+    signature = {'input': os.path.abspath(input_path) if input_path != '-' else '-', 'format': fmt,
+                 'model': os.path.abspath(model_path)}
+    if input_path != '-':
+        stat = os.stat(input_path)
+        signature.update(input_size=stat.st_size, input_mtime=int(stat.st_mtime))
+    return signature
+
+
+def load_checkpoint(output, signature):
+    path = checkpoint_path(output)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    if state.get('signature') != signature:
+        raise RuntimeError(f"Checkpoint {path} berasal dari run lain (input/model berbeda). "
+                           "Gunakan --restart untuk memulai ulang.")
+    return state
+
+
+def save_checkpoint(output, state):
+    path = checkpoint_path(output)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+# --- 4. RUN ---
+
+def score_file(input_path, output_path, fmt='auto', model_path=None, workers=None, chunk_rows=20000,
+               restart=False, progress_every=2.0):
+    model_path = model_path or Config.MODEL_PATH
+    fmt = detect_format(input_path, fmt)
+    workers = os.cpu_count() if workers is None else workers
+    resumable = output_path != '-'
+    signature = input_signature(input_path, fmt, model_path)
+
+    state = None
+    if resumable and not restart:
+        state = load_checkpoint(output_path, signature)
+    state = state or {'signature': signature, 'lines_done': 0, 'bytes_written': 0,
+                      'rows': 0, 'invalid': 0, 'diabetic': 0}
+
+    source = sys.stdin.buffer if input_path == '-' else open(input_path, 'rb')
+    total_bytes = signature.get('input_size')
+    if state['lines_done']:
+        status(f"⏩ Melanjutkan dari baris input ke-{state['lines_done']:,} ({state['rows']:,} baris sudah diskor)")
+        out = open(output_path, 'r+b')
+        out.truncate(state['bytes_written'])
+        out.seek(state['bytes_written'])
+    else:
+        out = sys.stdout.buffer if not resumable else open(output_path, 'wb')
+
+    try:
+        header = source.readline() if fmt == 'csv' else b''
+        if fmt == 'csv' and not header.strip():
+            raise ValueError("Input CSV kosong")
+        # Baris input yang sudah diskor pada run sebelumnya dilewati
+        for _ in itertools.islice(source, state['lines_done']):
+            pass
+        if state['bytes_written'] == 0 and fmt == 'csv':
+            out.write(header.rstrip(b'\r\n') + (',' + ','.join(SCORE_COLUMNS) + '\n').encode('utf-8'))
+
+        start = last_report = time.perf_counter()
+        rows_at_start = state['rows']
+
+        def commit(result, n_lines):
+            nonlocal last_report
+            data, n_rows, n_invalid, n_diabetic = result
+            out.write(data)
+            out.flush()
+            state['lines_done'] += n_lines
+            state['rows'] += n_rows
+            state['invalid'] += n_invalid
+            state['diabetic'] += n_diabetic
+            if resumable:
+                state['bytes_written'] = out.tell()
+                save_checkpoint(output_path, state)
+
+            now = time.perf_counter()
+            if now - last_report >= progress_every:
+                last_report = now
+                rate = (state['rows'] - rows_at_start) / (now - start)
+                position = f" | {source.tell() / total_bytes:.1%} input" if total_bytes else ''
+                status(f"   ⏳ {state['rows']:,} baris | {rate:,.0f} baris/detik{position}")
+
+        chunks = iter_chunks(source, chunk_rows)
+        if workers <= 1:
+            _init_worker(model_path)
+            for n_lines, block in chunks:
+                commit(score_chunk(fmt, header, block), n_lines)
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(model_path, True)) as pool:
+                pending = {}    # index chunk -> (future, jumlah baris input)
+                next_index = 0
+                for index, (n_lines, block) in enumerate(chunks):
+                    pending[index] = (pool.submit(score_chunk, fmt, header, block), n_lines)
+                    # Tulis sesuai urutan input; jika antrean penuh, tunggu chunk tertua agar memori konstan
+                    while next_index in pending and (pending[next_index][0].done() or len(pending) >= workers * 2):
+                        future, lines = pending.pop(next_index)
+                        commit(future.result(), lines)
+                        next_index += 1
+                while next_index in pending:
+                    future, lines = pending.pop(next_index)
+                    commit(future.result(), lines)
+                    next_index += 1
+
+        elapsed = time.perf_counter() - start
+        # Selesai: checkpoint dihapus (run berikutnya dengan output sama dimulai dari awal)
+        if resumable and os.path.exists(checkpoint_path(output_path)):
+            os.remove(checkpoint_path(output_path))
+        state['elapsed_s'] = round(elapsed, 2)
+        state['rows_per_sec'] = round((state['rows'] - rows_at_start) / elapsed, 1) if elapsed > 0 else None
+        return state
+    except KeyboardInterrupt:
+        status(f"\n⏸️  Dihentikan pada baris input ke-{state['lines_done']:,}. "
+               "Jalankan perintah yang sama untuk melanjutkan.")
+        raise
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if out is not sys.stdout.buffer:
+            out.close()
+
+
+def screen_file(input_path, k, fmt='auto', model_path=None, workers=None, chunk_rows=20000, progress_every=2.0):
+    """Top-k pasien berisiko tertinggi + jumlah per tingkat risiko, tanpa menyimpan skor seluruh baris."""
+    model_path = model_path or Config.MODEL_PATH
+    fmt = detect_format(input_path, fmt)
+    workers = os.cpu_count() if workers is None else workers
+    selector = TopKSelector(k)
+    totals = {'rows': 0, 'invalid': 0}
+
+    source = sys.stdin.buffer if input_path == '-' else open(input_path, 'rb')
+    try:
+        header = source.readline() if fmt == 'csv' else b''
+        if fmt == 'csv' and not header.strip():
+            raise ValueError("Input CSV kosong")
+        start = last_report = time.perf_counter()
+
+        def merge(result):
+            nonlocal last_report
+            n_rows, n_invalid, counts, candidates = result
+            totals['rows'] += n_rows
+            totals['invalid'] += n_invalid
+            selector.risk_counts += counts
+            selector.extend(candidates)
+
+            now = time.perf_counter()
+            if now - last_report >= progress_every:
+                last_report = now
+                status(f"   ⏳ {totals['rows']:,} baris | {totals['rows'] / (now - start):,.0f} baris/detik")
+
+        # Nomor baris fisik (1-based, header CSV = baris 1) dari baris pertama setiap chunk
+        next_line = 2 if fmt == 'csv' else 1
+        chunks = iter_chunks(source, chunk_rows)
+        if workers <= 1:
+            _init_worker(model_path)
+            for n_lines, block in chunks:
+                merge(screen_chunk(fmt, header, block, next_line, k, selector.threshold))
+                next_line += n_lines
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(model_path, True)) as pool:
+                pending = set()
+                for n_lines, block in chunks:
+                    # Ambang heap saat submit hanya bisa naik, jadi kandidat yang dibuang worker memang tidak akan masuk
+                    pending.add(pool.submit(screen_chunk, fmt, header, block, next_line, k, selector.threshold))
+                    next_line += n_lines
+                    if len(pending) >= workers * 2:
+                        # Hasil digabung begitu selesai (urutan tidak penting: tie-break memakai nomor baris)
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            merge(future.result())
+                for future in pending:
+                    merge(future.result())
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        'k': k,
+        'rows': totals['rows'],
+        'invalid': totals['invalid'],
+        'risk_levels': dict(zip(RISK_LEVELS, selector.risk_counts.tolist())),
+        'elapsed_s': round(elapsed, 2),
+        'rows_per_sec': round(totals['rows'] / elapsed, 1) if elapsed > 0 else None,
+        'top': [{'rank': rank, 'line': line, 'probability_percent': round(probability * 100, 2),
+                 'risk_level': risk_level(probability), 'patient': record}
+                for rank, (probability, line, record) in enumerate(selector.ranked(), start=1)],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scoring massal file pasien (CSV/JSONL) dengan process pool")
+    parser.add_argument('input', help="File input CSV/JSONL, atau '-' untuk stdin")
+    parser.add_argument('--output', help="File output (default: <input>_scored.<ext>; '-' = stdout, tanpa resume)")
+    parser.add_argument('--format', choices=['auto', 'csv', 'jsonl'], default='auto',
+                        help="Format input (auto: dari ekstensi, stdin = csv)")
+    parser.add_argument('--model', default=Config.MODEL_PATH, help="Path bundle model (default: Config.MODEL_PATH)")
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses worker (default: semua core, 1 = tanpa pool)")
+    parser.add_argument('--chunk-rows', type=int, default=20000, help="Jumlah baris per task worker")
+    parser.add_argument('--restart', action='store_true', help="Abaikan checkpoint dan mulai dari awal")
+    parser.add_argument('--top-k', type=int, default=None,
+                        help="Mode skrining: laporan JSON K pasien berisiko tertinggi (default output: <input>_top<K>.json)")
+    args = parser.parse_args()
+
+    fmt = detect_format(args.input, args.format)
+    output = args.output
+    if output is None:
+        if args.input == '-':
+            output = '-'
+        else:
+            stem, _ = os.path.splitext(args.input)
+            output = f"{stem}_top{args.top_k}.json" if args.top_k else f"{stem}_scored.{'jsonl' if fmt == 'jsonl' else 'csv'}"
+
+    if args.top_k is not None:
+        status("=" * 70)
+        status(f"🎯 SKRINING TOP-{args.top_k} RISIKO TERTINGGI")
+        status("=" * 70)
+        status(f"📂 Input: {args.input} ({fmt}) -> Laporan: {output}")
+        try:
+            report = screen_file(args.input, args.top_k, fmt, args.model, args.workers, args.chunk_rows)
+        except KeyboardInterrupt:
+            sys.exit(130)
+        except (OSError, ValueError, RuntimeError) as e:
+            status(f"❌ {e}")
+            sys.exit(1)
+
+        text = json.dumps(report, ensure_ascii=False, indent=2)
+        if output == '-':
+            print(text)
+        else:
+            with open(output, 'w', encoding='utf-8') as f:
+                f.write(text)
+        status(f"\n✅ {report['rows']:,} baris diskrining dalam {report['elapsed_s']} detik "
+               f"({report['rows_per_sec'] or 0:,.0f} baris/detik)")
+        status("   " + " | ".join(f"{level}: {count:,}" for level, count in report['risk_levels'].items())
+               + f" | Tidak valid: {report['invalid']:,}")
+        if report['top']:
+            status(f"   Tertinggi: {report['top'][0]['probability_percent']}% (baris {report['top'][0]['line']}), "
+                   f"batas top-{args.top_k}: {report['top'][-1]['probability_percent']}%")
+        if output != '-':
+            status(f"💾 Laporan disimpan: {output}")
+        sys.exit(0)
+
+    status("=" * 70)
+    status("🧮 SCORING FILE PASIEN (OFFLINE)")
+    status("=" * 70)
+    status(f"📂 Input: {args.input} ({fmt}) -> Output: {output}")
+
+    try:
+        result = score_file(args.input, output, fmt, args.model, args.workers, args.chunk_rows, args.restart)
+    except KeyboardInterrupt:
+        sys.exit(130)
+    except (OSError, ValueError, RuntimeError) as e:
+        status(f"❌ {e}")
+        sys.exit(1)
+
+    status(f"\n✅ {result['rows']:,} baris diskor dalam {result['elapsed_s']} detik "
+           f"({result['rows_per_sec'] or 0:,.0f} baris/detik)")
+    status(f"   Diabetic: {result['diabetic']:,} | Tidak valid (kolom error): {result['invalid']:,}")
+    if output != '-':
+        status(f"💾 Hasil disimpan: {output}")
@@ -6,6 +6,8 @@ Training model Decision Tree dengan Pipeline, Cross Validation, dan Kalibrasi.
 import sys
 import os
 import json
+import time
+import argparse
 import joblib
 import pandas as pd
 import numpy as np
@@ -19,40 +21,154 @@ project_root = current_file.parent.parent
 sys.path.insert(0, str(project_root))
 
 # 2. Import Module
+# Modul khusus mode (hist_tree, risk_curves, similar) di-import di dalam fungsi yang memakainya
 try:
     from Backend.config import Config
     from Backend.models.preprocess import DiabetesPreprocessor
-except ModuleNotFoundError:
+    from Backend.models.training import (
+        build_pipeline, train_single_pass, search_hyperparameters, DEFAULT_TREE_PARAMS
+    )
+    from Backend.models.balancing import FoldSMOTE, BALANCE_METHODS
+except ModuleNotFoundError as backend_error:
+    if backend_error.name and not backend_error.name.startswith('Backend'):
+        # Paket Backend ada, tetapi dependency-nya (misal scikit-learn) belum terpasang
+        print(f"❌ CRITICAL ERROR: Dependency '{backend_error.name}' belum terpasang.")
+        sys.exit(1)
     try:
         from backend.config import Config
         from backend.models.preprocess import DiabetesPreprocessor
-    except ModuleNotFoundError:
-        print("❌ CRITICAL ERROR: Module 'Backend' tidak ditemukan.")
+        from backend.models.training import (
+            build_pipeline, train_single_pass, search_hyperparameters, DEFAULT_TREE_PARAMS
+        )
+        from backend.models.balancing import FoldSMOTE, BALANCE_METHODS
+    except ModuleNotFoundError as e:
+        if e.name and not e.name.lower().startswith('backend'):
+            print(f"❌ CRITICAL ERROR: Dependency '{e.name}' belum terpasang.")
+        else:
+            print("❌ CRITICAL ERROR: Module 'Backend' tidak ditemukan.")
         sys.exit(1)
 
-from sklearn.tree import DecisionTreeClassifier
 from sklearn.model_selection import StratifiedKFold, cross_val_score
 from sklearn.calibration import CalibratedClassifierCV
-from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import (
     accuracy_score, roc_auc_score, confusion_matrix,
     precision_score, recall_score, f1_score
 )
 
-def train_model():
+def save_artifacts(model, feature_names, metadata):
+    """Menyimpan bundle .pkl dan metadata .json dengan format yang dimuat DiabetesModel."""
+    # Menggunakan Config.MODELS_DIR (Jamak/Plural)
+    os.makedirs(Config.MODELS_DIR, exist_ok=True)
+
+    bundle = {
+        'model': model,
+        'features': feature_names,
+        'target': ['Non-Diabetic', 'Diabetic'],
+        'timestamp': datetime.now().isoformat()
+    }
+
+    joblib.dump(bundle, Config.MODEL_PATH)
+    print(f"\n💾 Model tersimpan: {Config.MODEL_PATH}")
+
+    with open(Config.META_PATH, 'w') as f:
+        json.dump(metadata, f, indent=4)
+
+    print(f"📄 Metadata tersimpan: {Config.META_PATH}")
+
+    # Kurva risiko populasi untuk versi model ini (ditampilkan di halaman index & about)
+    try:
+        from Backend.models.risk_curves import build_risk_curves, save_risk_curves
+        save_risk_curves(build_risk_curves(model, bundle['timestamp']))
+        print(f"📈 Kurva risiko tersimpan: {Config.RISK_CURVES_PATH}")
+    except Exception as e:
+        print(f"⚠️ Warning: Gagal menghitung kurva risiko: {e}")
+
+    # Indeks BallTree pasien serupa (/api/similar), dari data training asli
+    try:
+        from Backend.models.similar import SimilarPatientIndex
+        SimilarPatientIndex.from_dataset().save()
+        print(f"🧭 Indeks pasien serupa tersimpan: {Config.SIMILAR_INDEX_PATH}")
+    except Exception as e:
+        print(f"⚠️ Warning: Gagal membangun indeks pasien serupa: {e}")
+
+
+def train_hist_model(data_path=None, chunksize=100000, max_bins=255, cache_dir=None):
+    """
+    Training out-of-core (mode 'hist'): CSV di-stream per chunk, fitur di-bin ke uint8,
+    pohon ditumbuhkan level demi level dari histogram kelas per node.
+    """
+    print("=" * 60)
+    print("🧠 TRAINING MODEL DIABETES (OUT-OF-CORE HISTOGRAM)")
+    print("=" * 60)
+
+    data_path = data_path or Config.BALANCED_DATA
+    try:
+        from Backend.models.hist_tree import train_out_of_core
+
+        if not os.path.exists(data_path):
+            print(f"❌ Dataset tidak ditemukan di: {data_path}")
+            return False
+
+        print(f"📂 Streaming dataset: {data_path} (chunk {chunksize} baris)")
+        start_time = time.perf_counter()
+        model, stats = train_out_of_core(
+            data_path, chunksize=chunksize, cache_dir=cache_dir,
+            max_bins=max_bins, **DEFAULT_TREE_PARAMS
+        )
+        print(f"📊 Total Baris: {stats['n_rows']} | Bin: {stats['n_bins']} | Node: {stats['n_nodes']}")
+        print(f"📈 Akurasi Holdout (1/5 baris): {stats['accuracy_cv']:.4f}")
+        print(f"⏱️  Waktu training (hist): {time.perf_counter() - start_time:.2f} detik")
+
+        feature_names = list(model.feature_names_in_)
+        feature_importance = sorted(zip(feature_names, model.feature_importances_), key=lambda x: x[1], reverse=True)
+
+        metadata = {
+            'algorithm': 'Histogram Decision Tree (Entropy, Out-of-Core)',
+            'training_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'accuracy_cv': round(stats['accuracy_cv'], 4),
+            'training_mode': 'hist',
+            'hyperparameters': dict(DEFAULT_TREE_PARAMS, max_bins=max_bins),
+            'accuracy_train': round(stats['metrics']['accuracy'], 4),
+            'metrics': {k: round(v, 4) for k, v in stats['metrics'].items()},
+            'confusion_matrix': stats['confusion_matrix'],
+            'feature_importance': {k: round(float(v), 4) for k, v in feature_importance[:5]}
+        }
+
+        save_artifacts(model, feature_names, metadata)
+        return True
+
+    except Exception as e:
+        print(f"\n❌ TRAINING ERROR: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+# Nama kriteria split untuk label 'algorithm' di metadata
+CRITERION_NAMES = {'entropy': 'Entropy', 'gini': 'Gini', 'log_loss': 'Log Loss'}
+
+
+def train_model(mode='standard', n_jobs=-1, search_options=None, balance='none', balance_method='chunked'):
     print("=" * 60)
     print("🧠 TRAINING MODEL DIABETES")
     print("=" * 60)
 
     try:
         # 3. Load Dataset Balanced
-        if not os.path.exists(Config.BALANCED_DATA):
-            print(f"❌ Dataset balanced tidak ditemukan di: {Config.BALANCED_DATA}")
+        # Mode balance 'fold': pakai data mentah, SMOTE dijalankan di dalam tiap fold training
+        sampler = None
+        data_path = Config.BALANCED_DATA
+        if balance == 'fold':
+            sampler = FoldSMOTE(method=balance_method, random_state=42)
+            data_path = Config.RAW_DATA
+            print(f"⚖️  Balancing on-the-fly per fold (FoldSMOTE, metode: {balance_method})")
+
+        if not os.path.exists(data_path):
+            print(f"❌ Dataset tidak ditemukan di: {data_path}")
             return False
 
-        print(f"📂 Membaca dataset: {Config.BALANCED_DATA}")
-        df = pd.read_csv(Config.BALANCED_DATA)
+        print(f"📂 Membaca dataset: {data_path}")
+        df = pd.read_csv(data_path)
 
         # 4. Preprocessing Cerdas
         preprocessor = DiabetesPreprocessor()
@@ -78,40 +194,59 @@ def train_model():
         print(f"📊 Dataset Shape: {X.shape}")
         print(f"📊 Distribusi Kelas: {Counter(y)}")
 
-        # 5. Membangun Pipeline
-        dt_classifier = DecisionTreeClassifier(
-            criterion="entropy",
-            max_depth=6,
-            min_samples_leaf=10,
-            min_samples_split=20,
-            class_weight="balanced",
-            random_state=42
-        )
+        start_time = time.perf_counter()
+        tree_params = dict(DEFAULT_TREE_PARAMS)
+        search_result = None
 
-        pipeline = Pipeline([
-            ('scaler', StandardScaler()),
-            ('dt', dt_classifier)
-        ])
+        if mode == 'search':
+            # 4b. Hyperparameter Search (Successive Halving di process pool)
+            search_options = search_options or {}
+            print(f"\n🔎 Menjalankan Successive Halving Search (n_jobs={n_jobs})...")
+            best_params, search_result = search_hyperparameters(
+                X, y, n_jobs=n_jobs, sampler=sampler, **search_options
+            )
+            tree_params.update(best_params)
+            print(f"🏆 Konfigurasi terbaik: {best_params}")
+            print(f"   Skor: {search_result['best_score']} | Akurasi: {search_result['best_accuracy']} "
+                  f"| Latensi: {search_result['best_latency_us']} µs | Fit: {search_result['n_fits']}")
 
-        # 6. Kalibrasi Model
-        calibrated_model = CalibratedClassifierCV(
-            estimator=pipeline,
-            method='sigmoid',
-            cv=5
-        )
+        if mode in ('fast', 'search'):
+            # 5-8. Single-pass CV: fold di-cache, member fold dipakai ulang jadi model final
+            print(f"\n🔄 Menjalankan 5-Fold CV single-pass (n_jobs={n_jobs})...")
+            calibrated_model, scores = train_single_pass(
+                X, y, params=tree_params, n_jobs=n_jobs, sampler=sampler
+            )
+            mean_acc = scores.mean()
+            accuracy_key = 'accuracy_cross_fitted'
+            print(f"📈 Rata-rata Akurasi Cross-Fitted: {mean_acc:.4f} (±{scores.std():.4f})")
+            print("ℹ️  Info: Model final identik dengan mode standard; akurasi cross-fitted bukan "
+                  "cross_val_score bersarang, jadi disimpan sebagai 'accuracy_cross_fitted' (bukan 'accuracy_cv').")
+        else:
+            # 5. Membangun Pipeline
+            pipeline = build_pipeline(sampler=sampler)
 
-        # 7. Evaluasi Cross Validation
-        cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
-        
-        print("\n🔄 Menjalankan 5-Fold Cross Validation...")
-        scores = cross_val_score(calibrated_model, X, y, cv=cv, scoring='accuracy')
-        mean_acc = scores.mean()
-        
-        print(f"📈 Rata-rata Akurasi Validasi: {mean_acc:.4f} (±{scores.std():.4f})")
+            # 6. Kalibrasi Model
+            calibrated_model = CalibratedClassifierCV(
+                estimator=pipeline,
+                method='sigmoid',
+                cv=5
+            )
+
+            # 7. Evaluasi Cross Validation
+            cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+
+            print("\n🔄 Menjalankan 5-Fold Cross Validation...")
+            scores = cross_val_score(calibrated_model, X, y, cv=cv, scoring='accuracy')
+            mean_acc = scores.mean()
+            accuracy_key = 'accuracy_cv'
 
-        # 8. Final Training
-        print("💪 Melatih model final...")
-        calibrated_model.fit(X, y)
+            print(f"📈 Rata-rata Akurasi Validasi: {mean_acc:.4f} (±{scores.std():.4f})")
+
+            # 8. Final Training
+            print("💪 Melatih model final...")
+            calibrated_model.fit(X, y)
+
+        print(f"⏱️  Waktu training ({mode}): {time.perf_counter() - start_time:.2f} detik")
 
         y_pred = calibrated_model.predict(X)
         y_proba = calibrated_model.predict_proba(X)[:, 1]
@@ -133,35 +268,23 @@ def train_model():
         importance_vals = base_pipeline.named_steps['dt'].feature_importances_
         feature_importance = sorted(zip(feature_names, importance_vals), key=lambda x: x[1], reverse=True)
 
-        # 10. Simpan Model (BAGIAN INI YANG DIPERBAIKI)
-        # Menggunakan Config.MODELS_DIR (Jamak/Plural)
-        os.makedirs(Config.MODELS_DIR, exist_ok=True)
-        
-        bundle = {
-            'model': calibrated_model,
-            'features': feature_names,
-            'target': ['Non-Diabetic', 'Diabetic'],
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        joblib.dump(bundle, Config.MODEL_PATH)
-        print(f"\n💾 Model tersimpan: {Config.MODEL_PATH}")
-
         # 11. Simpan Metadata
         metadata = {
-            'algorithm': 'Calibrated Decision Tree (Entropy)',
+            'algorithm': f"Calibrated Decision Tree ({CRITERION_NAMES.get(tree_params['criterion'], tree_params['criterion'])})",
             'training_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'accuracy_cv': round(mean_acc, 4),
+            accuracy_key: round(mean_acc, 4),
+            'training_mode': mode,
+            'hyperparameters': tree_params,
+            'balancing': 'smote_per_fold' if sampler is not None else 'precomputed',
             'accuracy_train': round(metrics['accuracy'], 4),
             'metrics': {k: round(v, 4) for k, v in metrics.items()},
             'confusion_matrix': {'tn': int(tn), 'fp': int(fp), 'fn': int(fn), 'tp': int(tp)},
             'feature_importance': {k: round(v, 4) for k, v in feature_importance[:5]}
         }
+        if search_result is not None:
+            metadata['hyperparameter_search'] = search_result
 
-        with open(Config.META_PATH, 'w') as f:
-            json.dump(metadata, f, indent=4)
-            
-        print(f"📄 Metadata tersimpan: {Config.META_PATH}")
+        save_artifacts(calibrated_model, feature_names, metadata)
         return True
 
     except Exception as e:
@@ -171,7 +294,46 @@ def train_model():
         return False
 
 if __name__ == "__main__":
-    if train_model():
+    parser = argparse.ArgumentParser(description="Training model Decision Tree Diabetes")
+    parser.add_argument('--mode', choices=['standard', 'fast', 'search', 'hist'], default='standard',
+                        help="standard: cross_val_score + fit ulang | fast: single-pass CV (fold dipakai ulang) "
+                             "| search: tuning hyperparameter lalu training fast "
+                             "| hist: training out-of-core berbasis histogram")
+    parser.add_argument('--n-jobs', type=int, default=-1, help="Jumlah core untuk mode fast/search (-1 = semua)")
+    parser.add_argument('--search-space', help="File JSON ruang pencarian, misal {\"max_depth\": [4, 6, 8]}")
+    parser.add_argument('--n-candidates', type=int, help="Sampling acak N kandidat (default: grid penuh)")
+    parser.add_argument('--eta', type=int, default=3, help="Faktor eliminasi Successive Halving (>= 2)")
+    parser.add_argument('--latency-weight', type=float, default=0.01,
+                        help="Penalti skor per milidetik latensi serving")
+    parser.add_argument('--balance', choices=['none', 'fold'], default='none',
+                        help="none: pakai diabetes_balanced.csv | fold: data mentah + SMOTE di dalam tiap fold")
+    parser.add_argument('--balance-method', choices=BALANCE_METHODS, default='chunked',
+                        help="Metode SMOTE untuk --balance fold")
+    parser.add_argument('--data', help="Path CSV untuk mode hist (default: dataset balanced)")
+    parser.add_argument('--chunksize', type=int, default=100000, help="Baris per chunk untuk mode hist")
+    parser.add_argument('--max-bins', type=int, default=255, help="Jumlah bin maksimum per fitur (<= 256)")
+    parser.add_argument('--cache-dir', help="Folder file sementara kode uint8 (default: temp sistem)")
+    args = parser.parse_args()
+    if args.eta < 2:
+        parser.error("--eta harus >= 2")
+
+    search_options = {
+        'n_candidates': args.n_candidates,
+        'eta': args.eta,
+        'latency_weight': args.latency_weight
+    }
+    if args.search_space:
+        with open(args.search_space, 'r') as f:
+            search_options['search_space'] = json.load(f)
+
+    if args.mode == 'hist':
+        success = train_hist_model(args.data, chunksize=args.chunksize,
+                                   max_bins=args.max_bins, cache_dir=args.cache_dir)
+    else:
+        success = train_model(mode=args.mode, n_jobs=args.n_jobs, search_options=search_options,
+                              balance=args.balance, balance_method=args.balance_method)
+
+    if success:
         print("\n✅ PROSES SELESAI. Model siap digunakan.")
     else:
         print("\n❌ PROSES GAGAL.")
@@ -0,0 +1,23 @@
+"""
+gunicorn.conf.py
+Konfigurasi gunicorn untuk produksi:  gunicorn -c gunicorn.conf.py "run_app:create_app()"
+"""
+
+import os
+import tempfile
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '4'))
+
+# Worker ber-thread agar kelebihan request sampai ke admission control (Backend/serving) dan dijawab
+# 503 + Retry-After, bukan menumpuk di backlog socket. Harus > ADMISSION_MAX_CONCURRENT + ADMISSION_MAX_QUEUE.
+threads = int(os.environ.get('GUNICORN_THREADS', '32'))
+
+# Direktori snapshot metrik per worker, digabung oleh /api/metrics
+os.environ.setdefault('METRICS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'diabetes_metrics'))
+
+
+def on_starting(server):
+    """Membersihkan snapshot metrik dari run sebelumnya sebelum worker dibuat."""
+    from Backend.monitoring.metrics import clear_snapshot_dir
+    clear_snapshot_dir(os.environ['METRICS_MULTIPROC_DIR'])
@@ -13,6 +13,9 @@ try:
     from Backend.config import Config
     from Backend.routes.api_routes import api_bp
     from Backend.routes.web_routes import web_bp
+    from Backend.routes.debug_routes import debug_bp
+    from Backend.monitoring import init_app as init_monitoring
+    from Backend.serving import init_app as init_serving
 except ImportError as e:
     print(f"❌ Error saat memuat modul: {e}")
     sys.exit(1)
@@ -46,6 +49,15 @@ def create_app():
     # API routes (dengan url_prefix /api sesuai standar REST API)
     app.register_blueprint(api_bp, url_prefix='/api')
 
+    # Debug/diagnostik (request lambat, profiler, memori)
+    app.register_blueprint(debug_bp, url_prefix='/api/debug')
+
+    # Observability: metrik per route (/api/metrics), X-Request-ID & Server-Timing
+    init_monitoring(app)
+
+    # Admission control: batas request scoring bersamaan, lebihnya gagal cepat (503 + Retry-After)
+    init_serving(app)
+
     # 5. GLOBAL ERROR HANDLERS
     @app.errorhandler(404)
     def not_found(e):